@@ -0,0 +1,79 @@
+"""Import-time benchmark for nexus.nexus_core.
+
+Imports the package and all of its modules in fresh interpreters and fails
+(exit status 1) if the best of several runs exceeds the time budget, or if
+importing pulls in a library that should only be loaded on first use.
+
+    python -m nexus.benchmarks.import_time --budget 1.5
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+# Libraries that nexus_core only imports when they are actually used
+DEFERRED_MODULES = ('CoolProp', 'matplotlib', 'seaborn', 'pandas')
+
+_PROBE = """
+import json, pkgutil, sys, time
+start = time.perf_counter()
+import nexus.nexus_core
+modules = [m.name for m in pkgutil.walk_packages(nexus.nexus_core.__path__, 'nexus.nexus_core.')]
+for name in modules:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'modules': len(modules),
+                  'loaded': [m for m in %r if m in sys.modules]}))
+"""
+
+def measure(repeats=5):
+    """
+    Times importing nexus.nexus_core and its modules in fresh interpreters.
+
+    Args:
+        repeats (int): Number of interpreter runs.
+
+    Returns:
+        dict: 'seconds' (best run), 'modules' (number imported) and 'loaded' (deferred
+              libraries that were imported anyway).
+    """
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', _PROBE % (DEFERRED_MODULES,)], capture_output=True,
+                                text=True, check=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    best = min(runs, key=lambda run: run['seconds'])
+    best['loaded'] = sorted(set().union(*(run['loaded'] for run in runs)))
+    return best
+
+def slowest_imports(count=10):
+    """The slowest imports (cumulative microseconds, module) of one run, from ``python -X importtime``."""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import nexus.nexus_core.models.unit_operations, '
+                             'nexus.nexus_core.uq, nexus.nexus_core.solver.flowsheet'],
+                            capture_output=True, text=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].strip()))
+    return sorted(rows, reverse=True)[:count]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget', type=float, default=1.5, help='Time budget in seconds (default 1.5).')
+    parser.add_argument('--repeats', type=int, default=5, help='Number of interpreter runs (default 5).')
+    args = parser.parse_args()
+
+    result = measure(args.repeats)
+    print(f"Imported nexus.nexus_core and {result['modules']} modules in {result['seconds']:.3f} s "
+          f"(budget {args.budget:.3f} s)")
+    failed = False
+    if result['loaded']:
+        print(f"FAIL: deferred libraries imported at import time: {', '.join(result['loaded'])}")
+        failed = True
+    if result['seconds'] > args.budget:
+        print("FAIL: import time exceeds the budget. Slowest imports:")
+        for micros, name in slowest_imports():
+            print(f"  {micros / 1e6:8.3f} s  {name}")
+        failed = True
+    sys.exit(1 if failed else 0)
@@ -1,10 +1,9 @@
 import pandas as pd
-import numpy as np
 from scipy.optimize import minimize
 from nexus.digital_twin.rt_interface.data_interface import CSVDataReader
 from nexus.nexus_core.models.unit_operations import CSTR
 from nexus.nexus_core.properties.property_models import PropertyPackage, Component
-from nexus.nexus_core.kinetics.kinetics import PowerLawReaction
+from nexus.nexus_core.kinetics.kinetics import PowerLawReaction, ArrheniusRate, RateConstant, R_GAS
 
 class ParameterEstimator:
     """Tunes model parameters to minimize the error against historical data."""
@@ -13,16 +12,22 @@ class ParameterEstimator:
         self.data_reader = data_reader
         self.target_variable_map = target_variable_map
 
+    def _rate_constant(self, param_name):
+        """The model's rate-constant object, checked to have the tunable parameter ``param_name``."""
+        rate = self.model.reaction.rate_constant_func
+        if not isinstance(rate, RateConstant):
+            raise ValueError("Parameter estimation needs a declarative rate constant (e.g. ArrheniusRate), "
+                             "not an opaque callable.")
+        if param_name not in rate.parameter_names:
+            raise ValueError(f"{type(rate).__name__} has no parameter '{param_name}'. "
+                             f"Choose from {list(rate.parameter_names)}.")
+        return rate
+
     def _objective_function(self, param_value, param_name, timestamp):
         """The function to minimize: the error between prediction and actual data."""
-        # Temporarily set the new parameter value in the model
-        # This is a simple approach; a more robust way would be needed for complex models
-        # e.g., self.model.set_parameter(param_name, param_value)
-        # For this example, we'll assume the parameter is the pre-exponential factor 'A'
-        # in the reaction's rate constant function.
-        original_k_func = self.model.reaction.rate_constant_func
-        self.model.reaction.rate_constant_func = lambda T: param_value[0] * np.exp(5000 * (1/310 - 1/T))
-        
+        # The coefficient is updated in place on the rate-constant object
+        self._rate_constant(param_name).set_parameters(**{param_name: param_value[0]})
+
         # Run the model and get the prediction
         actual_data = self.data_reader.get_data_at_timestamp(timestamp)
         inlet_stream = {
@@ -40,22 +45,34 @@ class ParameterEstimator:
         self.model.solve()
         predicted_outlet = self.model.outlets[0]
 
-        # Restore original function
-        self.model.reaction.rate_constant_func = original_k_func
-
         # Calculate error
         predicted_value = predicted_outlet['composition'][self.target_variable_map['model']]
         actual_value = actual_data[self.target_variable_map['data']] / 1000
         return (predicted_value - actual_value) ** 2
 
     def tune_parameter(self, timestamp, param_name, initial_guess):
-        """Uses optimization to find the best value for a model parameter."""
-        result = minimize(
-            self._objective_function,
-            x0=[initial_guess],
-            args=(param_name, timestamp),
-            method='Nelder-Mead'
-        )
+        """Uses optimization to find the best value for a model parameter.
+
+        Args:
+            timestamp (pd.Timestamp): The data point to fit.
+            param_name (str): A parameter of the reaction's rate constant (e.g. 'A' of ArrheniusRate).
+            initial_guess (float): Starting value of the parameter.
+
+        Returns:
+            float: The tuned value, or None if the optimization failed. The model keeps
+                   its original parameter value either way.
+        """
+        rate = self._rate_constant(param_name)
+        original = getattr(rate, param_name)
+        try:
+            result = minimize(
+                self._objective_function,
+                x0=[initial_guess],
+                args=(param_name, timestamp),
+                method='Nelder-Mead'
+            )
+        finally:
+            rate.set_parameters(**{param_name: original})
         if result.success:
             return result.x[0]
         else:
@@ -74,11 +91,11 @@ if __name__ == '__main__':
     ethanol = Component('Ethanol', 'C2H6O')
     prop_pkg = PropertyPackage(components=[water, ethanol])
     stoich = {'Ethanol': -1, 'Product': 1}
-    # Initial guess for Arrhenius pre-exponential factor 'A'
-    initial_A = 0.005 
-    def arrhenius_k(T): return initial_A * np.exp(5000 * (1/310 - 1/T))
+    # Initial guess for Arrhenius pre-exponential factor 'A' (the rate constant at 310 K)
+    initial_A = 0.005
     reactants = {'Ethanol': 1}
-    reaction = PowerLawReaction('Ethanol_Conversion', stoich, arrhenius_k, reactants)
+    reaction = PowerLawReaction('Ethanol_Conversion', stoich, ArrheniusRate(A=initial_A, Ea=5000 * R_GAS, T_ref=310),
+                                reactants)
     reactor = CSTR(name='R-101', volume=50, prop_pkg=prop_pkg, reaction=reaction)
 
     target_map = {'model': 'Product', 'data': 'product_bioethanol_concentration'}
@@ -88,7 +105,7 @@ if __name__ == '__main__':
         tune_time = pd.Timestamp('2023-01-10 12:00:00')
         print(f"Initial Arrhenius 'A' factor: {initial_A}")
         
-        tuned_A = estimator.tune_parameter(tune_time, 'arrhenius_A', initial_A)
+        tuned_A = estimator.tune_parameter(tune_time, 'A', initial_A)
 
         if tuned_A is not None:
             print(f"Tuned Arrhenius 'A' factor: {tuned_A:.6f}")
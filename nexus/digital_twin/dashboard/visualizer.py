@@ -1,11 +1,10 @@
 import pandas as pd
 import matplotlib.pyplot as plt
-import numpy as np
 from nexus.digital_twin.rt_interface.data_interface import CSVDataReader
 from nexus.digital_twin.adaptation.model_adaptation import ParameterEstimator
 from nexus.nexus_core.models.unit_operations import CSTR
 from nexus.nexus_core.properties.property_models import PropertyPackage, Component
-from nexus.nexus_core.kinetics.kinetics import PowerLawReaction
+from nexus.nexus_core.kinetics.kinetics import PowerLawReaction, ArrheniusRate, R_GAS
 
 def run_and_visualize_adaptation(timestamp_str, data_path):
     """Runs the full adaptation and validation cycle and plots the results."""
@@ -19,9 +18,9 @@ def run_and_visualize_adaptation(timestamp_str, data_path):
     prop_pkg = PropertyPackage(components=[water, ethanol])
     stoich = {'Ethanol': -1, 'Product': 1}
     initial_A = 0.005
-    def arrhenius_k_initial(T): return initial_A * np.exp(5000 * (1/310 - 1/T))
     reactants = {'Ethanol': 1}
-    reaction = PowerLawReaction('Ethanol_Conversion', stoich, arrhenius_k_initial, reactants)
+    reaction = PowerLawReaction('Ethanol_Conversion', stoich, ArrheniusRate(A=initial_A, Ea=5000 * R_GAS, T_ref=310),
+                                reactants)
     reactor = CSTR(name='R-101', volume=50, prop_pkg=prop_pkg, reaction=reaction)
 
     target_map = {'model': 'Product', 'data': 'product_bioethanol_concentration'}
@@ -29,7 +28,7 @@ def run_and_visualize_adaptation(timestamp_str, data_path):
 
     # --- 2. Tune the model --- 
     tune_time = pd.Timestamp(timestamp_str)
-    tuned_A = estimator.tune_parameter(tune_time, 'arrhenius_A', initial_A)
+    tuned_A = estimator.tune_parameter(tune_time, 'A', initial_A)
     if tuned_A is None:
         print("Could not generate plot as tuning failed.")
         return
@@ -37,14 +36,11 @@ def run_and_visualize_adaptation(timestamp_str, data_path):
     # --- 3. Get results before and after tuning ---
     # Before tuning
     actual_data = reader.get_data_at_timestamp(tune_time)
-    reactor.reaction.rate_constant_func = arrhenius_k_initial
-    estimator._objective_function([initial_A], 'arrhenius_A', tune_time) # Reruns model
+    estimator._objective_function([initial_A], 'A', tune_time) # Reruns model
     pred_before = reactor.outlets[0]['composition']['Product']
 
     # After tuning
-    def arrhenius_k_tuned(T): return tuned_A * np.exp(5000 * (1/310 - 1/T))
-    reactor.reaction.rate_constant_func = arrhenius_k_tuned
-    estimator._objective_function([tuned_A], 'arrhenius_A', tune_time) # Reruns model
+    estimator._objective_function([tuned_A], 'A', tune_time) # Reruns model
     pred_after = reactor.outlets[0]['composition']['Product']
 
     actual_value = actual_data[target_map['data']] / 1000
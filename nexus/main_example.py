@@ -3,9 +3,9 @@ import numpy as np
 # --- Import all the necessary modules from the Nexus framework ---
 # Core simulation components
 from nexus.nexus_core.solver.flowsheet import Flowsheet, SequentialModularSolver
-from nexus.nexus_core.models.unit_operations import CSTR, UnitOperation
+from nexus.nexus_core.models.unit_operations import CSTR, Flash, UnitOperation
 from nexus.nexus_core.properties.property_models import PropertyPackage, Component
-from nexus.nexus_core.kinetics.kinetics import PowerLawReaction
+from nexus.nexus_core.kinetics.kinetics import PowerLawReaction, ConstantRate
 
 # Sustainability and economic analysis
 from nexus.sustainability.economics.calculator import EconomicCalculator
@@ -17,20 +17,9 @@ from nexus.optimization.algorithms.scipy_optimizer import ScipyOptimizer
 
 # Uncertainty Quantification
 from nexus.nexus_core.uq.monte_carlo import MonteCarlo
+from nexus.nexus_core.solver.instrumentation import Instrumentation
 
-# --- 1. Define a Custom Unit Operation (Separator) ---
-class Separator(UnitOperation):
-    """A simple component separator."""
-    def solve(self):
-        inlet = self.inlets[0]
-        # Split ethanol and water with 99% efficiency
-        self.outlets[0]['composition'] = {'Ethanol': inlet['composition'].get('Ethanol', 0) * 0.99, 'Water': inlet['composition'].get('Water', 0) * 0.01}
-        self.outlets[1]['composition'] = {'Ethanol': inlet['composition'].get('Ethanol', 0) * 0.01, 'Water': inlet['composition'].get('Water', 0) * 0.99}
-        for out in self.outlets:
-            out.update({k: v for k, v in inlet.items() if k != 'composition'})
-        print(f"Separator '{self.name}' solved.")
-
-# --- 2. Build the Flowsheet ---
+# --- 1. Build the Flowsheet ---
 def build_flowsheet():
     fs = Flowsheet(name='Bioethanol Process')
 
@@ -39,12 +28,16 @@ def build_flowsheet():
     prop_pkg = PropertyPackage(components=[Component('Ethanol', 'C2H6O'), 
                                            Component('Water', 'H2O'), 
                                            Component('Product', 'Prod', mw=100)])
-    reaction = PowerLawReaction('r1', {'Ethanol': -1, 'Product': 1}, lambda T: 0.1, {'Ethanol': 1})
+    # A declarative rate constant (rather than a lambda) keeps the flowsheet picklable
+    reaction = PowerLawReaction('r1', {'Ethanol': -1, 'Product': 1}, ConstantRate(0.1), {'Ethanol': 1})
 
     # Create and add unit operations
     feed_unit = UnitOperation(name='Feed')
     reactor = CSTR(name='R-101', volume=20, prop_pkg=prop_pkg, reaction=reaction)
-    separator = Separator(name='S-101')
+    # Water and unreacted ethanol are flashed off the reactor effluent under vacuum; the heavy
+    # 'Product' has no critical constants, so it gets a constant (near non-volatile) K-value
+    separator = Flash(name='S-101', prop_pkg=prop_pkg, temperature=370, pressure=10000,
+                      k_values={'Product': 0.001})
     product_unit = UnitOperation(name='Product')
     waste_unit = UnitOperation(name='Waste')
     
@@ -57,8 +50,9 @@ def build_flowsheet():
     # Connect the units, using the predefined 'feed_stream' for the first connection
     fs.connect('feed_stream', 'Feed', 'R-101')
     fs.connect('reactor_outlet', 'R-101', 'S-101')
-    fs.connect('product_stream', 'S-101', 'Product')
+    # Flash outlets are vapour first, then liquid
     fs.connect('waste_stream', 'S-101', 'Waste')
+    fs.connect('product_stream', 'S-101', 'Product')
     
     return fs
 
@@ -89,12 +83,17 @@ if __name__ == '__main__':
     print("="*50)
     
     class CostOptimizationProblem(OptimizationProblem):
+        def __init__(self, name, flowsheet):
+            super().__init__(name, flowsheet)
+            # One solver for all evaluations; it reuses the flowsheet's compiled plan
+            self.solver = SequentialModularSolver(flowsheet)
+
         def evaluate(self, x):
             # Update reactor volume
             reactor_volume = x[0]
             self.flowsheet.unit_ops['R-101'].volume = reactor_volume
             # Re-solve the flowsheet
-            SequentialModularSolver(self.flowsheet).solve()
+            self.solver.solve()
             # Calculate and return the objective: total annualized cost
             cost = EconomicCalculator(self.flowsheet).run_analysis()['TotalAnnualCost']
             print(f"  (Evaluating volume={reactor_volume:.2f} m^3, cost=${cost:,.2f})")
@@ -118,8 +117,10 @@ if __name__ == '__main__':
     # Reset to the optimal volume
     flowsheet.unit_ops['R-101'].volume = opt_result.x[0]
     
-    # The solver is needed for the UQ simulation runs
-    solver_uq = SequentialModularSolver(flowsheet)
+    # The solver is needed for the UQ simulation runs; keep it quiet inside the sampling loop
+    solver_uq = SequentialModularSolver(flowsheet, verbose=False)
+    for unit in flowsheet.unit_ops.values():
+        unit.verbose = False
     mc_sim = MonteCarlo(flowsheet, solver_uq, num_samples=200)
     
     # Create a single economic calculator instance for the UQ study
@@ -143,8 +144,11 @@ if __name__ == '__main__':
 
     mc_sim.add_output_response('TotalAnnualCost', get_total_cost)
 
-    # Run UQ simulation
-    uq_results = mc_sim.run_simulation()
+    # Run UQ simulation, recording where the solve time goes
+    with Instrumentation() as instr:
+        uq_results = mc_sim.run_simulation()
+    print("\n--- Solver Profile (UQ runs) ---")
+    instr.print_summary()
     if not uq_results.empty:
         MonteCarlo.analyze_results(uq_results)
 
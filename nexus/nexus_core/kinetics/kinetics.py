@@ -1,15 +1,222 @@
 import numpy as np
 
+R_GAS = 8.314  # Gas constant, J/(mol*K)
+
+class RateConstant:
+    """Base class of the declarative rate constants k(T).
+
+    Rate-constant objects can be pickled (to worker processes or a saved
+    flowsheet), described by a declarative spec (see to_spec()) and evaluated
+    on a whole temperature array at once. Their tunable coefficients are
+    named in ``parameter_names`` and can be changed in place (see
+    set_parameters()); every change bumps a revision, so reactors holding a
+    compiled reaction network know to rebuild it. Scalar evaluations are
+    cached per temperature, since k(T) is requested over and over at the
+    same temperature during a solve.
+    """
+    parameter_names = ()
+
+    # Number of temperatures kept in the scalar cache
+    CACHE_SIZE = 16
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if not name.startswith('_'):
+            object.__setattr__(self, '_revision', getattr(self, '_revision', 0) + 1)
+            object.__setattr__(self, '_cache', {})
+
+    @property
+    def parameters(self):
+        """The tunable coefficients, by name."""
+        return {name: getattr(self, name) for name in self.parameter_names}
+
+    def set_parameters(self, **values):
+        """Updates tunable coefficients in place, e.g. ``rate.set_parameters(A=2e3)``."""
+        for name, value in values.items():
+            if name not in self.parameter_names:
+                raise ValueError(f"{type(self).__name__} has no parameter '{name}'. "
+                                 f"Choose from {list(self.parameter_names)}.")
+            setattr(self, name, float(value))
+
+    def evaluate(self, T):
+        """k at an array of temperatures (no caching); implemented by subclasses."""
+        raise NotImplementedError("evaluate() must be implemented by subclasses.")
+
+    def __call__(self, T):
+        if np.ndim(T):
+            return self.evaluate(np.asarray(T, dtype=float))
+        T = float(T)
+        cache = self._cache
+        k = cache.get(T)
+        if k is None:
+            if len(cache) >= self.CACHE_SIZE:
+                cache.clear()
+            k = cache[T] = float(self.evaluate(np.asarray(T)))
+        return k
+
+class ConstantRate(RateConstant):
+    """A temperature-independent rate constant, k(T) = k."""
+    parameter_names = ('k',)
+
+    def __init__(self, k):
+        """
+        Args:
+            k (float): The rate constant.
+        """
+        self.k = float(k)
+
+    def evaluate(self, T):
+        return np.full(np.shape(T), self.k)
+
+    def to_spec(self):
+        return {'type': 'constant', 'k': self.k}
+
+    def __repr__(self):
+        return f"ConstantRate(k={self.k!r})"
+
+class ArrheniusRate(RateConstant):
+    """An Arrhenius rate constant.
+
+    k(T) = A * exp(-Ea / (R * T)), or, when a reference temperature is given,
+    k(T) = A * exp(-Ea / R * (1/T - 1/T_ref)) so that A is the rate constant at T_ref.
+    """
+    parameter_names = ('A', 'Ea')
+
+    def __init__(self, A, Ea, T_ref=None):
+        """
+        Args:
+            A (float): Pre-exponential factor (or the rate constant at T_ref).
+            Ea (float): Activation energy (J/mol).
+            T_ref (float): Optional reference temperature (K).
+        """
+        self.A = float(A)
+        self.Ea = float(Ea)
+        self.T_ref = None if T_ref is None else float(T_ref)
+
+    def evaluate(self, T):
+        inv_t = 1.0 / T
+        if self.T_ref is not None:
+            inv_t = inv_t - 1.0 / self.T_ref
+        return self.A * np.exp(-self.Ea / R_GAS * inv_t)
+
+    def to_spec(self):
+        return {'type': 'arrhenius', 'A': self.A, 'Ea': self.Ea, 'T_ref': self.T_ref}
+
+    def __repr__(self):
+        return f"ArrheniusRate(A={self.A!r}, Ea={self.Ea!r}, T_ref={self.T_ref!r})"
+
+class ModifiedArrheniusRate(ArrheniusRate):
+    """A modified Arrhenius rate constant with a temperature power.
+
+    k(T) = A * T^n * exp(-Ea / (R * T)), or, when a reference temperature is given,
+    k(T) = A * (T / T_ref)^n * exp(-Ea / R * (1/T - 1/T_ref)) so that A is the rate constant at T_ref.
+    """
+    parameter_names = ('A', 'n', 'Ea')
+
+    def __init__(self, A, n, Ea, T_ref=None):
+        """
+        Args:
+            A (float): Pre-exponential factor (or the rate constant at T_ref).
+            n (float): Temperature exponent.
+            Ea (float): Activation energy (J/mol).
+            T_ref (float): Optional reference temperature (K).
+        """
+        super().__init__(A, Ea, T_ref)
+        self.n = float(n)
+
+    def evaluate(self, T):
+        ratio = T if self.T_ref is None else T / self.T_ref
+        return super().evaluate(T) * ratio ** self.n
+
+    def to_spec(self):
+        return {'type': 'modified_arrhenius', 'A': self.A, 'n': self.n, 'Ea': self.Ea, 'T_ref': self.T_ref}
+
+    def __repr__(self):
+        return f"ModifiedArrheniusRate(A={self.A!r}, n={self.n!r}, Ea={self.Ea!r}, T_ref={self.T_ref!r})"
+
+RATE_CONSTANTS = {'constant': ConstantRate, 'arrhenius': ArrheniusRate, 'modified_arrhenius': ModifiedArrheniusRate}
+
+def rate_constant_from_spec(spec):
+    """Builds a rate-constant callable from a declarative spec.
+
+    Args:
+        spec: A number (constant k), a dict such as {'type': 'arrhenius', 'A': 1e3,
+              'Ea': 5e4, 'T_ref': 350}, or a callable (returned unchanged).
+
+    Returns:
+        callable: k(T).
+    """
+    if callable(spec):
+        return spec
+    if isinstance(spec, (int, float)):
+        return ConstantRate(spec)
+    if isinstance(spec, dict):
+        params = dict(spec)
+        kind = params.pop('type', None)
+        if kind not in RATE_CONSTANTS:
+            raise ValueError(f"Unknown rate constant type '{kind}'. Choose from {sorted(RATE_CONSTANTS)}.")
+        return RATE_CONSTANTS[kind](**params)
+    raise ValueError(f"Cannot build a rate constant from {spec!r}.")
+
 class Reaction:
     """Base class for a chemical reaction."""
     def __init__(self, name, stoichiometry):
+        self._revision = 0
         self.name = name
         self.stoichiometry = stoichiometry
 
+    def __setattr__(self, name, value):
+        # Bump the revision so units using this reaction know to re-solve
+        object.__setattr__(self, name, value)
+        if not name.startswith('_'):
+            object.__setattr__(self, '_revision', getattr(self, '_revision', 0) + 1)
+
+    def revision(self):
+        """A token that changes whenever the reaction changes."""
+        return (self._revision,)
+
     def get_rate(self, composition, temperature):
         """Calculates the rate of reaction."""
         raise NotImplementedError("get_rate() must be implemented by subclasses.")
 
+    def get_rate_from_array(self, concentrations, index, temperature):
+        """Calculates the rate from a concentration vector.
+
+        Args:
+            concentrations (np.ndarray): Concentrations in vector order, or an (N, ncomp)
+                                         array with one scenario per row.
+            index (dict): Maps component name -> position in the vector.
+            temperature (float or np.ndarray): Temperature in Kelvin ((N,) for a batch).
+        """
+        if np.ndim(concentrations) > 1:
+            return np.array([self.get_rate({name: row[i] for name, i in index.items()}, t)
+                             for row, t in zip(concentrations, np.broadcast_to(temperature, len(concentrations)))])
+        return self.get_rate({name: concentrations[i] for name, i in index.items()}, temperature)
+
+    def get_rate_jacobian_from_array(self, concentrations, index, temperature):
+        """Derivatives of the rate with respect to each concentration.
+
+        The base class uses forward differences on get_rate_from_array();
+        subclasses with a closed-form rate override it.
+
+        Args:
+            concentrations (np.ndarray): (ncomp,) vector or (N, ncomp) batch.
+            index (dict): Maps component name -> position in the vector.
+            temperature (float or np.ndarray): Temperature in Kelvin ((N,) for a batch).
+
+        Returns:
+            np.ndarray: Same shape as ``concentrations``.
+        """
+        c = np.asarray(concentrations, dtype=float)
+        base = np.asarray(self.get_rate_from_array(c, index, temperature))
+        jac = np.zeros_like(c)
+        for k in range(c.shape[-1]):
+            h = 1e-7 * np.maximum(np.abs(c[..., k]), 1e-6)
+            c_pert = c.copy()
+            c_pert[..., k] += h
+            jac[..., k] = (np.asarray(self.get_rate_from_array(c_pert, index, temperature)) - base) / h
+        return jac
+
 class PowerLawReaction(Reaction):
     """Represents a reaction following a power-law rate expression."""
     def __init__(self, name, stoichiometry, rate_constant_func, reactants):
@@ -18,12 +225,18 @@ class PowerLawReaction(Reaction):
             name (str): Name of the reaction.
             stoichiometry (dict): Stoichiometric coefficients (negative for reactants).
             rate_constant_func (callable): A function that takes temperature (K) and returns the rate constant (k).
+                                           A number or a spec dict (see rate_constant_from_spec) is also
+                                           accepted; unlike lambdas, these can be pickled.
             reactants (dict): A dictionary mapping reactant names to their reaction order.
         """
         super().__init__(name, stoichiometry)
-        self.rate_constant_func = rate_constant_func
+        self.rate_constant_func = rate_constant_from_spec(rate_constant_func)
         self.reactants = reactants
 
+    def revision(self):
+        """A token that changes whenever the reaction or the parameters of its rate constant change."""
+        return (self._revision, getattr(self.rate_constant_func, '_revision', 0))
+
     def get_rate(self, composition, temperature):
         """
         Calculates the reaction rate based on the power-law model.
@@ -37,6 +250,55 @@ class PowerLawReaction(Reaction):
             rate *= composition[reactant] ** order
         return rate
 
+    def get_rate_from_array(self, concentrations, index, temperature):
+        """Power-law rate from a concentration vector (or (N, ncomp) batch), without building a dict."""
+        for reactant in self.reactants:
+            if reactant not in index:
+                raise ValueError(f"Reactant '{reactant}' not found in composition.")
+        if np.ndim(concentrations) > 1:
+            rate = self._batch_rate_constants(temperature, len(concentrations))
+            for reactant, order in self.reactants.items():
+                rate = rate * concentrations[:, index[reactant]] ** order
+            return rate
+        rate = self.rate_constant_func(temperature)
+        for reactant, order in self.reactants.items():
+            rate *= float(concentrations[index[reactant]]) ** order
+        return rate
+
+    def get_rate_jacobian_from_array(self, concentrations, index, temperature):
+        """Analytic derivatives d(rate)/dc_i = order_i * k * c_i^(order_i - 1) * prod_(j != i) c_j^order_j."""
+        for reactant in self.reactants:
+            if reactant not in index:
+                raise ValueError(f"Reactant '{reactant}' not found in composition.")
+        c = np.asarray(concentrations, dtype=float)
+        batch = c.ndim > 1
+        c2 = c if batch else c[np.newaxis, :]
+        k = self._batch_rate_constants(temperature if batch else [temperature], len(c2))
+        powers = {r: c2[:, index[r]] ** order for r, order in self.reactants.items()}
+        jac = np.zeros_like(c2)
+        for reactant, order in self.reactants.items():
+            i = index[reactant]
+            if order == 1:
+                term = k.copy()
+            else:
+                # Orders below one have an unbounded slope at c = 0; evaluate just above it
+                base = np.maximum(c2[:, i], 1e-12) if order < 1 else c2[:, i]
+                term = k * order * base ** (order - 1)
+            for other, power in powers.items():
+                if other != reactant:
+                    term = term * power
+            jac[:, i] += term
+        return jac if batch else jac[0]
+
+    def _batch_rate_constants(self, temperatures, size):
+        """k(T) for N scenarios; rate functions that only accept scalars are called per row."""
+        temperatures = np.broadcast_to(np.asarray(temperatures, dtype=float), (size,))
+        try:
+            k = np.broadcast_to(np.asarray(self.rate_constant_func(temperatures), dtype=float), (size,))
+        except (TypeError, ValueError):
+            k = np.array([self.rate_constant_func(float(t)) for t in temperatures])
+        return k
+
 # Example Usage:
 if __name__ == '__main__':
     # Define a simple first-order reaction A -> B
@@ -70,3 +332,10 @@ if __name__ == '__main__':
 
     print(f"Reaction: {reaction.name}")
     print(f"Rate at {temp} K: {rate:.6f} mol/L*s")
+
+    # Declarative rate constants: named parameters, array evaluation and in-place updates
+    k_mod = ModifiedArrheniusRate(A=0.02, n=0.5, Ea=7e4, T_ref=350)
+    print(f"\n{k_mod!r}, parameters {k_mod.parameters}")
+    print("k at 330, 350, 370 K:", np.round(k_mod(np.array([330.0, 350.0, 370.0])), 5))
+    k_mod.set_parameters(A=0.04)
+    print(f"After set_parameters(A=0.04): k(350 K) = {k_mod(350.0):.3f}")
@@ -0,0 +1,290 @@
+import numpy as np
+from scipy import sparse as sp
+from nexus.nexus_core.kinetics.kinetics import (R_GAS, ConstantRate, ArrheniusRate, ModifiedArrheniusRate,
+                                               PowerLawReaction)
+
+class ReactionNetwork:
+    """A set of reactions compiled into arrays for vectorized evaluation.
+
+    The network holds the (n_reactions, n_species) stoichiometric matrix S
+    (a scipy.sparse CSR matrix for large, sparse mechanisms) and, for the
+    power-law reactions, padded (n_reactions, max_reactants) arrays of
+    reactant columns and orders, so that all rates
+
+        r_j = k_j(T) * prod_i c_i^a_ji
+
+    and the species production terms w = S^T r, with their analytic
+    Jacobians, take a few NumPy operations for a concentration vector or an
+    (N, n_species) batch. Constant and (modified) Arrhenius rate constants
+    are evaluated as arrays too; other rate-constant callables and
+    non-power-law reactions are evaluated per reaction.
+
+    The network is a snapshot: after changing a reaction (or its rate-constant
+    parameters), build a new one. Reactors do this automatically when a
+    reaction's revision() changes.
+    """
+
+    # Mechanisms with at least this many reactions and at most this density use sparse S
+    SPARSE_MIN_REACTIONS = 50
+    SPARSE_MAX_DENSITY = 0.1
+
+    def __init__(self, reactions, species=None, sparse=None):
+        """
+        Args:
+            reactions (list): The reactions (PowerLawReaction or other Reaction subclasses).
+            species (list): Species order of the concentration vectors; defaults to the
+                            species of the reactions, in order of first appearance. It may
+                            include species that take no part in any reaction.
+            sparse (bool): Store S as a sparse matrix; chosen from the size and density if None.
+        """
+        self.reactions = list(reactions)
+        if species is None:
+            names = {}
+            for rxn in self.reactions:
+                names.update(dict.fromkeys(rxn.stoichiometry))
+                names.update(dict.fromkeys(getattr(rxn, 'reactants', ())))
+            species = list(names)
+        self.species = tuple(species)
+        self.index = {name: i for i, name in enumerate(self.species)}
+        n_rxn, n_species = len(self.reactions), len(self.species)
+
+        rows, cols, coeffs = [], [], []
+        for j, rxn in enumerate(self.reactions):
+            for comp, nu in rxn.stoichiometry.items():
+                if comp not in self.index:
+                    raise ValueError(f"Species '{comp}' of reaction '{rxn.name}' is not in the network species.")
+                rows.append(j)
+                cols.append(self.index[comp])
+                coeffs.append(float(nu))
+        stoich = sp.csr_matrix((coeffs, (rows, cols)), shape=(n_rxn, n_species))
+        if sparse is None:
+            density = stoich.nnz / max(n_rxn * n_species, 1)
+            sparse = n_rxn >= self.SPARSE_MIN_REACTIONS and density <= self.SPARSE_MAX_DENSITY
+        self.sparse = bool(sparse)
+        self.stoichiometry = stoich if self.sparse else stoich.toarray()
+
+        # Padded reactant layout of the power-law reactions (order 0 pads contribute a factor of 1)
+        power_law = [isinstance(rxn, PowerLawReaction) for rxn in self.reactions]
+        width = max([len(rxn.reactants) for rxn, p in zip(self.reactions, power_law) if p] or [0])
+        self._columns = np.zeros((n_rxn, width), dtype=int)
+        self._orders = np.zeros((n_rxn, width))
+        for j, rxn in enumerate(self.reactions):
+            if not power_law[j]:
+                continue
+            for g, (reactant, order) in enumerate(rxn.reactants.items()):
+                if reactant not in self.index:
+                    raise ValueError(f"Reactant '{reactant}' not found in composition.")
+                self._columns[j, g] = self.index[reactant]
+                self._orders[j, g] = order
+        self._padding = self._orders == 0
+        self._generic = [j for j, p in enumerate(power_law) if not p]
+
+        # Rate constants: constants and (modified) Arrhenius expressions as arrays, other callables per reaction
+        self._k_const = np.zeros(n_rxn)
+        self._arrhenius = []
+        self._k_callables = []
+        arrhenius = []
+        for j, rxn in enumerate(self.reactions):
+            if not power_law[j]:
+                continue
+            func = rxn.rate_constant_func
+            if type(func) is ConstantRate:
+                self._k_const[j] = func.k
+            elif type(func) in (ArrheniusRate, ModifiedArrheniusRate):
+                self._arrhenius.append(j)
+                t_ref = func.T_ref
+                arrhenius.append((func.A, func.Ea / R_GAS, getattr(func, 'n', 0.0),
+                                  0.0 if t_ref is None else 1.0 / t_ref, 1.0 if t_ref is None else t_ref))
+            else:
+                self._k_callables.append(j)
+        self._arrhenius = np.array(self._arrhenius, dtype=int)
+        # Columns: A, Ea / R, n, 1 / T_ref (0 without a reference), T_ref (1 without a reference)
+        self._arrhenius_params = np.array(arrhenius).reshape(-1, 5).T
+        self._k_temperature = None
+        self._k_point = None
+
+    @property
+    def n_reactions(self):
+        return len(self.reactions)
+
+    @property
+    def n_species(self):
+        return len(self.species)
+
+    def rate_constants(self, temperature, size=None):
+        """Rate constants of the power-law reactions.
+
+        Args:
+            temperature (float or np.ndarray): Temperature (K), scalar or (N,).
+            size (int): N, to broadcast a scalar temperature to a batch.
+
+        Returns:
+            np.ndarray: (n_reactions,) for a scalar temperature without ``size``, else (N, n_reactions).
+        """
+        T = np.asarray(temperature, dtype=float)
+        scalar = T.ndim == 0 and size is None
+        T = np.broadcast_to(np.atleast_1d(T), (size if size is not None else T.size,))
+        k = np.repeat(self._k_const[np.newaxis, :], len(T), axis=0)
+        if self._arrhenius.size:
+            A, E, n, inv_ref, t_ref = self._arrhenius_params
+            T_col = T[:, np.newaxis]
+            k[:, self._arrhenius] = A * (T_col / t_ref) ** n * np.exp(-E * (1.0 / T_col - inv_ref))
+        for j in self._k_callables:
+            k[:, j] = self.reactions[j]._batch_rate_constants(T, len(T))
+        return k[0] if scalar else k
+
+    def _point_rate_constants(self, temperature):
+        """rate_constants() at one temperature, cached for repeated calls at the same temperature."""
+        if temperature != self._k_temperature:
+            self._k_point = self.rate_constants(temperature)
+            self._k_temperature = temperature
+        return self._k_point
+
+    def _power_terms(self, c):
+        """(N, n_reactions, width) factors c_i^a_ji of the padded reactant layout."""
+        return c[:, self._columns] ** self._orders
+
+    def _batch(self, concentrations, temperature):
+        c = np.asarray(concentrations, dtype=float)
+        single = c.ndim == 1
+        c2 = c[np.newaxis, :] if single else c
+        if c2.shape[1] != self.n_species:
+            raise ValueError(f"Expected {self.n_species} concentrations per row, got {c2.shape[1]}.")
+        T = np.broadcast_to(np.asarray(temperature, dtype=float), (len(c2),))
+        return c2, T, single
+
+    def rates(self, concentrations, temperature):
+        """Rates of all reactions.
+
+        Args:
+            concentrations (np.ndarray): (n_species,) vector or (N, n_species) batch.
+            temperature (float or np.ndarray): Temperature (K), scalar or (N,).
+
+        Returns:
+            np.ndarray: (n_reactions,) or (N, n_reactions).
+        """
+        if np.ndim(concentrations) == 1 and np.ndim(temperature) == 0:
+            # Single-point path (ODE right-hand sides): no batch axis, k(T) reused across calls
+            c = np.asarray(concentrations, dtype=float)
+            if len(c) != self.n_species:
+                raise ValueError(f"Expected {self.n_species} concentrations per row, got {len(c)}.")
+            r = self._point_rate_constants(float(temperature)) * (c[self._columns] ** self._orders).prod(axis=1)
+            for j in self._generic:
+                r[j] = self.reactions[j].get_rate_from_array(c, self.index, temperature)
+            return r
+        c, T, single = self._batch(concentrations, temperature)
+        r = self.rate_constants(T, len(c)) * self._power_terms(c).prod(axis=2)
+        for j in self._generic:
+            r[:, j] = self.reactions[j].get_rate_from_array(c, self.index, T)
+        return r[0] if single else r
+
+    def production_rates(self, concentrations, temperature):
+        """Net production rate of each species, w = S^T r.
+
+        Returns:
+            np.ndarray: (n_species,) or (N, n_species).
+        """
+        r = self.rates(concentrations, temperature)
+        return r @ self.stoichiometry
+
+    def _entry_derivatives(self, c, T):
+        """(N, n_reactions, width) derivatives of each rate with respect to each padded reactant entry."""
+        k = self.rate_constants(T, len(c))
+        terms = self._power_terms(c)
+        # Product of the other factors of each reaction: exclusive prefix times exclusive suffix products
+        ones = np.ones(terms.shape[:2] + (1,))
+        prefix = np.concatenate([ones, np.cumprod(terms, axis=2)[:, :, :-1]], axis=2)
+        suffix = np.concatenate([np.cumprod(terms[:, :, ::-1], axis=2)[:, :, -2::-1], ones], axis=2)
+        # d(c^a)/dc = a c^(a - 1); orders below one have an unbounded slope at c = 0, so
+        # evaluate just above it (as PowerLawReaction does); padding entries have zero slope
+        base = c[:, self._columns]
+        base = np.where(self._orders < 1, np.maximum(base, 1e-12), base)
+        base = np.where(self._padding, 1.0, base)
+        slopes = np.where(self._padding, 0.0, self._orders * base ** (self._orders - 1))
+        return k[:, :, np.newaxis] * slopes * prefix * suffix
+
+    def rate_jacobian(self, concentrations, temperature):
+        """Derivatives d r_j / d c_k of all rates.
+
+        Returns:
+            np.ndarray: (n_reactions, n_species) or (N, n_reactions, n_species).
+        """
+        c, T, single = self._batch(concentrations, temperature)
+        derivatives = self._entry_derivatives(c, T)
+        jac = np.zeros((len(c), self.n_reactions, self.n_species))
+        reaction_rows = np.arange(self.n_reactions)
+        for g in range(self._columns.shape[1]):
+            # Within one slot each reaction appears once, so the fancy-index update cannot collide
+            jac[:, reaction_rows, self._columns[:, g]] += derivatives[:, :, g]
+        for j in self._generic:
+            jac[:, j, :] = self.reactions[j].get_rate_jacobian_from_array(c, self.index, T)
+        return jac[0] if single else jac
+
+    def production_jacobian(self, concentrations, temperature):
+        """Derivatives d w_i / d c_k of the species production terms, S^T dr/dc.
+
+        For sparse networks dr/dc is kept sparse (one entry per reactant), so
+        the dense (N, n_reactions, n_species) rate Jacobian is never formed.
+
+        Returns:
+            np.ndarray: (n_species, n_species) or (N, n_species, n_species).
+        """
+        c, T, single = self._batch(concentrations, temperature)
+        n, n_species = len(c), self.n_species
+        if self.sparse and not self._generic:
+            # dr/dc of all scenarios side by side: (n_reactions, N * n_species)
+            derivatives = self._entry_derivatives(c, T)
+            rows = np.broadcast_to(np.arange(self.n_reactions)[np.newaxis, :, np.newaxis], derivatives.shape)
+            cols = np.arange(n)[:, np.newaxis, np.newaxis] * n_species + self._columns
+            stacked = sp.csr_matrix((derivatives.ravel(), (rows.ravel(), cols.ravel())),
+                                    shape=(self.n_reactions, n * n_species))
+            result = (self.stoichiometry.T @ stacked).toarray()
+        else:
+            jac = self.rate_jacobian(c, T)
+            stacked = jac.transpose(1, 0, 2).reshape(self.n_reactions, n * n_species)
+            result = np.asarray(self.stoichiometry.T @ stacked)
+        # (n_species, N * n_species) -> (N, n_species, n_species)
+        result = result.reshape(n_species, n, n_species).transpose(1, 0, 2)
+        return result[0] if single else result
+
+# Example Usage:
+if __name__ == '__main__':
+    import time
+
+    # A random mechanism: 300 reactions among 100 species, each with one or two
+    # reactants, first or second order, and Arrhenius rate constants
+    rng = np.random.default_rng(0)
+    n_species, n_reactions = 100, 300
+    names = [f'S{i}' for i in range(n_species)]
+    reactions = []
+    for j in range(n_reactions):
+        picks = rng.choice(n_species, size=4, replace=False)
+        reactants = {names[p]: int(rng.integers(1, 3)) for p in picks[:rng.integers(1, 3)]}
+        stoich = {name: -1 for name in reactants}
+        stoich.update({names[p]: 1 for p in picks[2:]})
+        rate = ArrheniusRate(A=rng.uniform(0.1, 10.0), Ea=rng.uniform(1e4, 5e4), T_ref=350.0)
+        reactions.append(PowerLawReaction(f'r{j}', stoich, rate, reactants))
+
+    network = ReactionNetwork(reactions, species=names)
+    print(f"{network.n_reactions} reactions, {network.n_species} species, sparse S: {network.sparse}")
+
+    c = rng.uniform(0.0, 1.0, n_species)
+    start = time.perf_counter()
+    loop = np.zeros(n_species)
+    for rxn in reactions:
+        rate = rxn.get_rate_from_array(c, network.index, 360.0)
+        for comp, nu in rxn.stoichiometry.items():
+            loop[network.index[comp]] += nu * rate
+    loop_time = time.perf_counter() - start
+    start = time.perf_counter()
+    w = network.production_rates(c, 360.0)
+    network_time = time.perf_counter() - start
+    print(f"Production rates: per-reaction loop {loop_time * 1e3:.2f} ms, network {network_time * 1e3:.2f} ms, "
+          f"max difference {np.abs(w - loop).max():.1e}")
+
+    # 1,000 scenarios with their production Jacobians
+    batch = rng.uniform(0.0, 1.0, (1000, n_species))
+    temperatures = rng.uniform(330.0, 380.0, 1000)
+    start = time.perf_counter()
+    jac = network.production_jacobian(batch, temperatures)
+    print(f"Production Jacobians of {len(batch)} scenarios {jac.shape} in {(time.perf_counter() - start) * 1e3:.1f} ms")
@@ -0,0 +1,120 @@
+import numpy as np
+
+def rachford_rice(z, K, tol=1e-12, max_iter=50):
+    """Solves the Rachford-Rice equation for many feeds at once.
+
+    Finds the vapour fraction beta of each feed from
+
+        f(beta) = sum_i z_i (K_i - 1) / (1 + beta (K_i - 1)) = 0
+
+    f is strictly decreasing, so feeds with f(0) <= 0 are subcooled liquid
+    (beta = 0) and feeds with f(1) >= 0 superheated vapour (beta = 1). For the
+    two-phase rows, Newton steps are kept inside a bracket that shrinks with
+    every evaluation; a step leaving the bracket is replaced by bisection
+    (Brent-style safeguarding), so every row converges. Only the rows that
+    have not converged yet are iterated.
+
+    Args:
+        z (np.ndarray): (N, ncomp) feed mole fractions (or (ncomp,) for one feed).
+        K (np.ndarray): K-values, same shape as ``z``.
+        tol (float): Convergence tolerance on beta.
+        max_iter (int): Maximum number of iterations.
+
+    Returns:
+        tuple: (beta, iterations, converged); arrays of shape (N,), or scalars for a single feed.
+    """
+    z = np.asarray(z, dtype=float)
+    K = np.asarray(K, dtype=float)
+    single = z.ndim == 1
+    z2 = np.atleast_2d(z)
+    d = np.atleast_2d(K) - 1.0
+    n = len(z2)
+
+    f0 = np.einsum('ij,ij->i', z2, d)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # K = 0 (non-volatile) components make f(1) = -inf, which still brackets the root
+        f1 = np.einsum('ij,ij->i', z2, np.where(z2 > 0, d / (1.0 + d), 0.0))
+    beta = np.where(f0 <= 0.0, 0.0, 1.0)
+    iterations = np.zeros(n, dtype=int)
+    converged = np.ones(n, dtype=bool)
+
+    rows = np.nonzero((f0 > 0.0) & (f1 < 0.0))[0]
+    if rows.size:
+        zr, dr = z2[rows], d[rows]
+        lo = np.zeros(rows.size)
+        hi = np.ones(rows.size)
+        # Start from the secant between the bracket ends
+        b = f0[rows] / (f0[rows] - f1[rows])
+        active = np.arange(rows.size)
+        done = np.zeros(rows.size, dtype=bool)
+        its = np.zeros(rows.size, dtype=int)
+        for _ in range(max_iter):
+            if active.size == 0:
+                break
+            its[active] += 1
+            ba = b[active]
+            denom = 1.0 + ba[:, np.newaxis] * dr[active]
+            t = dr[active] / denom
+            f = np.einsum('ij,ij->i', zr[active], t)
+            df = -np.einsum('ij,ij->i', zr[active], t * t)
+            # f is decreasing: a positive value puts the root above beta
+            positive = f > 0.0
+            lo[active] = np.where(positive, ba, lo[active])
+            hi[active] = np.where(positive, hi[active], ba)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                b_new = ba - f / df
+            # Inclusive bounds: a converged Newton step lands on the bracket end it just set
+            outside = ~((b_new >= lo[active]) & (b_new <= hi[active]))
+            b_new[outside] = 0.5 * (lo[active][outside] + hi[active][outside])
+            step = np.abs(b_new - ba)
+            b[active] = b_new
+            finished = (step <= tol) | (f == 0.0) | (hi[active] - lo[active] <= tol)
+            done[active[finished]] = True
+            active = active[~finished]
+        beta[rows] = b
+        iterations[rows] = its
+        converged[rows] = done
+
+    if single:
+        return float(beta[0]), int(iterations[0]), bool(converged[0])
+    return beta, iterations, converged
+
+def phase_compositions(z, K, beta):
+    """Liquid and vapour mole fractions for given vapour fractions.
+
+    Args:
+        z (np.ndarray): (N, ncomp) feed mole fractions (or (ncomp,)).
+        K (np.ndarray): K-values, same shape as ``z``.
+        beta (np.ndarray): (N,) vapour fractions (or a scalar).
+
+    Returns:
+        tuple: (x, y) liquid and vapour mole fractions, normalised to sum to one.
+    """
+    z = np.asarray(z, dtype=float)
+    K = np.asarray(K, dtype=float)
+    beta = np.asarray(beta, dtype=float)[..., np.newaxis]
+    x = z / (1.0 + beta * (K - 1.0))
+    y = K * x
+    x /= np.maximum(x.sum(axis=-1, keepdims=True), 1e-300)
+    y /= np.maximum(y.sum(axis=-1, keepdims=True), 1e-300)
+    return x, y
+
+# Example Usage:
+if __name__ == '__main__':
+    import time
+
+    # A light, a middle and a heavy component at 10,000 feed compositions
+    rng = np.random.default_rng(0)
+    z = rng.dirichlet([1.0, 1.0, 1.0], size=10000)
+    K = np.array([3.0, 1.1, 0.2]) * rng.uniform(0.5, 1.5, size=(10000, 1))
+
+    start = time.perf_counter()
+    beta, iterations, converged = rachford_rice(z, K)
+    elapsed = time.perf_counter() - start
+    two_phase = (beta > 0) & (beta < 1)
+    print(f"Flashed {len(z)} feeds in {elapsed * 1e3:.1f} ms: {two_phase.sum()} two-phase, "
+          f"max {iterations.max()} iterations, all converged: {converged.all()}")
+
+    x, y = phase_compositions(z, K, beta)
+    balance = np.abs((1 - beta)[:, None] * x + beta[:, None] * y - z)[two_phase].max()
+    print(f"Max component balance error of the two-phase feeds: {balance:.1e}")
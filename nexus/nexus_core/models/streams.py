@@ -0,0 +1,491 @@
+from collections.abc import Mapping, MutableMapping
+import numpy as np
+
+# Canonical component tuples and their name -> position maps. Streams that carry
+# the same components share one tuple, so compatibility checks are identity tests.
+_COMPONENT_TUPLES = {}
+_COMPONENT_INDEX = {}
+
+def intern_components(components):
+    """Returns the canonical tuple for a sequence of component names."""
+    components = tuple(components)
+    canonical = _COMPONENT_TUPLES.get(components)
+    if canonical is None:
+        canonical = _COMPONENT_TUPLES[components] = components
+        _COMPONENT_INDEX[canonical] = {name: i for i, name in enumerate(canonical)}
+    return canonical
+
+def component_index(components):
+    """Maps component name -> vector position for a canonical component tuple."""
+    index = _COMPONENT_INDEX.get(components)
+    if index is None:
+        index = _COMPONENT_INDEX[intern_components(components)]
+    return index
+
+class CompositionView(MutableMapping):
+    """Dict-like, live view of a Stream's composition vector."""
+    __slots__ = ('_stream',)
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def __getitem__(self, name):
+        stream = self._stream
+        return float(stream.fractions[component_index(stream.components)[name]])
+
+    def __setitem__(self, name, value):
+        stream = self._stream
+        index = component_index(stream.components)
+        if name not in index:
+            stream._add_components((name,))
+            index = component_index(stream.components)
+        stream.fractions[index[name]] = value
+
+    def __delitem__(self, name):
+        stream = self._stream
+        index = component_index(stream.components)
+        keep = [i for n, i in index.items() if n != name]
+        if len(keep) == len(index):
+            raise KeyError(name)
+        stream.components = intern_components(stream.components[i] for i in keep)
+        stream.fractions = stream.fractions[keep]
+
+    def __iter__(self):
+        return iter(self._stream.components)
+
+    def __len__(self):
+        return len(self._stream.components)
+
+    def __contains__(self, name):
+        return name in component_index(self._stream.components)
+
+    def copy(self):
+        return dict(zip(self._stream.components, self._stream.fractions.tolist()))
+
+    def __repr__(self):
+        return repr(self.copy())
+
+class Stream(MutableMapping):
+    """A material stream with scalar state and an array-backed composition.
+
+    The flow rate, temperature and pressure are plain attributes and the
+    composition is a float64 vector of mole fractions (``fractions``) ordered
+    by ``components`` - normally ``PropertyPackage.component_names``. Units
+    can read and write the vector in place, so a solve allocates nothing when
+    a stream keeps its components.
+
+    For backward compatibility a Stream also behaves like the dict streams
+    used throughout the code base: ``stream['flow_rate']``,
+    ``stream['composition']['Ethanol']``, ``stream.get(...)``, ``update()``
+    and ``dict(stream)`` all work. ``stream['composition']`` is a live view of
+    the vector; assigning a dict to it replaces the composition, components
+    included. Scalar fields that are None count as missing for ``in``,
+    iteration and ``get(key, default)``.
+    """
+    __slots__ = ('name', 'flow_rate', 'temperature', 'pressure', 'components', 'fractions', '_extra')
+
+    _FIELDS = ('name', 'flow_rate', 'temperature', 'pressure')
+
+    def __init__(self, name=None, components=(), composition=None, flow_rate=None,
+                 temperature=None, pressure=None):
+        """
+        Args:
+            name (str): Stream name.
+            components (list): Component names, in vector order.
+            composition (dict or array): Mole fractions by name, or a vector in ``components`` order.
+            flow_rate (float): Volumetric flow rate (m^3/s).
+            temperature (float): Temperature (K).
+            pressure (float): Pressure (Pa).
+        """
+        self.name = name
+        self.flow_rate = flow_rate
+        self.temperature = temperature
+        self.pressure = pressure
+        self.components = intern_components(components)
+        self.fractions = np.zeros(len(self.components))
+        self._extra = None
+        if isinstance(composition, Mapping) and not isinstance(composition, CompositionView) and self.components:
+            # Declared components keep their order; those missing from the mapping are zero
+            composition = {**dict.fromkeys(self.components, 0.0), **composition}
+        if composition is not None:
+            self.set_composition(composition)
+
+    @classmethod
+    def from_dict(cls, data, components=()):
+        """Builds a Stream from a dict stream (extra keys are kept)."""
+        stream = cls(components=components)
+        stream.update(data)
+        return stream
+
+    def to_dict(self):
+        """A plain dict stream with an independent composition dict."""
+        data = dict(self)
+        data['composition'] = self.composition.copy()
+        return data
+
+    @property
+    def composition(self):
+        return CompositionView(self)
+
+    @composition.setter
+    def composition(self, value):
+        self.set_composition(value)
+
+    def _add_components(self, names):
+        new = [n for n in dict.fromkeys(names) if n not in component_index(self.components)]
+        if new:
+            self.components = intern_components(self.components + tuple(new))
+            self.fractions = np.concatenate([self.fractions, np.zeros(len(new))])
+
+    def set_composition(self, composition):
+        """Replaces the composition (a mapping by name, or a vector in ``components`` order)."""
+        if isinstance(composition, CompositionView):
+            composition = composition._stream
+            self.set_fractions(composition.components, composition.fractions)
+            return
+        if not isinstance(composition, Mapping):
+            values = np.asarray(composition, dtype=float)
+            if values.shape != self.fractions.shape:
+                raise ValueError("Composition vector does not match the stream components.")
+            np.copyto(self.fractions, values)
+            return
+        # Like a dict stream, the mapping's keys become the components (in place when unchanged)
+        components = intern_components(composition)
+        values = np.fromiter(composition.values(), dtype=float, count=len(components))
+        if components is self.components:
+            np.copyto(self.fractions, values)
+        else:
+            self.components = components
+            self.fractions = values
+
+    def set_fractions(self, components, fractions):
+        """Writes a composition vector, in place when the components are unchanged."""
+        if components is not self.components:
+            components = intern_components(components)
+            if components is not self.components:
+                self.components = components
+                self.fractions = np.array(fractions, dtype=float)
+                return
+        np.copyto(self.fractions, fractions)
+
+    def copy_from(self, other):
+        """Copies flow, temperature, pressure and composition from another stream (not the name)."""
+        self.flow_rate = other.flow_rate
+        self.temperature = other.temperature
+        self.pressure = other.pressure
+        self.set_fractions(other.components, other.fractions)
+
+    def signature(self):
+        """A hashable snapshot of the stream's values."""
+        return (self.flow_rate, self.temperature, self.pressure, self.components, self.fractions.tobytes())
+
+    # --- dict compatibility ---
+    def __getitem__(self, key):
+        if key == 'composition':
+            return CompositionView(self)
+        if key in self._FIELDS:
+            return getattr(self, key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == 'composition':
+            self.set_composition(value)
+        elif key in self._FIELDS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key == 'composition':
+            self.components = intern_components(())
+            self.fractions = np.zeros(0)
+        elif key in self._FIELDS:
+            if getattr(self, key) is None:
+                raise KeyError(key)
+            setattr(self, key, None)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for key in self._FIELDS:
+            if getattr(self, key) is not None:
+                yield key
+        yield 'composition'
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        if key == 'composition':
+            return True
+        if key in self._FIELDS:
+            return getattr(self, key) is not None
+        return self._extra is not None and key in self._extra
+
+    def get(self, key, default=None):
+        if key in self._FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        if key == 'composition':
+            return CompositionView(self)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def update(self, other=(), **kwargs):
+        """Dict-style update; another Stream is copied in place (its name is not copied)."""
+        if isinstance(other, Stream):
+            self.copy_from(other)
+        else:
+            items = other.items() if isinstance(other, Mapping) else other
+            for key, value in items:
+                self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def clear(self):
+        """Resets the stream to a blank state, keeping its name."""
+        self.flow_rate = self.temperature = self.pressure = None
+        self.components = intern_components(())
+        self.fractions = np.zeros(0)
+        self._extra = None
+
+    def copy(self):
+        """An independent copy of the stream."""
+        stream = Stream(self.name)
+        stream.copy_from(self)
+        if self._extra:
+            stream._extra = dict(self._extra)
+        return stream
+
+    def __eq__(self, other):
+        if isinstance(other, Stream):
+            return self.signature() == other.signature() and self.name == other.name
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return (self.name, self.flow_rate, self.temperature, self.pressure,
+                self.components, self.fractions, self._extra)
+
+    def __setstate__(self, state):
+        (self.name, self.flow_rate, self.temperature, self.pressure,
+         components, self.fractions, self._extra) = state
+        self.components = intern_components(components)
+
+    def __repr__(self):
+        return f"Stream({self.to_dict()!r})"
+
+class BatchStream:
+    """The values of one stream across N scenarios.
+
+    ``flow_rate``, ``temperature`` and ``pressure`` are (N,) arrays (or None
+    when the field is undefined in every scenario) and ``fractions`` is an
+    (N, ncomp) array of mole fractions ordered by ``components``. Row ``i``
+    is the stream of scenario ``i``; see row() and set_row().
+    """
+    __slots__ = ('name', 'flow_rate', 'temperature', 'pressure', 'components', 'fractions')
+
+    def __init__(self, name=None, components=(), fractions=None, flow_rate=None,
+                 temperature=None, pressure=None, size=None):
+        """
+        Args:
+            name (str): Stream name.
+            components (list): Component names, in column order.
+            fractions (np.ndarray): (N, ncomp) mole fractions; zeros if omitted.
+            flow_rate, temperature, pressure (np.ndarray): (N,) arrays or None.
+            size (int): N, required when ``fractions`` is omitted.
+        """
+        self.name = name
+        self.components = intern_components(components)
+        if fractions is None:
+            if size is None:
+                raise ValueError("BatchStream needs either fractions or a size.")
+            fractions = np.zeros((size, len(self.components)))
+        self.fractions = np.asarray(fractions, dtype=float)
+        if self.fractions.shape[1:] != (len(self.components),):
+            raise ValueError("Batch fractions do not match the stream components.")
+        self.flow_rate = flow_rate
+        self.temperature = temperature
+        self.pressure = pressure
+
+    @classmethod
+    def from_stream(cls, stream, size):
+        """Repeats a Stream or dict stream ``size`` times."""
+        stream = as_stream(stream)
+        fractions = np.repeat(stream.fractions[np.newaxis, :], size, axis=0)
+        batch = cls(stream.name, stream.components, fractions)
+        for field in ('flow_rate', 'temperature', 'pressure'):
+            value = getattr(stream, field)
+            setattr(batch, field, None if value is None else np.full(size, float(value)))
+        return batch
+
+    @property
+    def size(self):
+        return self.fractions.shape[0]
+
+    @property
+    def composition(self):
+        """Mole fraction columns by component name (views into ``fractions``)."""
+        return {name: self.fractions[:, i] for i, name in enumerate(self.components)}
+
+    def set_composition(self, composition):
+        """Replaces the composition with per-scenario (or scalar) mole fractions by name."""
+        size = self.size
+        self.components = intern_components(composition)
+        self.fractions = np.zeros((size, len(self.components)))
+        for i, values in enumerate(composition.values()):
+            self.fractions[:, i] = values
+
+    def fractions_for(self, components):
+        """The (N, len(components)) fractions laid out in another component order."""
+        components = intern_components(components)
+        if components is self.components:
+            return self.fractions
+        index = component_index(components)
+        missing = [name for name in self.components if name not in index]
+        if missing:
+            raise ValueError(f"Component '{missing[0]}' is not part of the target layout.")
+        out = np.zeros((self.size, len(components)))
+        out[:, [index[name] for name in self.components]] = self.fractions
+        return out
+
+    def copy(self):
+        """An independent copy."""
+        fields = [None if a is None else a.copy() for a in (self.flow_rate, self.temperature, self.pressure)]
+        return BatchStream(self.name, self.components, self.fractions.copy(), *fields)
+
+    def row(self, i):
+        """Scenario ``i`` as a Stream."""
+        stream = Stream(self.name)
+        for field in ('flow_rate', 'temperature', 'pressure'):
+            values = getattr(self, field)
+            if values is not None:
+                setattr(stream, field, float(values[i]))
+        stream.set_fractions(self.components, self.fractions[i])
+        return stream
+
+    def set_row(self, i, stream):
+        """Writes a Stream or dict stream into scenario ``i``, adding any new components."""
+        stream = as_stream(stream)
+        new = [name for name in stream.components if name not in component_index(self.components)]
+        if new:
+            self.components = intern_components(self.components + tuple(new))
+            self.fractions = np.hstack([self.fractions, np.zeros((self.size, len(new)))])
+        index = component_index(self.components)
+        self.fractions[i] = 0.0
+        self.fractions[i, [index[name] for name in stream.components]] = stream.fractions
+        for field in ('flow_rate', 'temperature', 'pressure'):
+            value = getattr(stream, field)
+            values = getattr(self, field)
+            if values is None:
+                if value is None:
+                    continue
+                values = np.full(self.size, np.nan)
+                setattr(self, field, values)
+            values[i] = np.nan if value is None else value
+
+    def __repr__(self):
+        return f"BatchStream(name={self.name!r}, size={self.size}, components={list(self.components)})"
+
+def as_stream(stream):
+    """Returns the stream itself if it is a Stream, else a Stream copy of a dict stream."""
+    return stream if isinstance(stream, Stream) else Stream.from_dict(stream)
+
+def assign_stream(target, source):
+    """Overwrites the state of ``target`` with that of ``source`` (Streams or dict streams)."""
+    if isinstance(target, Stream):
+        if isinstance(source, Stream):
+            target.copy_from(source)
+        else:
+            target.clear()
+            target.update(source)
+    else:
+        target.clear()
+        target.update(source.to_dict() if isinstance(source, Stream) else source)
+
+def stream_signature(stream):
+    """A hashable snapshot of a stream's values, used to detect changes between solves."""
+    if isinstance(stream, Stream):
+        return stream.signature()
+    return (stream.get('flow_rate'), stream.get('temperature'), stream.get('pressure'),
+            tuple(stream.get('composition', {}).items()))
+
+class StreamLayout:
+    """A fixed ordering of a stream's state as a flat vector.
+
+    A packed stream holds its component flows (flow_rate * mole fraction) in
+    the order of ``components``, followed by the temperature and the pressure
+    when those are tracked. Equation-oriented solvers use one layout for every
+    stream so that unit residuals line up with the global variable vector.
+    """
+    def __init__(self, components, temperature=True, pressure=True):
+        """
+        Args:
+            components (list): Component names, in vector order.
+            temperature (bool): Whether the temperature is part of the state.
+            pressure (bool): Whether the pressure is part of the state.
+        """
+        self.components = list(components)
+        self.component_tuple = intern_components(self.components)
+        self.index = {name: i for i, name in enumerate(self.components)}
+        self._positions = {}
+        self.ncomp = len(self.components)
+        self.t_index = self.ncomp if temperature else None
+        self.p_index = self.ncomp + bool(temperature) if pressure else None
+        self.width = self.ncomp + bool(temperature) + bool(pressure)
+
+    def _stream_positions(self, components):
+        positions = self._positions.get(components)
+        if positions is None:
+            missing = [name for name in components if name not in self.index]
+            if missing:
+                raise ValueError(f"Component '{missing[0]}' is not part of the stream layout.")
+            positions = self._positions[components] = np.array([self.index[n] for n in components], dtype=np.intp)
+        return positions
+
+    def pack(self, stream, out=None):
+        """Flattens a stream into a vector (undefined temperature/pressure become 0)."""
+        if out is None:
+            x = np.zeros(self.width)
+        else:
+            x = out
+            # Components the stream does not list must not keep the previous pack's values
+            x[:self.ncomp] = 0.0
+        flow = stream.get('flow_rate') or 0.0
+        if isinstance(stream, Stream):
+            x[self._stream_positions(stream.components)] = flow * stream.fractions
+        else:
+            for name, frac in stream.get('composition', {}).items():
+                if name not in self.index:
+                    raise ValueError(f"Component '{name}' is not part of the stream layout.")
+                x[self.index[name]] = flow * frac
+        if self.t_index is not None:
+            x[self.t_index] = stream.get('temperature') or 0.0
+        if self.p_index is not None:
+            x[self.p_index] = stream.get('pressure') or 0.0
+        return x
+
+    def unpack(self, x, stream):
+        """Writes a packed vector back into a stream."""
+        flows = x[:self.ncomp]
+        total = float(flows.sum())
+        stream['flow_rate'] = total
+        if isinstance(stream, Stream):
+            stream.set_fractions(self.component_tuple, flows / total if total > 0 else np.zeros(self.ncomp))
+        else:
+            stream['composition'] = {name: float(f / total) if total > 0 else 0.0
+                                     for name, f in zip(self.components, flows)}
+        if self.t_index is not None:
+            stream['temperature'] = float(x[self.t_index])
+        if self.p_index is not None:
+            stream['pressure'] = float(x[self.p_index])
@@ -0,0 +1,171 @@
+import threading
+from collections import OrderedDict
+from nexus.nexus_core.properties import component_db
+
+_CONSTANTS_CACHE = {}
+
+def load_coolprop():
+    """The CoolProp.CoolProp module, imported on first use.
+
+    Importing CoolProp takes seconds, so modules that only may need it call
+    this instead of importing it at module level.
+    """
+    import CoolProp.CoolProp as CP
+    return CP
+
+def fluid_constants(name):
+    """Molar mass (g/mol), critical temperature (K), critical pressure (Pa), acentric factor and
+    minimum temperature (K) of a CoolProp fluid, or None if CoolProp does not know it.
+
+    The constants come from the bundled component database when it lists the
+    fluid; otherwise they are read from one CoolProp AbstractState. Either
+    way they are cached per fluid.
+    """
+    if name not in _CONSTANTS_CACHE:
+        record = component_db.lookup(name)
+        if record is not None:
+            _CONSTANTS_CACHE[name] = {key: record[key] for key in ('mw', 'tc', 'pc', 'omega', 'tmin')}
+            return _CONSTANTS_CACHE[name]
+        CP = load_coolprop()
+        try:
+            state = CP.AbstractState('HEOS', name)
+        except ValueError:
+            _CONSTANTS_CACHE[name] = None
+        else:
+            _CONSTANTS_CACHE[name] = {'mw': state.molar_mass() * 1000, 'tc': state.T_critical(),
+                                      'pc': state.p_critical(), 'omega': state.acentric_factor(),
+                                      'tmin': state.Tmin()}
+    return _CONSTANTS_CACHE[name]
+
+class CoolPropBackend:
+    """Thermodynamic and transport properties from persistent CoolProp AbstractState objects.
+
+    One AbstractState is kept per fluid (or mixture); a state point is set
+    with a single (P, T) update and all outputs are read from it, instead of
+    one string-parsing PropsSI call per property. Results are kept in a
+    bounded LRU cache keyed on the rounded temperature, pressure and
+    composition, with hit/miss statistics in ``stats``. Properties are
+    evaluated at the rounded state, so a result does not depend on which
+    point of a rounding bucket was requested first.
+    """
+    def __init__(self, backend='HEOS', cache_size=4096, temperature_digits=6, pressure_digits=3,
+                 composition_digits=9):
+        """
+        Args:
+            backend (str): CoolProp backend of the AbstractStates (e.g. 'HEOS', 'BICUBIC&HEOS').
+            cache_size (int): Maximum number of cached state points (0 disables the cache).
+            temperature_digits (int): Decimals of the temperature (K) in the cache key.
+            pressure_digits (int): Decimals of the pressure (Pa) in the cache key.
+            composition_digits (int): Decimals of the mole fractions in the cache key.
+        """
+        self.backend = backend
+        self.cache_size = cache_size
+        self.temperature_digits = temperature_digits
+        self.pressure_digits = pressure_digits
+        self.composition_digits = composition_digits
+        self._states = {}
+        self._pt_inputs = None
+        self._cache = OrderedDict()
+        # AbstractStates hold the last state point, so updates and reads must not interleave
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _state(self, fluids):
+        state = self._states.get(fluids)
+        if state is None:
+            state = self._states[fluids] = load_coolprop().AbstractState(self.backend, '&'.join(fluids))
+        return state
+
+    def properties(self, temperature, pressure, fluids, fractions=None):
+        """Density (kg/m^3), enthalpy (J/kg), entropy (J/kg/K) and viscosity (Pa s) at one state.
+
+        Args:
+            temperature (float): Temperature in Kelvin.
+            pressure (float): Pressure in Pascals.
+            fluids (str or tuple): A CoolProp fluid name, or the fluids of a mixture.
+            fractions (list): Mole fractions of a mixture, in ``fluids`` order.
+
+        Returns:
+            dict: 'density', 'enthalpy', 'entropy' and 'viscosity'. The dict is shared with
+                  the cache and must not be modified.
+        """
+        if isinstance(fluids, str):
+            fluids = (fluids,)
+        fluids = tuple(fluids)
+        if len(fluids) > 1 and fractions is None:
+            raise ValueError("Mole fractions are required for a mixture.")
+        T = round(float(temperature), self.temperature_digits)
+        P = round(float(pressure), self.pressure_digits)
+        x = None if len(fluids) == 1 else tuple(round(float(f), self.composition_digits) for f in fractions)
+        key = (fluids, x, T, P)
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._hits += 1
+                self._cache.move_to_end(key)
+                return result
+            self._misses += 1
+            state = self._state(fluids)
+            if self._pt_inputs is None:
+                self._pt_inputs = load_coolprop().PT_INPUTS
+            if x is not None:
+                state.set_mole_fractions(list(x))
+            state.update(self._pt_inputs, P, T)
+            result = {'density': state.rhomass(), 'enthalpy': state.hmass(), 'entropy': state.smass(),
+                      'viscosity': state.viscosity()}
+            if self.cache_size > 0:
+                self._cache[key] = result
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+                    self._evictions += 1
+        return result
+
+    @property
+    def stats(self):
+        """Cache statistics: hits, misses, evictions, size and hit_rate."""
+        lookups = self._hits + self._misses
+        return {'hits': self._hits, 'misses': self._misses, 'evictions': self._evictions,
+                'size': len(self._cache), 'hit_rate': self._hits / lookups if lookups else 0.0}
+
+    def clear_cache(self):
+        """Empties the cache and resets the statistics."""
+        with self._lock:
+            self._cache.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def __getstate__(self):
+        # AbstractStates and locks cannot be pickled; they are rebuilt on demand
+        state = self.__dict__.copy()
+        state['_states'] = {}
+        state['_lock'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+# Example Usage:
+if __name__ == '__main__':
+    import time
+    import numpy as np
+    CP = load_coolprop()
+
+    backend = CoolPropBackend()
+    temperatures = np.round(np.random.default_rng(0).uniform(300.0, 360.0, 2000), 1)
+
+    start = time.perf_counter()
+    for T in temperatures:
+        [CP.PropsSI(key, 'T', T, 'P', 101325, 'Water') for key in 'DHSV']
+    propssi_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for T in temperatures:
+        backend.properties(T, 101325, 'Water')
+    backend_time = time.perf_counter() - start
+
+    print(f"{len(temperatures)} water states: PropsSI {propssi_time * 1e3:.0f} ms, "
+          f"AbstractState + cache {backend_time * 1e3:.0f} ms")
+    print("Cache:", backend.stats)
+    print("Water/ethanol mixture at 300 K:", backend.properties(300.0, 101325, ('Water', 'Ethanol'), [0.5, 0.5]))
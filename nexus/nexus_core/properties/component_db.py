@@ -0,0 +1,69 @@
+import os
+import numpy as np
+
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'components.npy')
+
+# Record layout of the bundled database; ideal-gas heat capacities are
+# Cp(T) = sum_k cp[k] (T / 1000)^k in J/(mol K), fitted between cp_tmin and cp_tmax
+DB_DTYPE = np.dtype([('name', 'S32'), ('mw', 'f8'), ('tc', 'f8'), ('pc', 'f8'), ('omega', 'f8'), ('tmin', 'f8'),
+                     ('cp', 'f8', (5,)), ('cp_tmin', 'f8'), ('cp_tmax', 'f8')])
+
+_records = None
+_index = None
+
+def _load():
+    """Memory-maps the database on first use and indexes it by name."""
+    global _records, _index
+    if _records is None:
+        if os.path.exists(DB_PATH):
+            records = np.load(DB_PATH, mmap_mode='r')
+            _index = {name.decode(): i for i, name in enumerate(records['name'])}
+        else:
+            records = np.zeros(0, dtype=DB_DTYPE)
+            _index = {}
+        _records = records
+    return _records
+
+def lookup(name):
+    """
+    Bundled constants of a component.
+
+    Args:
+        name (str): Component name (CoolProp fluid names and their aliases are included).
+
+    Returns:
+        dict: 'mw' (g/mol), 'tc' (K), 'pc' (Pa), 'omega', 'tmin' (K), 'cp' (coefficients),
+              'cp_tmin' and 'cp_tmax' (K), or None if the component is not in the database.
+    """
+    records = _load()
+    i = _index.get(name)
+    if i is None:
+        return None
+    record = records[i]
+    return {'mw': float(record['mw']), 'tc': float(record['tc']), 'pc': float(record['pc']),
+            'omega': float(record['omega']), 'tmin': float(record['tmin']), 'cp': np.array(record['cp']),
+            'cp_tmin': float(record['cp_tmin']), 'cp_tmax': float(record['cp_tmax'])}
+
+def names():
+    """All names in the bundled database."""
+    _load()
+    return list(_index)
+
+def ideal_gas_cp(coefficients, temperature):
+    """Ideal-gas heat capacity in J/(mol K) from database coefficients, scalar or array temperature."""
+    tau = np.asarray(temperature, dtype=float) / 1000.0
+    return np.polynomial.polynomial.polyval(tau, coefficients)
+
+# Example Usage:
+if __name__ == '__main__':
+    import sys
+    import time
+
+    start = time.perf_counter()
+    water = lookup('Water')
+    print(f"First lookup (maps the file): {(time.perf_counter() - start) * 1e3:.2f} ms, "
+          f"{len(names())} names, CoolProp imported: {'CoolProp' in sys.modules}")
+    print(f"Water: M = {water['mw']:.3f} g/mol, Tc = {water['tc']:.2f} K, Pc = {water['pc'] / 1e5:.2f} bar, "
+          f"omega = {water['omega']:.4f}")
+    print(f"Ideal-gas Cp of water at 500 K: {ideal_gas_cp(water['cp'], 500.0):.2f} J/(mol K)")
+    print("n-butane under its alias 'Butane':", lookup('Butane')['tc'])
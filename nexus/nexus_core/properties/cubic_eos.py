@@ -0,0 +1,274 @@
+import numpy as np
+from nexus.nexus_core.properties.property_models import PropertyPackage
+
+R_GAS = 8.314462618  # Gas constant, J/(mol*K)
+
+# Omega_a, Omega_b, the (delta1, delta2) of the attractive term a / ((v + delta1 b)(v + delta2 b))
+# and the polynomial of the alpha-function slope m(omega)
+EOS_PARAMETERS = {
+    'PR': {'omega_a': 0.45723553, 'omega_b': 0.07779607, 'delta': (1 + np.sqrt(2), 1 - np.sqrt(2)),
+           'm': (0.37464, 1.54226, -0.26992)},
+    'SRK': {'omega_a': 0.42748023, 'omega_b': 0.08664035, 'delta': (1.0, 0.0),
+            'm': (0.480, 1.574, -0.176)},
+}
+
+def solve_cubic(c2, c1, c0):
+    """Smallest and largest real roots of z^3 + c2 z^2 + c1 z + c0 = 0 for arrays of coefficients.
+
+    Uses Cardano's formula on the depressed cubic (the trigonometric form when
+    there are three real roots), so there is no iteration and no per-row
+    branching; where there is a single real root both outputs are equal.
+
+    Args:
+        c2, c1, c0 (np.ndarray): Coefficients, all of the same shape.
+
+    Returns:
+        tuple: (z_min, z_max) arrays.
+    """
+    c2, c1, c0 = np.broadcast_arrays(*(np.asarray(c, dtype=float) for c in (c2, c1, c0)))
+    shift = c2 / 3.0
+    p = c1 - c2 * shift
+    q = 2.0 * shift ** 3 - shift * c1 + c0
+    disc = (q / 2.0) ** 2 + (p / 3.0) ** 3
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sqrt_disc = np.sqrt(np.maximum(disc, 0.0))
+        single = np.cbrt(-q / 2.0 + sqrt_disc) + np.cbrt(-q / 2.0 - sqrt_disc)
+        r = 2.0 * np.sqrt(np.maximum(-p / 3.0, 0.0))
+        cos_arg = np.clip(3.0 * q / (p * r), -1.0, 1.0)
+        theta = np.arccos(cos_arg) / 3.0
+    three = disc < 0.0
+    # cos(theta) gives the largest root and cos(theta + 2 pi / 3) the smallest
+    t_max = np.where(three, r * np.cos(theta), single)
+    t_min = np.where(three, r * np.cos(theta + 2.0 * np.pi / 3.0), single)
+    return t_min - shift, t_max - shift
+
+class CubicEOSPackage(PropertyPackage):
+    """Mixture properties from the Peng-Robinson or Soave-Redlich-Kwong equation of state.
+
+    Pure-component parameters come from the critical constants of the
+    components, mixed with the van der Waals one-fluid rules
+
+        a = sum_ij x_i x_j (1 - k_ij) sqrt(a_i a_j),    b = sum_i x_i b_i
+
+    Every method works on batches: temperatures and pressures of shape (N,)
+    with compositions of shape (N, ncomp), or a single state.
+    """
+    def __init__(self, components, eos='PR', kij=None, backend=None):
+        """
+        Args:
+            components (list): Component objects (with tc, pc and omega).
+            eos (str): 'PR' (Peng-Robinson) or 'SRK' (Soave-Redlich-Kwong).
+            kij (np.ndarray or dict): Binary interaction parameters, as an (ncomp, ncomp) array or
+                a dict {(name_i, name_j): k_ij}; default zero.
+            backend (CoolPropBackend): Backend for the pure-component methods of PropertyPackage.
+        """
+        if eos not in EOS_PARAMETERS:
+            raise ValueError(f"Unknown equation of state '{eos}'. Available: {sorted(EOS_PARAMETERS)}.")
+        super().__init__(components, backend=backend)
+        self.eos = eos
+        params = EOS_PARAMETERS[eos]
+        self.delta1, self.delta2 = params['delta']
+        tc, pc, omega = self._critical_constants(self.component_names)
+        self._tc = tc
+        self._ac = params['omega_a'] * (R_GAS * tc) ** 2 / pc
+        self._b = params['omega_b'] * R_GAS * tc / pc
+        m0, m1, m2 = params['m']
+        self._m = m0 + m1 * omega + m2 * omega ** 2
+        self._mw = np.array([self.components[name].mw for name in self.component_names], dtype=float)
+        n = len(self.component_names)
+        self.kij = np.zeros((n, n))
+        if isinstance(kij, dict):
+            index = {name: i for i, name in enumerate(self.component_names)}
+            for (name_i, name_j), value in kij.items():
+                self.kij[index[name_i], index[name_j]] = self.kij[index[name_j], index[name_i]] = value
+        elif kij is not None:
+            self.kij = np.asarray(kij, dtype=float)
+            if self.kij.shape != (n, n):
+                raise ValueError(f"kij must have shape ({n}, {n}).")
+
+    def _as_batch(self, temperature, pressure, composition):
+        """Broadcasts a state (or batch of states) to (N,), (N,) and normalised (N, ncomp) arrays."""
+        if isinstance(composition, dict):
+            if set(composition.keys()) != set(self.component_names):
+                raise ValueError("Composition keys must match component names.")
+            composition = [composition[name] for name in self.component_names]
+        x = np.asarray(composition, dtype=float)
+        T = np.asarray(temperature, dtype=float)
+        P = np.asarray(pressure, dtype=float)
+        scalar = x.ndim == 1 and T.ndim == 0 and P.ndim == 0
+        x = np.atleast_2d(x)
+        if x.shape[1] != len(self.component_names):
+            raise ValueError(f"Compositions must have {len(self.component_names)} columns.")
+        n = np.broadcast_shapes(x.shape[:1], T.shape, P.shape)[0] if T.ndim <= 1 and P.ndim <= 1 else None
+        if n is None:
+            raise ValueError("Temperatures and pressures must be scalars or (N,) arrays.")
+        x = np.broadcast_to(x, (n, x.shape[1]))
+        x = x / x.sum(axis=1, keepdims=True)
+        return np.broadcast_to(T, (n,)), np.broadcast_to(P, (n,)), x, scalar
+
+    def _mixture(self, T, x):
+        """Mixture a, b, da/dT and the a-weighted sums sum_j x_j a_ij per state."""
+        sqrt_tr = np.sqrt(T[:, np.newaxis] / self._tc)
+        sqrt_alpha = 1.0 + self._m * (1.0 - sqrt_tr)
+        a_i = self._ac * sqrt_alpha ** 2
+        # d(a_i)/dT = -a_c m sqrt(alpha) / sqrt(T Tc)
+        da_i = -self._ac * self._m * sqrt_alpha * sqrt_tr / T[:, np.newaxis]
+        sqrt_a = np.sqrt(a_i)
+        one_minus_k = 1.0 - self.kij
+        # a_ij = (1 - k_ij) sqrt(a_i a_j); the x-weighted row sums give both a and the fugacity term
+        xs = x * sqrt_a
+        a_x = sqrt_a * (xs @ one_minus_k.T)
+        a = np.einsum('ij,ij->i', x, a_x)
+        # d(sqrt(a_i))/dT = da_i / (2 sqrt(a_i))
+        dsqrt_a = da_i / (2.0 * sqrt_a)
+        da = 2.0 * np.einsum('ij,ij->i', x * dsqrt_a, (xs @ one_minus_k.T))
+        b = x @ self._b
+        return a, b, da, a_x
+
+    def mixture_properties(self, temperature, pressure, composition, phase='stable'):
+        """
+        Compressibility, densities, fugacity coefficients and departure functions of mixtures.
+
+        Args:
+            temperature (float or np.ndarray): Temperature(s) in Kelvin, scalar or (N,).
+            pressure (float or np.ndarray): Pressure(s) in Pascals, scalar or (N,).
+            composition (np.ndarray or dict): Mole fractions, (ncomp,), (N, ncomp) or a dict by name.
+            phase (str): 'liquid' (smallest root), 'vapour' (largest root) or 'stable'
+                (the root with the lower Gibbs energy).
+
+        Returns:
+            dict: 'Z', 'molar_volume' (m^3/mol), 'molar_density' (mol/m^3), 'density' (kg/m^3),
+                  'fugacity_coefficients' (N, ncomp), 'enthalpy_departure' (J/mol),
+                  'entropy_departure' (J/mol/K) and 'is_liquid' (whether the liquid root was used).
+                  Scalar inputs give scalars and (ncomp,) fugacity coefficients.
+        """
+        if phase not in ('liquid', 'vapour', 'stable'):
+            raise ValueError("phase must be 'liquid', 'vapour' or 'stable'.")
+        T, P, x, scalar = self._as_batch(temperature, pressure, composition)
+        d1, d2 = self.delta1, self.delta2
+        a, b, da, a_x = self._mixture(T, x)
+        A = a * P / (R_GAS * T) ** 2
+        B = b * P / (R_GAS * T)
+        c2 = (d1 + d2 - 1.0) * B - 1.0
+        c1 = A + d1 * d2 * B ** 2 - (d1 + d2) * B * (B + 1.0)
+        c0 = -(A * B + d1 * d2 * B ** 2 * (B + 1.0))
+        z_liquid, z_vapour = solve_cubic(c2, c1, c0)
+        # The liquid root may fall below the covolume when only the vapour root is physical
+        z_liquid = np.where(z_liquid > B, z_liquid, z_vapour)
+        z_liquid, z_vapour = (self._polish(z, c2, c1, c0) for z in (z_liquid, z_vapour))
+
+        def log_term(Z):
+            return np.log((Z + d1 * B) / (Z + d2 * B)) / (d1 - d2)
+
+        if phase == 'liquid':
+            Z = z_liquid
+        elif phase == 'vapour':
+            Z = z_vapour
+        else:
+            # ln(f / P) of the mixture picks the root of lower Gibbs energy
+            g_liquid = z_liquid - 1.0 - np.log(z_liquid - B) - A / B * log_term(z_liquid)
+            g_vapour = z_vapour - 1.0 - np.log(z_vapour - B) - A / B * log_term(z_vapour)
+            Z = np.where(g_liquid < g_vapour, z_liquid, z_vapour)
+        L = log_term(Z)
+        b_ratio = self._b / b[:, np.newaxis]
+        ln_phi = (b_ratio * (Z - 1.0)[:, np.newaxis] - np.log(Z - B)[:, np.newaxis]
+                  - (A / B * L)[:, np.newaxis] * (2.0 * a_x / a[:, np.newaxis] - b_ratio))
+        h_dep = R_GAS * T * (Z - 1.0) + (T * da - a) / b * L
+        s_dep = R_GAS * np.log(Z - B) + da / b * L
+        v = Z * R_GAS * T / P
+        result = {'Z': Z, 'molar_volume': v, 'molar_density': 1.0 / v, 'density': (x @ self._mw) / 1000.0 / v,
+                  'fugacity_coefficients': np.exp(ln_phi), 'enthalpy_departure': h_dep,
+                  'entropy_departure': s_dep, 'is_liquid': (Z == z_liquid) & (z_liquid < z_vapour)}
+        if scalar:
+            return {key: value[0] if key == 'fugacity_coefficients' else value[0].item()
+                    for key, value in result.items()}
+        return result
+
+    @staticmethod
+    def _polish(Z, c2, c1, c0):
+        """Two Newton steps on the cubic to recover the digits Cardano loses to cancellation."""
+        for _ in range(2):
+            f = ((Z + c2) * Z + c1) * Z + c0
+            df = (3.0 * Z + 2.0 * c2) * Z + c1
+            Z = Z - np.where(df != 0.0, f / np.where(df != 0.0, df, 1.0), 0.0)
+        return Z
+
+    def fugacity_coefficients(self, temperature, pressure, composition, phase='stable'):
+        """Fugacity coefficients phi_i, (N, ncomp) or (ncomp,); see ``mixture_properties``."""
+        return self.mixture_properties(temperature, pressure, composition, phase)['fugacity_coefficients']
+
+    def equilibrium_ratios(self, temperature, pressure, liquid, vapour):
+        """
+        Composition-dependent K-values K_i = phi_i^L(x) / phi_i^V(y).
+
+        Args:
+            temperature (float or np.ndarray): Temperature(s) in Kelvin.
+            pressure (float or np.ndarray): Pressure(s) in Pascals.
+            liquid (np.ndarray): Liquid mole fractions, (ncomp,) or (N, ncomp).
+            vapour (np.ndarray): Vapour mole fractions, same shape.
+
+        Returns:
+            np.ndarray: K-values of the same shape as the compositions.
+        """
+        phi_l = self.fugacity_coefficients(temperature, pressure, liquid, phase='liquid')
+        phi_v = self.fugacity_coefficients(temperature, pressure, vapour, phase='vapour')
+        return phi_l / phi_v
+
+    def get_properties(self, temp, press, composition):
+        """
+        Calculate mixture properties for a given state from the equation of state.
+
+        Args:
+            temp (float or np.ndarray): Temperature(s) in Kelvin.
+            press (float or np.ndarray): Pressure(s) in Pascals.
+            composition (dict): Mole fractions of components.
+
+        Returns:
+            dict: Temperature, pressure and the stable-root results of ``mixture_properties``,
+                  with the fugacity coefficients keyed by component name.
+        """
+        props = self.mixture_properties(temp, press, composition)
+        phi = props.pop('fugacity_coefficients')
+        properties = {'temperature': temp, 'pressure': press}
+        properties.update(props)
+        properties['fugacity_coefficients'] = {name: phi[..., i] for i, name in enumerate(self.component_names)}
+        return properties
+
+# Example Usage:
+if __name__ == '__main__':
+    import time
+    import CoolProp.CoolProp as CP
+    from nexus.nexus_core.properties.property_models import Component
+
+    components = [Component('Methane', 'CH4'), Component('Ethane', 'C2H6'), Component('Propane', 'C3H8')]
+    pr = CubicEOSPackage(components, eos='PR')
+    srk = CubicEOSPackage(components, eos='SRK')
+
+    # Pure-component check against CoolProp's Peng-Robinson backend
+    state = CP.AbstractState('PR', 'Propane')
+    state.update(CP.PT_INPUTS, 1e6, 300.0)
+    liquid = pr.mixture_properties(300.0, 1e6, [0.0, 0.0, 1.0])
+    print(f"Liquid propane at 300 K, 10 bar: {liquid['density']:.2f} kg/m^3 "
+          f"(CoolProp PR {state.rhomass():.2f}), phi = {liquid['fugacity_coefficients'][2]:.4f}")
+
+    gas = {'Methane': 0.85, 'Ethane': 0.10, 'Propane': 0.05}
+    for package in (pr, srk):
+        props = package.get_properties(250.0, 5e6, gas)
+        print(f"{package.eos}: natural gas at 250 K, 50 bar: Z = {props['Z']:.4f}, "
+              f"density {props['density']:.2f} kg/m^3, H - H_ig = {props['enthalpy_departure']:.0f} J/mol")
+
+    # One call for a batch of states
+    rng = np.random.default_rng(0)
+    n = 100000
+    x = rng.dirichlet([5.0, 2.0, 1.0], size=n)
+    T = rng.uniform(200.0, 350.0, n)
+    P = rng.uniform(1e5, 8e6, n)
+    start = time.perf_counter()
+    batch = pr.mixture_properties(T, P, x)
+    elapsed = time.perf_counter() - start
+    print(f"{n} mixture states in {elapsed * 1e3:.1f} ms ({elapsed / n * 1e6:.2f} us per state), "
+          f"{batch['is_liquid'].sum()} liquid-like")
+
+    # Composition-dependent K-values of a liquid/vapour pair
+    K = pr.equilibrium_ratios(250.0, 2e6, [0.3, 0.3, 0.4], [0.8, 0.15, 0.05])
+    print("PR K-values at 250 K, 20 bar:", np.round(K, 3))
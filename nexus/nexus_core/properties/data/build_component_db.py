@@ -0,0 +1,50 @@
+"""Builds the bundled component database (components.npy) from CoolProp.
+
+Run from the repository root after a CoolProp upgrade:
+
+    python -m nexus.nexus_core.properties.data.build_component_db
+"""
+from collections import Counter
+import numpy as np
+import CoolProp.CoolProp as CP
+from nexus.nexus_core.properties.component_db import DB_PATH, DB_DTYPE
+
+def fit_ideal_gas_cp(state, t_min, t_max, n_points=60):
+    """Fits a quartic in T/1000 to CoolProp's ideal-gas heat capacity (J/(mol K))."""
+    temperatures = np.linspace(t_min, t_max, n_points)
+    cp = []
+    for T in temperatures:
+        # The ideal-gas part does not depend on density; a near-zero density keeps the state valid
+        state.update(CP.DmolarT_INPUTS, 1e-6, T)
+        cp.append(state.cp0molar())
+    return np.polynomial.polynomial.polyfit(temperatures / 1000.0, cp, 4)
+
+def build_records():
+    """One record per CoolProp pure fluid and per unambiguous alias of it."""
+    entries = []
+    for fluid in CP.get_global_param_string('fluids_list').split(','):
+        try:
+            state = CP.AbstractState('HEOS', fluid)
+            constants = (state.molar_mass() * 1000, state.T_critical(), state.p_critical(),
+                         state.acentric_factor(), state.Tmin())
+            cp_tmin, cp_tmax = max(state.Tmin(), 200.0), max(state.Tmax(), 1000.0)
+            cp = fit_ideal_gas_cp(state, cp_tmin, cp_tmax)
+        except ValueError as e:
+            print(f"Skipping {fluid}: {e}")
+            continue
+        aliases = [a for a in CP.get_fluid_param_string(fluid, 'aliases').split(',') if a]
+        entries.append((fluid, aliases, constants + (cp, cp_tmin, cp_tmax)))
+    # Alias lists are comma-separated, so names containing commas come back in pieces
+    # that can collide between fluids; such names are left to CoolProp
+    counts = Counter(name for fluid, aliases, _ in entries for name in set([fluid] + aliases))
+    rows = []
+    for fluid, aliases, data in entries:
+        for name in dict.fromkeys([fluid] + aliases):
+            if counts[name] == 1:
+                rows.append((name.encode(),) + data)
+    return np.array(rows, dtype=DB_DTYPE)
+
+if __name__ == '__main__':
+    records = build_records()
+    np.save(DB_PATH, records)
+    print(f"Wrote {len(records)} records ({records.nbytes / 1024:.0f} kB) to {DB_PATH}")
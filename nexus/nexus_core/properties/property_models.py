@@ -1,37 +1,226 @@
-import CoolProp.CoolProp as CP
+import os
+import numpy as np
+from nexus.nexus_core.properties import component_db
+from nexus.nexus_core.properties.backends import CoolPropBackend, fluid_constants, load_coolprop
+from nexus.nexus_core.properties.tables import PropertyTable
 
 class Component:
-    """Represents a single chemical component with its properties."""
-    def __init__(self, name, formula, mw=None):
+    """Represents a single chemical component with its properties.
+
+    Critical constants (tc in K, pc in Pa, acentric factor omega) are looked up
+    in the bundled component database when not given. For components the
+    database does not list, CoolProp is only consulted (and imported) when a
+    missing constant is first read; the constants stay None for
+    pseudo-components unknown to both, which then need them passed explicitly
+    for K-value estimates. Components in the database also carry ideal-gas
+    heat capacity coefficients (``cp_coefficients``).
+    """
+    def __init__(self, name, formula, mw=None, tc=None, pc=None, omega=None):
         self.name = name
         self.formula = formula
+        given = (mw, tc, pc, omega)
+        record = component_db.lookup(name)
+        constants = record or {}
+        self._tc = tc if tc is not None else constants.get('tc')
+        self._pc = pc if pc is not None else constants.get('pc')
+        self._omega = omega if omega is not None else constants.get('omega')
+        # Nothing left for CoolProp to supply when the database or the caller gave every constant
+        self._coolprop_checked = record is not None or all(value is not None for value in given)
         if mw is not None:
             self.mw = mw
+        elif 'mw' in constants:
+            self.mw = constants['mw']  # Molar mass in g/mol
         else:
-            try:
-                self.mw = CP.PropsSI('M', name) * 1000  # Molar mass in g/mol
-            except ValueError:
+            constants = self._coolprop_constants()
+            if 'mw' not in constants:
                 raise ValueError(f"Could not find molecular weight for '{name}'. "
                                  f"Please provide it manually using the 'mw' argument "
                                  f"for pseudo-components.")
+            self.mw = constants['mw']
+        self.cp_coefficients = record['cp'] if record is not None else None
+
+    def _coolprop_constants(self):
+        """Fills the missing critical constants from CoolProp (once) and returns its constants."""
+        constants = {} if self._coolprop_checked else fluid_constants(self.name) or {}
+        if not self._coolprop_checked:
+            self._coolprop_checked = True
+            for key in ('tc', 'pc', 'omega'):
+                if getattr(self, '_' + key) is None:
+                    setattr(self, '_' + key, constants.get(key))
+        return constants
+
+    @property
+    def tc(self):
+        if self._tc is None:
+            self._coolprop_constants()
+        return self._tc
+
+    @tc.setter
+    def tc(self, value):
+        self._tc = value
+
+    @property
+    def pc(self):
+        if self._pc is None:
+            self._coolprop_constants()
+        return self._pc
+
+    @pc.setter
+    def pc(self, value):
+        self._pc = value
+
+    @property
+    def omega(self):
+        if self._omega is None:
+            self._coolprop_constants()
+        return self._omega
+
+    @omega.setter
+    def omega(self, value):
+        self._omega = value
+
+    def ideal_gas_cp(self, temperature):
+        """
+        Ideal-gas heat capacity from the bundled database fit.
+
+        Args:
+            temperature (float or np.ndarray): Temperature(s) in Kelvin.
+
+        Returns:
+            float or np.ndarray: Cp in J/(mol K).
+        """
+        if self.cp_coefficients is None:
+            raise ValueError(f"No ideal-gas heat capacity data for '{self.name}'.")
+        return component_db.ideal_gas_cp(self.cp_coefficients, temperature)
 
 class PropertyPackage:
-    """Handles thermodynamic and transport property calculations for a mixture."""
-    def __init__(self, components):
+    """Handles thermodynamic and transport property calculations for a mixture.
+
+    State properties come from a CoolPropBackend, which keeps persistent
+    AbstractState objects and an LRU cache of recent state points; pass a
+    shared backend to let several packages reuse one cache. After
+    ``tabulate`` the properties inside the tabulated window are interpolated
+    from precomputed tables instead.
+    """
+    def __init__(self, components, backend=None):
         self.components = {comp.name: comp for comp in components}
         self.component_names = list(self.components.keys())
+        self.backend = backend if backend is not None else CoolPropBackend()
+        self.tables = {}
+        self._critical_cache = {}
+        self._tmin_cache = {}
+
+    def _critical_constants(self, components):
+        """(tc, pc, omega) arrays for the given component names, cached per name tuple."""
+        key = tuple(components)
+        constants = self._critical_cache.get(key)
+        if constants is None:
+            rows = []
+            for name in key:
+                comp = self.components.get(name)
+                if comp is None:
+                    raise ValueError(f"Component '{name}' is not part of the property package.")
+                if comp.tc is None or comp.pc is None or comp.omega is None:
+                    raise ValueError(f"Component '{name}' has no critical constants; pass tc, pc and omega "
+                                     f"to Component or give its K-value explicitly.")
+                rows.append((comp.tc, comp.pc, comp.omega))
+            constants = tuple(np.array(col, dtype=float) for col in zip(*rows)) if rows else (np.zeros(0),) * 3
+            self._critical_cache[key] = constants
+        return constants
+
+    def k_values(self, temperature, pressure, components=None, model='wilson'):
+        """
+        Vapour-liquid equilibrium ratios K_i = y_i / x_i of ideal mixtures.
+
+        'wilson' uses the Wilson correlation from the critical constants, valid at
+        any temperature; 'raoult' uses K_i = Psat_i(T) / P with CoolProp vapour
+        pressures and falls back to Wilson outside a component's saturation range.
+
+        Args:
+            temperature (float or np.ndarray): Temperature(s) in Kelvin, scalar or (N,).
+            pressure (float or np.ndarray): Pressure(s) in Pascals, scalar or (N,).
+            components (list): Component names (default: all components of the package).
+            model (str): 'wilson' or 'raoult'.
+
+        Returns:
+            np.ndarray: (ncomp,) K-values for scalar conditions, else (N, ncomp).
+        """
+        if model not in ('wilson', 'raoult'):
+            raise ValueError("model must be 'wilson' or 'raoult'.")
+        components = self.component_names if components is None else list(components)
+        tc, pc, omega = self._critical_constants(components)
+        T = np.asarray(temperature, dtype=float)
+        P = np.asarray(pressure, dtype=float)
+        scalar = T.ndim == 0 and P.ndim == 0
+        T = np.atleast_1d(T)[:, np.newaxis]
+        P = np.atleast_1d(P)[:, np.newaxis]
+        K = pc / P * np.exp(5.373 * (1.0 + omega) * (1.0 - tc / T))
+        if model == 'raoult':
+            K = np.broadcast_to(K, np.broadcast_shapes(K.shape, T.shape, P.shape)).copy()
+            T_full = np.broadcast_to(T, K.shape)
+            P_full = np.broadcast_to(P, K.shape)
+            for i, name in enumerate(components):
+                if name not in self._tmin_cache:
+                    constants = fluid_constants(name)
+                    self._tmin_cache[name] = constants['tmin'] if constants else None
+                t_min = self._tmin_cache[name]
+                if t_min is None:
+                    continue
+                valid = (T_full[:, i] >= t_min) & (T_full[:, i] < tc[i])
+                if np.any(valid):
+                    K[valid, i] = load_coolprop().PropsSI('P', 'T', T_full[valid, i], 'Q', 0, name) / P_full[valid, i]
+        return K[0] if scalar else K
+
+    def tabulate(self, t_range, p_range, n_t=50, n_p=50, tolerance=1e-4, directory=None, components=None):
+        """
+        Switches property evaluation to precomputed (T, P) interpolation tables.
+
+        Points outside the tables, or in cells that failed validation, are still
+        evaluated by the rigorous backend.
+
+        Args:
+            t_range (tuple): (T_min, T_max) in Kelvin.
+            p_range (tuple): (P_min, P_max) in Pascals.
+            n_t (int): Number of temperature grid points.
+            n_p (int): Number of pressure grid points.
+            tolerance (float): Largest accepted relative interpolation error (see PropertyTable).
+            directory (str): If given, tables are saved there and memory-mapped from there
+                             on later calls with the same settings instead of being rebuilt.
+            components (list): Components to tabulate (default: all CoolProp components).
+
+        Returns:
+            dict: The PropertyTable of each tabulated component.
+        """
+        names = self.component_names if components is None else list(components)
+        for name in names:
+            if fluid_constants(name) is None:
+                if components is not None:
+                    raise ValueError(f"Component '{name}' is not a CoolProp fluid and cannot be tabulated.")
+                continue
+            path = None
+            if directory is not None:
+                os.makedirs(directory, exist_ok=True)
+                path = os.path.join(directory, f"{name}_{t_range[0]:g}-{t_range[1]:g}K_{p_range[0]:g}-{p_range[1]:g}Pa_"
+                                               f"{n_t}x{n_p}_{tolerance:g}.npy")
+            if path is not None and os.path.exists(path):
+                self.tables[name] = PropertyTable.load(path)
+            else:
+                self.tables[name] = PropertyTable.build(name, t_range, p_range, n_t, n_p, tolerance)
+                if path is not None:
+                    self.tables[name].save(path)
+        return self.tables
 
     def get_properties(self, temp, press, composition):
         """
         Calculate thermodynamic properties for a given state.
 
         Args:
-            temp (float): Temperature in Kelvin.
-            press (float): Pressure in Pascals.
+            temp (float or np.ndarray): Temperature(s) in Kelvin.
+            press (float or np.ndarray): Pressure(s) in Pascals.
             composition (dict): Mole fractions of components.
 
         Returns:
-            dict: A dictionary of calculated properties.
+            dict: A dictionary of calculated properties (arrays for array inputs).
         """
         # Ensure composition keys match component names
         if set(composition.keys()) != set(self.component_names):
@@ -40,15 +229,17 @@ class PropertyPackage:
         # For simplicity, this example calculates properties for the first component.
         # A real implementation would handle mixtures.
         main_component = self.component_names[0]
-        
-        properties = {
-            'temperature': temp,
-            'pressure': press,
-            'density': CP.PropsSI('D', 'T', temp, 'P', press, main_component),
-            'enthalpy': CP.PropsSI('H', 'T', temp, 'P', press, main_component),
-            'entropy': CP.PropsSI('S', 'T', temp, 'P', press, main_component),
-            'viscosity': CP.PropsSI('V', 'T', temp, 'P', press, main_component),
-        }
+
+        properties = {'temperature': temp, 'pressure': press}
+        table = self.tables.get(main_component)
+        if table is not None:
+            properties.update(table.evaluate(temp, press, fallback=self.backend))
+        elif np.ndim(temp) == 0 and np.ndim(press) == 0:
+            properties.update(self.backend.properties(temp, press, main_component))
+        else:
+            T, P = np.broadcast_arrays(np.asarray(temp, dtype=float), np.asarray(press, dtype=float))
+            rows = [self.backend.properties(t, p, main_component) for t, p in zip(T.ravel(), P.ravel())]
+            properties.update({key: np.array([row[key] for row in rows]).reshape(T.shape) for key in rows[0]})
         return properties
 
 # Example Usage:
@@ -71,3 +262,25 @@ if __name__ == '__main__':
     print(f"Properties at {temp} K and {press} Pa:")
     for key, value in state_properties.items():
         print(f"  {key}: {value:.4f}")
+
+    # Vapour-liquid equilibrium ratios at the same conditions
+    k_wilson = prop_pkg.k_values(temp, press, model='wilson')
+    k_raoult = prop_pkg.k_values(temp, press, model='raoult')
+    for name, kw, kr in zip(prop_pkg.component_names, k_wilson, k_raoult):
+        print(f"  K({name}): Wilson {kw:.3f}, Raoult {kr:.3f}")
+
+    # Repeated states (e.g. recycle iterations, dynamic steps) are served from the backend cache
+    for _ in range(100):
+        prop_pkg.get_properties(temp, press, composition)
+    print("Property cache:", prop_pkg.backend.stats)
+
+    # Tabulated mode for sampling studies over a narrow operating window
+    import time
+    prop_pkg.tabulate((300.0, 340.0), (1e5, 3e5), n_t=30, n_p=10)
+    temps = np.random.default_rng(0).uniform(300.0, 340.0, 10000)
+    start = time.perf_counter()
+    batch = prop_pkg.get_properties(temps, press, composition)
+    elapsed = time.perf_counter() - start
+    print(f"{len(temps)} tabulated states in {elapsed * 1e3:.1f} ms; density range "
+          f"{batch['density'].min():.2f}-{batch['density'].max():.2f} kg/m^3")
+    print("Validated table errors:", {k: f"{v:.1e}" for k, v in prop_pkg.tables['Water'].error_bounds.items()})
@@ -0,0 +1,440 @@
+import time
+import numpy as np
+from scipy import linalg, sparse
+from scipy.integrate import solve_ivp
+from nexus.nexus_core.solver import instrumentation
+
+# Global systems up to this many states use dense Jacobians
+_DENSE_LIMIT = 64
+
+class DynamicSimulator:
+    """Integrates a flowsheet in time as one global stiff ODE system.
+
+    Units with holdup (``is_dynamic = True``, e.g. DynamicCSTR) contribute
+    their state vectors to the global state; all other units are algebraic
+    and are solved instantaneously, in calculation order, at every evaluation
+    of the right-hand side. Time-varying inputs (feed flow, temperature,
+    composition, ...) are interpolated linearly from sampled data such as
+    plant history, and discrete changes (operating mode switches, setpoint
+    steps) are applied by scheduled or state events, at which the integration
+    is restarted.
+
+    The default integrator is SciPy's BDF, which keeps its Jacobian and LU
+    factorisation across steps and only refreshes them when the Newton
+    iterations stop converging. The Jacobian is either assembled from the
+    units' analytic state Jacobians (``jacobian='local'``; couplings between
+    units are left to the Newton iterations) or estimated by finite
+    differences with the sparsity pattern implied by the flowsheet topology
+    (``jacobian='finite-difference'``). ``'auto'`` picks the analytic one
+    when no dynamic unit feeds another, where it is exact. The last analytic
+    Jacobian is also reused when an integration restarts (next run() call,
+    after an event) at a nearby state with unchanged unit parameters.
+
+    Example:
+        sim = DynamicSimulator(fs, rtol=1e-4)
+        sim.add_input('feed', 'flow_rate', hours * 3600, flows)
+        sim.schedule(7200.0, lambda sim, t: setattr(reactor, 'volume', 12.0))
+        sim.initialize()
+        result = sim.run(24 * 3600, t_eval=np.arange(0, 24 * 3600, 600))
+    """
+    def __init__(self, flowsheet, method='BDF', rtol=1e-6, atol=1e-9, jacobian='auto', verbose=True):
+        """
+        Args:
+            flowsheet (Flowsheet): The flowsheet to simulate (must be acyclic).
+            method (str): scipy.integrate.solve_ivp method ('BDF', 'Radau' or 'LSODA' for stiff systems).
+            rtol (float): Relative integration tolerance.
+            atol (float): Absolute integration tolerance.
+            jacobian (str): 'auto', 'local' or 'finite-difference'.
+            verbose (bool): Print a summary after each run().
+        """
+        if jacobian not in ('auto', 'local', 'finite-difference'):
+            raise ValueError("jacobian must be 'auto', 'local' or 'finite-difference'.")
+        self.flowsheet = flowsheet
+        self.method = method
+        self.rtol = rtol
+        self.atol = atol
+        self.jacobian = jacobian
+        self.verbose = verbose
+        self.jacobian_reuse_tol = 0.05
+        self.time = 0.0
+        self.state = None
+        self._order = None
+        self._slices = {}
+        self._inputs = []
+        self._schedule = []
+        self._fired = set()
+        self._events = []
+        self._time_origin = None
+        self._last_step = None
+        self._jac_cache = None
+        self._jac_calls = 0
+
+    # --- Inputs and events -------------------------------------------------
+
+    def _to_seconds(self, times):
+        """Converts datetimes to seconds since the first datetime seen; numbers pass through."""
+        times = np.asarray(times)
+        if times.dtype.kind == 'M':
+            if self._time_origin is None:
+                self._time_origin = times.min()
+            return (times - self._time_origin) / np.timedelta64(1, 's')
+        if times.dtype.kind == 'O' and len(times) and hasattr(times.flat[0], 'to_datetime64'):
+            return self._to_seconds(np.array([t.to_datetime64() for t in times.flat]))
+        return times.astype(float)
+
+    def add_input(self, stream, field, times, values, component=None):
+        """Drives a stream variable from sampled data, interpolated linearly in time.
+
+        Args:
+            stream (str): Stream name.
+            field (str): 'flow_rate', 'temperature', 'pressure' or 'composition'.
+            times (np.ndarray): Sample times in seconds, or datetimes (e.g. a DatetimeIndex).
+            values (np.ndarray): Sample values.
+            component (str): The component whose fraction is driven, for field='composition'.
+        """
+        if stream not in self.flowsheet.streams:
+            raise ValueError(f"Stream '{stream}' is not part of the flowsheet.")
+        if (field == 'composition') != (component is not None):
+            raise ValueError("Pass 'component' exactly when driving the 'composition' field.")
+        times = self._to_seconds(times)
+        values = np.asarray(values, dtype=float)
+        if times.shape != values.shape or times.ndim != 1:
+            raise ValueError("times and values must be 1-D arrays of equal length.")
+        order = np.argsort(times, kind='stable')
+        self._inputs.append((stream, field, component, times[order], values[order]))
+
+    def schedule(self, t, action):
+        """Calls ``action(simulator, t)`` when the simulation reaches time ``t`` (seconds or a datetime)."""
+        t = float(self._to_seconds([t])[0]) if not isinstance(t, (int, float)) else float(t)
+        self._schedule.append((t, len(self._schedule), action))
+        self._schedule.sort(key=lambda item: item[:2])
+
+    def schedule_modes(self, times, modes, actions):
+        """Schedules the action of each operating mode at the times the mode switches.
+
+        Args:
+            times (np.ndarray): Sample times (seconds or datetimes).
+            modes (np.ndarray): Operating mode label of each sample (e.g. the
+                                ``operational_mode`` column of the plant history).
+            actions (dict): Mode label -> callable(simulator, t). Modes without an
+                            action are ignored.
+
+        Returns:
+            int: The number of scheduled switches.
+        """
+        times = self._to_seconds(times)
+        modes = np.asarray(modes)
+        switches = np.concatenate([[0], np.nonzero(modes[1:] != modes[:-1])[0] + 1]) if len(modes) else []
+        count = 0
+        for i in switches:
+            action = actions.get(modes[i])
+            if action is not None:
+                self.schedule(float(times[i]), action)
+                count += 1
+        return count
+
+    def add_event(self, condition, action, direction=0):
+        """Calls ``action(simulator, t)`` whenever ``condition(simulator, t)`` crosses zero.
+
+        The condition is evaluated with the flowsheet streams at the current
+        state, so it can inspect any stream or unit. The crossing is located
+        by the integrator and the integration restarts after the action.
+
+        Args:
+            condition (callable): (simulator, t) -> float.
+            action (callable): (simulator, t) -> None.
+            direction (int): 1 for upward crossings only, -1 for downward, 0 for both.
+        """
+        # [condition, action, direction, hold-off end time, sign held during the hold-off]
+        self._events.append([condition, action, direction, -np.inf, 0.0])
+
+    # --- Global system -----------------------------------------------------
+
+    def _apply_inputs(self, t):
+        streams = self.flowsheet.streams
+        for stream, field, component, times, values in self._inputs:
+            value = float(np.interp(t, times, values))
+            if component is None:
+                streams[stream][field] = value
+            else:
+                streams[stream]['composition'][component] = value
+
+    def initialize(self, t0=0.0, steady_state=True):
+        """Builds the global state and computes the initial condition at time ``t0``.
+
+        Args:
+            t0 (float): Start time (seconds).
+            steady_state (bool): Start every dynamic unit from its steady state at
+                                 the inputs of ``t0``; otherwise from its current outlet.
+
+        Returns:
+            np.ndarray: The initial global state.
+        """
+        plan = self.flowsheet.compile()
+        if not plan.is_acyclic:
+            raise RuntimeError("Dynamic simulation requires an acyclic flowsheet.")
+        self._order = [self.flowsheet.unit_ops[name] for name in plan.order]
+        self._apply_inputs(t0)
+        states = []
+        self._slices = {}
+        offset = 0
+        for unit in self._order:
+            if unit.is_dynamic:
+                x0 = np.asarray(unit.initial_state(steady_state=steady_state), dtype=float)
+                self._slices[unit.name] = slice(offset, offset + len(x0))
+                offset += len(x0)
+                states.append(x0)
+                # Writes the outlet for downstream units
+                unit.derivatives(t0, x0)
+            else:
+                unit.solve()
+        if not self._slices:
+            raise ValueError("The flowsheet has no dynamic units (units with is_dynamic = True).")
+        self.time = float(t0)
+        self.state = np.concatenate(states)
+        # Actions scheduled before t0 are in the past; those at t0 fire when run() starts
+        self._fired = {key for scheduled_time, key, _ in self._schedule if scheduled_time < t0}
+        self._sparsity = self._dependency_pattern(plan)
+        self._last_step = None
+        self._jac_cache = None
+        return self.state.copy()
+
+    def _dependency_pattern(self, plan):
+        """Sparsity of the global Jacobian: a unit's state depends on its own and all upstream states."""
+        upstream = {}
+        for name in plan.order:
+            upstream[name] = set()
+            for pred in plan.predecessors[name]:
+                upstream[name] |= upstream[pred] | {pred}
+        n = len(self.state)
+        pattern = sparse.lil_matrix((n, n), dtype=bool)
+        for name, rows in self._slices.items():
+            for other, cols in self._slices.items():
+                if other == name or other in upstream[name]:
+                    pattern[rows, cols] = True
+        return pattern.tocsc()
+
+    def _evaluate(self, t, y):
+        """Sets inputs and states at (t, y), sweeps the flowsheet and returns dy/dt."""
+        self._apply_inputs(t)
+        dydt = np.empty_like(y)
+        for unit in self._order:
+            if unit.is_dynamic:
+                rows = self._slices[unit.name]
+                dydt[rows] = unit.derivatives(t, y[rows])
+            else:
+                unit.solve()
+        return dydt
+
+    def _local_jacobian(self, t, y):
+        self._jac_calls += 1
+        tokens = tuple(unit.state_token() for unit in self._order)
+        cached = self._jac_cache
+        if cached is not None and cached[0] and cached[1] == tokens:
+            # First Jacobian request after a restart: reuse the previous one if the state barely moved
+            self._jac_cache = (False,) + cached[1:]
+            if np.all(np.abs(y - cached[2]) <= self.jacobian_reuse_tol * np.abs(cached[2]) + 100 * self.atol):
+                return cached[3]
+        # Brings every stream to (t, y) so the units see their current inlets
+        self._evaluate(t, y)
+        blocks = []
+        for unit in self._order:
+            if unit.is_dynamic:
+                rows = self._slices[unit.name]
+                blocks.append(unit.state_jacobian(t, y[rows]))
+        if len(y) <= _DENSE_LIMIT or self.method == 'LSODA':
+            # Sparse LU only pays off for larger systems
+            J = linalg.block_diag(*blocks)
+        else:
+            J = sparse.block_diag(blocks, format='csc')
+        self._jac_cache = (False, tokens, y.copy(), J)
+        return J
+
+    def _event_functions(self):
+        functions = []
+        for event in self._events:
+            condition, _, direction = event[:3]
+
+            def g(t, y, event=event, condition=condition):
+                if t <= event[3]:
+                    # Just fired: hold the post-crossing sign so the same crossing is not found again
+                    return event[4]
+                self._evaluate(t, y)
+                return float(condition(self, t))
+            g.terminal = True
+            g.direction = direction
+            functions.append(g)
+        return functions
+
+    # --- Integration -------------------------------------------------------
+
+    def run(self, t_end, t_eval=None):
+        """Integrates from the current time to ``t_end``.
+
+        Successive calls continue the same trajectory (e.g. to follow a plant
+        in real time), reusing the last step size and Jacobian.
+
+        Args:
+            t_end (float): Final time (seconds, or a datetime).
+            t_eval (np.ndarray): Times (seconds or datetimes) at which to record the
+                                 state; defaults to every integrator step.
+
+        Returns:
+            dict: 't' (recorded times), 'states' (unit name -> (n_times, n_states)),
+                  'components' (unit name -> state component names) and 'stats'
+                  (steps, function and Jacobian evaluations, LU decompositions,
+                  segments, events, wall time and speed-up over real time).
+        """
+        if self.state is None:
+            self.initialize()
+        if not isinstance(t_end, (int, float)):
+            t_end = float(self._to_seconds([t_end])[0])
+        t_eval = None if t_eval is None else self._to_seconds(t_eval)
+        t0 = self.time
+        if t_end <= t0:
+            raise ValueError(f"t_end ({t_end}) must be after the current time ({t0}).")
+
+        options = {}
+        if self.method in ('BDF', 'Radau', 'LSODA'):
+            jacobian = self.jacobian
+            if jacobian == 'auto':
+                coupled = self._sparsity.nnz > sum((r.stop - r.start) ** 2 for r in self._slices.values())
+                jacobian = 'finite-difference' if coupled else 'local'
+            if jacobian == 'local':
+                options['jac'] = self._local_jacobian
+            elif self.method != 'LSODA' and len(self.state) > _DENSE_LIMIT:
+                options['jac_sparsity'] = self._sparsity
+        events = self._event_functions()
+        if events:
+            options['events'] = events
+
+        instr = instrumentation._active
+        wall_start = time.perf_counter()
+        if instr is not None:
+            instr.emit('solve_start', self.flowsheet.name, wall_start)
+        stats = {'steps': 0, 'nfev': 0, 'njev': 0, 'nlu': 0, 'segments': 0, 'events': 0}
+        times, values = [], []
+        t, y = t0, self.state
+        self._jac_calls = 0
+        while t < t_end:
+            # Fire the actions that are due, then integrate to the next scheduled time
+            for scheduled_time, key, action in self._schedule:
+                if scheduled_time <= t and key not in self._fired:
+                    self._fired.add(key)
+                    action(self, t)
+                    stats['events'] += 1
+            upcoming = [item[0] for item in self._schedule if t < item[0] < t_end]
+            t_stop = min(upcoming, default=t_end)
+            if self._jac_cache is not None:
+                self._jac_cache = (True,) + self._jac_cache[1:]
+            if self._last_step is not None:
+                options['first_step'] = min(self._last_step, t_stop - t)
+            result = solve_ivp(self._evaluate, (t, t_stop), y, method=self.method, rtol=self.rtol,
+                               atol=self.atol, dense_output=t_eval is not None, **options)
+            stats['segments'] += 1
+            stats['steps'] += len(result.t) - 1
+            stats['nfev'] += result.nfev
+            stats['njev'] += result.njev
+            stats['nlu'] += result.nlu
+            if result.status == -1:
+                self.state, self.time = result.y[:, -1].copy(), float(result.t[-1])
+                raise RuntimeError(f"Dynamic simulation of '{self.flowsheet.name}' failed at "
+                                   f"t = {result.t[-1]:.6g} s: {result.message}")
+            if len(result.t) > 1:
+                self._last_step = float(result.t[-1] - result.t[-2])
+            t_reached = float(result.t[-1])
+            if t_eval is None:
+                first = 0 if not times else 1
+                times.append(result.t[first:])
+                values.append(result.y[:, first:])
+            else:
+                # Each recorded time belongs to the segment that starts at or before it
+                last = t_eval <= t_reached if t_reached >= t_end else t_eval < t_reached
+                window = t_eval[(t_eval >= t) & last]
+                if len(window):
+                    times.append(window)
+                    values.append(result.sol(window))
+            t, y = t_reached, result.y[:, -1].copy()
+            if result.status == 1:
+                # A state event stopped the integration; act on it and restart from there
+                k = next(i for i, te in enumerate(result.t_events) if len(te))
+                event = self._events[k]
+                before = events[k](result.t[-2], result.y[:, -2]) if len(result.t) > 1 else -1.0
+                self._evaluate(t, y)
+                event[1](self, t)
+                event[3] = t + 1e-9 * max(abs(t), 1.0)
+                event[4] = -1.0 if before > 0 else 1.0
+                stats['events'] += 1
+        self.time, self.state = t, y
+        # Leave the streams at the final state
+        self._evaluate(t, y)
+
+        wall = time.perf_counter() - wall_start
+        stats['wall_time'] = wall
+        stats['speedup'] = (t - t0) / wall if wall > 0 else np.inf
+        stats['jacobian_requests'] = self._jac_calls
+        if instr is not None:
+            instr.emit('iterations', self.flowsheet.name, iterations=stats['steps'], nfev=stats['nfev'],
+                       njev=stats['njev'], events=stats['events'])
+            instr.emit('solve_end', self.flowsheet.name, wall_start, wall, success=True)
+        if self.verbose:
+            print(f"Simulated {(t - t0) / 3600:.1f} h of '{self.flowsheet.name}' in {wall:.2f} s "
+                  f"({stats['speedup']:.3g}x real time, {stats['steps']} steps, {stats['events']} events)")
+
+        t_all = np.concatenate(times) if times else np.zeros(0)
+        y_all = np.concatenate(values, axis=1) if values else np.zeros((len(y), 0))
+        return {'t': t_all,
+                'states': {name: y_all[rows].T for name, rows in self._slices.items()},
+                'components': {name: self.flowsheet.unit_ops[name].state_components for name in self._slices},
+                'stats': stats}
+
+# Example Usage:
+if __name__ == '__main__':
+    from nexus.nexus_core.solver.flowsheet import Flowsheet
+    from nexus.nexus_core.models.unit_operations import DynamicCSTR, UnitOperation
+    from nexus.nexus_core.kinetics.kinetics import PowerLawReaction, ConstantRate
+
+    # Two fermenters in series: A -> B, with a slow side reaction B -> C
+    main = PowerLawReaction('main', {'A': -1, 'B': 1}, ConstantRate(2e-3), {'A': 1})
+    side = PowerLawReaction('side', {'B': -1, 'C': 1}, ConstantRate(1e-5), {'B': 1})
+    fs = Flowsheet(name='Fermenter Train')
+    fs.add_unit(UnitOperation(name='Feed'))
+    for name in ['R-101', 'R-102']:
+        unit = DynamicCSTR(name=name, volume=50.0, prop_pkg=None, reactions=[main, side])
+        unit.verbose = False
+        fs.add_unit(unit)
+    fs.add_unit(UnitOperation(name='Product'))
+    fs.streams['feed'] = {'flow_rate': 0.28, 'temperature': 308.0, 'composition': {'A': 0.4, 'W': 0.6}}
+    fs.connect('feed', 'Feed', 'R-101')
+    fs.connect('s1', 'R-101', 'R-102')
+    fs.connect('product', 'R-102', 'Product')
+
+    # A month of hourly plant history: drifting feed, noise and a few abnormal periods
+    rng = np.random.default_rng(0)
+    hours = np.arange(30 * 24)
+    flow = 0.28 * (1 + 0.05 * np.sin(2 * np.pi * hours / 8760)) + rng.normal(0, 0.005, len(hours))
+    feed_a = 0.4 + 0.03 * np.sin(2 * np.pi * hours / 8760) + rng.normal(0, 0.005, len(hours))
+    modes = np.array(['Normal'] * len(hours), dtype=object)
+    for start in rng.integers(0, len(hours) - 48, size=4):
+        modes[start:start + 24] = 'Abnormal'
+
+    sim = DynamicSimulator(fs, rtol=1e-4)
+    sim.add_input('feed', 'flow_rate', hours * 3600.0, flow)
+    sim.add_input('feed', 'composition', hours * 3600.0, feed_a, component='A')
+    sim.add_input('feed', 'composition', hours * 3600.0, 1 - feed_a, component='W')
+    # Abnormal operation: the culture loses half of its activity until normal operation resumes
+    switches = sim.schedule_modes(hours * 3600.0, modes, {
+        'Abnormal': lambda sim, t: setattr(main, 'rate_constant_func', ConstantRate(1e-3)),
+        'Normal': lambda sim, t: setattr(main, 'rate_constant_func', ConstantRate(2e-3)),
+    })
+    # Alarm when the product titre falls below 0.15
+    alarms = []
+    sim.add_event(lambda sim, t: sim.flowsheet.streams['product']['composition']['B'] - 0.15,
+                  lambda sim, t: alarms.append(t / 3600), direction=-1)
+
+    sim.initialize()
+    result = sim.run(hours[-1] * 3600.0, t_eval=hours * 3600.0)
+    b = result['states']['R-102'][:, result['components']['R-102'].index('B')]
+    print(f"{switches} mode switches; product B between {b.min():.4f} and {b.max():.4f}")
+    print(f"Low-titre alarms at hours: {[round(h, 1) for h in alarms]}")
+    print("Stats:", {k: (round(v, 3) if isinstance(v, float) else v) for k, v in result['stats'].items()})
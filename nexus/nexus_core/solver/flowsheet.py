@@ -1,4 +1,157 @@
 from collections import deque
+import time
+import numpy as np
+from nexus.nexus_core.solver import instrumentation
+from nexus.nexus_core.solver.serialization import StreamSnapshot
+from nexus.nexus_core.models.streams import Stream, BatchStream
+
+class FlowsheetPlan:
+    """An immutable, compiled view of a flowsheet's topology.
+
+    The plan holds everything a solver needs to sweep the flowsheet: the
+    calculation order, the dependency levels (units within a level do not
+    depend on each other) and, for every unit, the indices of its inlet and
+    outlet streams into ``stream_names``. A plan is tagged with the flowsheet
+    version it was built from, so it can be shared by any number of solvers
+    until the topology changes.
+
+    Flowsheets with recycle loops still compile: ``blocks`` holds the strongly
+    connected components in calculation order, ``is_acyclic`` is False, and
+    ``levels`` is empty because units inside a loop cannot be levelled.
+    """
+    __slots__ = ('version', 'unit_names', 'stream_names', 'order', 'levels',
+                 'blocks', 'is_acyclic', 'inlet_indices', 'outlet_indices',
+                 'successors', 'predecessors')
+
+    def __init__(self, version, unit_names, stream_names, order, levels, blocks,
+                 is_acyclic, inlet_indices, outlet_indices, successors, predecessors):
+        set_ = object.__setattr__
+        set_(self, 'version', version)
+        set_(self, 'unit_names', unit_names)
+        set_(self, 'stream_names', stream_names)
+        set_(self, 'order', order)
+        set_(self, 'levels', levels)
+        set_(self, 'blocks', blocks)
+        set_(self, 'is_acyclic', is_acyclic)
+        set_(self, 'inlet_indices', inlet_indices)
+        set_(self, 'outlet_indices', outlet_indices)
+        set_(self, 'successors', successors)
+        set_(self, 'predecessors', predecessors)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FlowsheetPlan is immutable; recompile the flowsheet instead.")
+
+    def __delattr__(self, name):
+        raise AttributeError("FlowsheetPlan is immutable; recompile the flowsheet instead.")
+
+    @classmethod
+    def build(cls, flowsheet):
+        """Compiles the flowsheet topology into a plan."""
+        unit_names = tuple(flowsheet.unit_ops)
+        stream_index = {}
+        inlets = {u: [] for u in unit_names}
+        outlets = {u: [] for u in unit_names}
+        succ = {u: [] for u in unit_names}
+        pred = {u: [] for u in unit_names}
+        in_degree = {u: 0 for u in unit_names}
+        for src, dest, stream_name in flowsheet._connections:
+            idx = stream_index.setdefault(stream_name, len(stream_index))
+            outlets[src].append(idx)
+            inlets[dest].append(idx)
+            succ[src].append(dest)
+            pred[dest].append(src)
+            in_degree[dest] += 1
+
+        # Kahn's algorithm, tracking the dependency level of each unit as we go
+        level = {u: 0 for u in unit_names}
+        queue = deque([u for u, d in in_degree.items() if d == 0])
+        order = []
+        while queue:
+            u = queue.popleft()
+            order.append(u)
+            for v in succ[u]:
+                level[v] = max(level[v], level[u] + 1)
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    queue.append(v)
+
+        is_acyclic = len(order) == len(unit_names)
+        if is_acyclic:
+            blocks = [(u,) for u in order]
+            levels = [[] for _ in range(max(level.values(), default=-1) + 1)]
+            for u in order:
+                levels[level[u]].append(u)
+        else:
+            blocks = _strongly_connected_components(unit_names, succ)
+            order = [u for block in blocks for u in block]
+            levels = []
+
+        def _frozen(indices):
+            arr = np.array(indices, dtype=np.intp)
+            arr.flags.writeable = False
+            return arr
+
+        return cls(
+            version=flowsheet.version,
+            unit_names=unit_names,
+            stream_names=tuple(stream_index),
+            order=tuple(order),
+            levels=tuple(tuple(lvl) for lvl in levels),
+            blocks=tuple(blocks),
+            is_acyclic=is_acyclic,
+            inlet_indices={u: _frozen(v) for u, v in inlets.items()},
+            outlet_indices={u: _frozen(v) for u, v in outlets.items()},
+            successors={u: tuple(v) for u, v in succ.items()},
+            predecessors={u: tuple(v) for u, v in pred.items()},
+        )
+
+def _strongly_connected_components(nodes, succ):
+    """Tarjan's algorithm (iterative). Returns the components in topological order."""
+    # Keep the flowsheet's insertion order inside each component
+    position = {u: i for i, u in enumerate(nodes)}
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, iter(succ[root]))]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(succ[child])))
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(tuple(sorted(component, key=position.__getitem__)))
+    # Tarjan emits components in reverse topological order
+    components.reverse()
+    return components
 
 class Flowsheet:
     """Manages unit operations, streams, and their connectivity."""
@@ -7,12 +160,26 @@ class Flowsheet:
         self.unit_ops = {}
         self.streams = {}
         self._connections = []
+        self._version = 0
+        self._plan = None
+
+    def __getstate__(self):
+        # The compiled plan is derived data; it is rebuilt on first use after unpickling
+        state = dict(self.__dict__)
+        state['_plan'] = None
+        return state
+
+    @property
+    def version(self):
+        """Topology version, bumped by every call to add_unit() or connect()."""
+        return self._version
 
     def add_unit(self, unit):
         """Adds a unit operation to the flowsheet."""
         if unit.name in self.unit_ops:
             raise ValueError(f"Unit '{unit.name}' already exists in the flowsheet.")
         self.unit_ops[unit.name] = unit
+        self._version += 1
 
     def connect(self, stream_name, source_unit_name, dest_unit_name):
         """Connects two units with a stream."""
@@ -25,64 +192,232 @@ class Flowsheet:
         # If stream already exists, use it. Otherwise, create a new blank one.
         if stream_name in self.streams:
             stream_data = self.streams[stream_name]
+            if not isinstance(stream_data, Stream):
+                stream_data = self._adopt_stream(stream_name, stream_data)
         else:
-            stream_data = {'name': stream_name, 'composition': {}, 'temperature': None, 'pressure': None}
+            stream_data = Stream(name=stream_name)
             self.streams[stream_name] = stream_data
 
         # Link the stream data object to the unit's inlets/outlets
         source_unit.add_outlet(stream_data)
         dest_unit.add_inlet(stream_data)
-        self._connections.append((source_unit_name, dest_unit_name))
+        self._connections.append((source_unit_name, dest_unit_name, stream_name))
+        self._version += 1
+
+    def _adopt_stream(self, stream_name, data):
+        """Replaces a dict stream with an equivalent Stream, everywhere it is referenced."""
+        stream = Stream.from_dict(data)
+        if stream.name is None:
+            stream.name = stream_name
+        self.streams[stream_name] = stream
+        for unit in self.unit_ops.values():
+            for ports in (unit.inlets, unit.outlets):
+                for i, port in enumerate(ports):
+                    if port is data:
+                        ports[i] = stream
+        return stream
+
+    def mark_dirty(self, unit_name=None):
+        """Forces units to be re-solved by the next incremental solve.
+
+        Parameter changes made through attribute assignment are detected
+        automatically; call this after mutating a parameter in place (e.g. a list
+        element). With no argument, every unit is marked.
+        """
+        names = self.unit_ops if unit_name is None else [unit_name]
+        for name in names:
+            self.unit_ops[name].mark_dirty()
+
+    def snapshot(self):
+        """Captures every stream value in memory (see serialization.StreamSnapshot)."""
+        return StreamSnapshot(self)
+
+    def restore(self, snapshot):
+        """Writes the stream values of a snapshot() back into the flowsheet."""
+        snapshot.restore(self)
+
+    def compile(self):
+        """Returns the compiled FlowsheetPlan, rebuilding it only when the topology changed."""
+        plan = self._plan
+        if plan is None or plan.version != self._version:
+            plan = FlowsheetPlan.build(self)
+            self._plan = plan
+        return plan
 
 class SequentialModularSolver:
-    """Solves the flowsheet using a sequential modular approach with topological sort."""
-    def __init__(self, flowsheet):
+    """Solves the flowsheet using a sequential modular approach with topological sort.
+
+    By default the solve is incremental: a unit is only re-solved when its
+    parameters, inlet streams or outlet streams changed since it was last
+    solved, so a perturbation near the product end leaves the upstream results
+    in place and only its downstream cone is recomputed.
+
+    Progress messages are printed unless ``verbose`` is False. Timings,
+    iteration counts and failures are reported to the active
+    instrumentation.Instrumentation, if any.
+    """
+    def __init__(self, flowsheet, incremental=True, verbose=True):
+        """
+        Args:
+            flowsheet (Flowsheet): The flowsheet to solve.
+            incremental (bool): Skip units whose inputs did not change since their last solve.
+            verbose (bool): Print progress messages.
+        """
         self.flowsheet = flowsheet
+        self.incremental = incremental
+        self.verbose = verbose
+
+    @property
+    def plan(self):
+        """The flowsheet's compiled plan (shared with every other solver on it)."""
+        return self.flowsheet.compile()
 
     def _topological_sort(self):
         """Determines the calculation order of units and detects cycles."""
-        in_degree = {u: 0 for u in self.flowsheet.unit_ops}
-        adj = {u: [] for u in self.flowsheet.unit_ops}
-        for src, dest in self.flowsheet._connections:
-            adj[src].append(dest)
-            in_degree[dest] += 1
+        plan = self.flowsheet.compile()
+        if not plan.is_acyclic:
+            raise RuntimeError("Cycle detected in the flowsheet! Use RecycleSolver for flowsheets with recycle loops.")
+        return list(plan.order)
 
-        queue = deque([u for u, d in in_degree.items() if d == 0])
-        sorted_order = []
-        
-        while queue:
-            u = queue.popleft()
-            sorted_order.append(u)
-            for v in adj[u]:
-                in_degree[v] -= 1
-                if in_degree[v] == 0:
-                    queue.append(v)
-        
-        if len(sorted_order) != len(self.flowsheet.unit_ops):
-            raise RuntimeError("Cycle detected in the flowsheet! Recycle solver not yet implemented.")
-        
-        return sorted_order
+    def _solve_unit(self, unit, verbose=True):
+        """Solves one unit unless incremental mode finds it unchanged.
+
+        Returns:
+            bool: True if the unit was solved, False if it was skipped.
+        """
+        if self.incremental and not unit.needs_solve():
+            return False
+        if verbose and self.verbose:
+            print(f"Solving unit: {unit.name}")
+        unit.mark_dirty()
+        instr = instrumentation._active
+        if instr is None:
+            unit.solve()
+        else:
+            start = time.perf_counter()
+            try:
+                unit.solve()
+            except Exception as e:
+                instr.emit('unit_failed', unit.name, start, time.perf_counter() - start, error=str(e))
+                raise
+            instr.emit('unit', unit.name, start, time.perf_counter() - start)
+        unit.mark_solved()
+        return True
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
 
     def solve(self):
         """Executes the solve method for each unit in a topologically sorted order."""
-        print(f"--- Solving Flowsheet: {self.flowsheet.name} ---")
+        self._log(f"--- Solving Flowsheet: {self.flowsheet.name} ---")
+        instr = instrumentation._active
+        start = time.perf_counter()
+        if instr is not None:
+            instr.emit('solve_start', self.flowsheet.name, start)
         try:
             calculation_order = self._topological_sort()
-            print("Calculation order determined:", ' -> '.join(calculation_order))
+            self._log("Calculation order determined: " + ' -> '.join(calculation_order))
         except RuntimeError as e:
             print(f"Error: {e}")
+            if instr is not None:
+                instr.emit('solve_end', self.flowsheet.name, start, time.perf_counter() - start,
+                           solved=0, success=False)
             return
 
+        solved = 0
         for unit_name in calculation_order:
             unit = self.flowsheet.unit_ops[unit_name]
-            print(f"Solving unit: {unit.name}")
             try:
-                unit.solve()
+                solved += self._solve_unit(unit)
             except Exception as e:
                 print(f"ERROR solving unit '{unit.name}': {e}")
+                if instr is not None:
+                    instr.emit('solve_end', self.flowsheet.name, start, time.perf_counter() - start,
+                               solved=solved, success=False)
                 # Stop solving if a unit fails
                 return
-        print("--- Flowsheet solution complete. ---")
+        if self.incremental and solved < len(calculation_order):
+            self._log(f"Re-solved {solved} of {len(calculation_order)} units; the rest were unchanged.")
+        if instr is not None:
+            instr.emit('solve_end', self.flowsheet.name, start, time.perf_counter() - start,
+                       solved=solved, success=True)
+        self._log("--- Flowsheet solution complete. ---")
+
+    def solve_batch(self, feeds=None, parameters=None, size=None):
+        """Solves N scenarios of the flowsheet in one pass.
+
+        Every stream carries a leading batch dimension (see BatchStream) and
+        each unit is solved once for all scenarios through its solve_batch()
+        hook; units without a vectorized model fall back to one solve() per
+        scenario. The flowsheet's own streams are left untouched.
+
+        Args:
+            feeds (dict): Stream name -> BatchStream, or a dict with any of 'flow_rate',
+                          'temperature', 'pressure' ((N,) arrays or scalars) and
+                          'composition' (component name -> (N,) array). Streams not given
+                          keep their current values in every scenario.
+            parameters (dict): Unit name -> {attribute name: (N,) array}.
+            size (int): Number of scenarios; inferred from the arrays if omitted.
+
+        Returns:
+            dict: Stream name -> BatchStream with the results of all scenarios.
+        """
+        feeds = feeds or {}
+        parameters = parameters or {}
+        calculation_order = self._topological_sort()
+        if size is None:
+            size = _batch_size(feeds, parameters)
+
+        names = {id(stream): name for name, stream in self.flowsheet.streams.items()}
+        batches = {}
+        for name, stream in self.flowsheet.streams.items():
+            spec = feeds.get(name)
+            if isinstance(spec, BatchStream):
+                if spec.size != size:
+                    raise ValueError(f"Batch for stream '{name}' has {spec.size} rows, expected {size}.")
+                batches[name] = spec
+                continue
+            batch = BatchStream.from_stream(stream, size)
+            batch.name = name
+            for key, value in (spec or {}).items():
+                if key == 'composition':
+                    batch.set_composition(value)
+                else:
+                    setattr(batch, key, np.broadcast_to(np.asarray(value, dtype=float), (size,)).copy())
+            batches[name] = batch
+
+        for unit_name in calculation_order:
+            unit = self.flowsheet.unit_ops[unit_name]
+            if not unit.inlets:
+                continue
+            inlets = [batches[names[id(s)]] for s in unit.inlets]
+            unit_params = parameters.get(unit_name)
+            try:
+                if unit.has_batch_solve():
+                    outlets = unit.solve_batch(inlets, unit_params)
+                else:
+                    outlets = unit._solve_batch_rows(inlets, unit_params)
+            except Exception as e:
+                raise RuntimeError(f"ERROR solving unit '{unit.name}': {e}") from e
+            for stream, batch in zip(unit.outlets, outlets):
+                batch.name = names[id(stream)]
+                batches[batch.name] = batch
+        return batches
+
+def _batch_size(feeds, parameters):
+    """Infers the number of scenarios from the longest array in the batch inputs."""
+    sizes = []
+    for spec in feeds.values():
+        if isinstance(spec, BatchStream):
+            sizes.append(spec.size)
+            continue
+        for key, value in spec.items():
+            values = value.values() if key == 'composition' else [value]
+            sizes.extend(np.size(v) for v in values)
+    for unit_params in parameters.values():
+        sizes.extend(len(np.atleast_1d(v)) for v in unit_params.values())
+    return max(sizes, default=1)
 
 # Example Usage:
 if __name__ == '__main__':
@@ -92,16 +427,8 @@ if __name__ == '__main__':
     from nexus.nexus_core.kinetics.kinetics import PowerLawReaction
     import numpy as np
 
-    # 1. Define a dummy separator for demonstration
-    class Separator(UnitOperation):
-        def solve(self):
-            inlet = self.inlets[0]
-            # Split ethanol and water
-            self.outlets[0]['composition'] = {'Ethanol': inlet['composition'].get('Ethanol', 0) * 0.99, 'Water': inlet['composition'].get('Water', 0) * 0.01}
-            self.outlets[1]['composition'] = {'Ethanol': inlet['composition'].get('Ethanol', 0) * 0.01, 'Water': inlet['composition'].get('Water', 0) * 0.99}
-            for out in self.outlets:
-                out.update({k: v for k, v in inlet.items() if k != 'composition'})
-            print(f"Separator '{self.name}' solved.")
+    # 1. A flash drum separates the reactor effluent (outlets: vapour, then liquid)
+    from nexus.nexus_core.models.unit_operations import Flash
 
     # 2. Setup flowsheet
     fs = Flowsheet(name='Process with Separator')
@@ -113,7 +440,8 @@ if __name__ == '__main__':
     # 4. Create and add unit operations
     feed_unit = UnitOperation(name='Feed') # Use base class for feed/product sinks
     reactor = CSTR(name='R-101', volume=10, prop_pkg=prop_pkg, reaction=reaction)
-    separator = Separator(name='S-101')
+    separator = Flash(name='S-101', prop_pkg=prop_pkg, temperature=370, pressure=10000,
+                      k_values={'Product': 0.001})
     product_unit = UnitOperation(name='Product')
     waste_unit = UnitOperation(name='Waste')
     
@@ -122,12 +450,10 @@ if __name__ == '__main__':
 
     # 5. Define feed stream and connect units
     fs.streams['feed'] = {'flow_rate': 0.1, 'temperature': 353, 'composition': {'Ethanol': 0.8, 'Water': 0.2}}
-    feed_unit.add_outlet(fs.streams['feed'])
-    
-    fs.connect('s1', 'Feed', 'R-101')
+    fs.connect('feed', 'Feed', 'R-101')
     fs.connect('s2', 'R-101', 'S-101')
-    fs.connect('s3', 'S-101', 'Product') # Product stream
-    fs.connect('s4', 'S-101', 'Waste') # Waste stream
+    fs.connect('s3', 'S-101', 'Waste') # Vapour: water and unreacted ethanol
+    fs.connect('s4', 'S-101', 'Product') # Liquid: product
 
     # 6. Create a solver and solve the flowsheet
     solver = SequentialModularSolver(flowsheet=fs)
@@ -135,8 +461,8 @@ if __name__ == '__main__':
 
     # 7. Display results
     print("\n--- Results ---")
-    print("Product Stream Composition:", fs.streams['s3']['composition'])
-    print("Waste Stream Composition:", fs.streams['s4']['composition'])
+    print("Product Stream Composition:", fs.streams['s4']['composition'])
+    print("Waste Stream Composition:", fs.streams['s3']['composition'])
 
     # 8. Example of a flowsheet with a cycle
     print("\n--- Testing Cycle Detection ---")
@@ -147,3 +473,25 @@ if __name__ == '__main__':
     fs_cycle.connect('c2', 'B', 'A') # This creates a recycle loop
     cycle_solver = SequentialModularSolver(flowsheet=fs_cycle)
     cycle_solver.solve()
+
+    # 9. Batched scenarios: 10,000 reactor volumes and feed flow rates in one pass
+    import time
+    print("\n--- Batch Solve ---")
+    fs_batch = Flowsheet(name='Reactor Sweep')
+    for unit in [UnitOperation(name='Feed'), CSTR(name='R-201', volume=10, prop_pkg=prop_pkg, reaction=reaction),
+                 UnitOperation(name='Product')]:
+        fs_batch.add_unit(unit)
+    fs_batch.streams['b1'] = {'flow_rate': 0.1, 'temperature': 353, 'composition': {'Ethanol': 0.8, 'Water': 0.2}}
+    fs_batch.connect('b1', 'Feed', 'R-201')
+    fs_batch.connect('b2', 'R-201', 'Product')
+    n_cases = 10000
+    rng = np.random.default_rng(0)
+    volumes = rng.uniform(1.0, 20.0, n_cases)
+    flows = rng.uniform(0.05, 0.2, n_cases)
+
+    batch_solver = SequentialModularSolver(fs_batch, incremental=False)
+    start = time.perf_counter()
+    results = batch_solver.solve_batch(feeds={'b1': {'flow_rate': flows}}, parameters={'R-201': {'volume': volumes}})
+    batch_time = time.perf_counter() - start
+    print(f"Solved {n_cases} cases in {batch_time:.3f} s; outlet ethanol fraction "
+          f"ranges {results['b2'].composition['Ethanol'].min():.3f} - {results['b2'].composition['Ethanol'].max():.3f}")
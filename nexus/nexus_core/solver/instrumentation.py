@@ -0,0 +1,207 @@
+import json
+import time
+from contextlib import contextmanager
+
+# The instrumentation receiving events, or None. Instrumented code checks this
+# once per event site, so a disabled solve pays a single attribute lookup.
+_active = None
+
+def active():
+    """Returns the active Instrumentation, or None when instrumentation is disabled."""
+    return _active
+
+@contextmanager
+def suspended():
+    """Disables instrumentation inside a ``with`` block (e.g. for probe solves that are not real solves)."""
+    global _active
+    previous, _active = _active, None
+    try:
+        yield
+    finally:
+        _active = previous
+
+class SolverEvent:
+    """One record emitted by an instrumented solve.
+
+    Attributes:
+        kind (str): 'solve_start', 'solve_end', 'unit', 'unit_failed', 'iterations',
+                    'loop' or 'level'.
+        name (str): The unit, loop or flowsheet the event refers to.
+        start (float): Seconds since the instrumentation was created.
+        duration (float): Wall time in seconds for timed events, else None.
+        data (dict): Event-specific fields (e.g. iterations, residual, error).
+    """
+    __slots__ = ('kind', 'name', 'start', 'duration', 'data')
+
+    def __init__(self, kind, name, start, duration=None, data=None):
+        self.kind = kind
+        self.name = name
+        self.start = start
+        self.duration = duration
+        self.data = data or {}
+
+    def __repr__(self):
+        timing = f", duration={self.duration:.6f}" if self.duration is not None else ""
+        return f"SolverEvent({self.kind!r}, {self.name!r}{timing}, {self.data})"
+
+class Instrumentation:
+    """Collects timing, iteration and failure events from flowsheet solves.
+
+    Instrumentation is enabled for the duration of a ``with`` block; outside of
+    one the solvers and units emit nothing. Events are kept in memory (unless
+    ``keep_events`` is False) and passed to every hook as they occur, so a hook
+    can stream them elsewhere while summary() aggregates them per unit.
+
+    Example:
+        with Instrumentation() as instr:
+            solver.solve()
+        instr.print_summary()
+        instr.export_chrome_trace('solve_trace.json')
+    """
+    def __init__(self, hooks=(), keep_events=True):
+        """
+        Args:
+            hooks (list): Callables invoked with each SolverEvent.
+            keep_events (bool): Store events for summary() and export_chrome_trace().
+        """
+        self.hooks = list(hooks)
+        self.keep_events = keep_events
+        self.events = []
+        self._origin = time.perf_counter()
+        self._previous = []
+
+    def add_hook(self, hook):
+        """Registers a callable that receives every SolverEvent."""
+        self.hooks.append(hook)
+
+    def emit(self, kind, name, start=None, duration=None, **data):
+        """Records an event.
+
+        Args:
+            kind (str): Event kind (see SolverEvent).
+            name (str): Unit, loop or flowsheet name.
+            start (float): time.perf_counter() reading when the timed work began; defaults to now.
+            duration (float): Wall time in seconds, for timed events.
+            **data: Event-specific fields.
+        """
+        if start is None:
+            start = time.perf_counter()
+        event = SolverEvent(kind, name, start - self._origin, duration, data)
+        if self.keep_events:
+            self.events.append(event)
+        for hook in self.hooks:
+            hook(event)
+
+    def clear(self):
+        """Discards the recorded events."""
+        self.events = []
+
+    def __enter__(self):
+        global _active
+        self._previous.append(_active)
+        _active = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _active
+        _active = self._previous.pop()
+
+    def summary(self):
+        """Aggregates the recorded events per unit.
+
+        Returns:
+            dict: Unit name -> {'calls', 'total_time', 'mean_time', 'max_time',
+                  'failures', 'iterations', 'last_residual'}, ordered by total time.
+        """
+        stats = {}
+        for event in self.events:
+            if event.kind not in ('unit', 'unit_failed', 'iterations'):
+                continue
+            entry = stats.setdefault(event.name, {'calls': 0, 'total_time': 0.0, 'max_time': 0.0,
+                                                  'failures': 0, 'iterations': 0, 'last_residual': None})
+            if event.kind == 'unit':
+                entry['calls'] += 1
+                entry['total_time'] += event.duration
+                entry['max_time'] = max(entry['max_time'], event.duration)
+            elif event.kind == 'unit_failed':
+                entry['failures'] += 1
+            else:
+                entry['iterations'] += event.data.get('iterations', 0)
+                entry['last_residual'] = event.data.get('residual')
+        for entry in stats.values():
+            entry['mean_time'] = entry['total_time'] / entry['calls'] if entry['calls'] else 0.0
+        return dict(sorted(stats.items(), key=lambda item: -item[1]['total_time']))
+
+    def print_summary(self):
+        """Prints the per-unit summary as a table."""
+        stats = self.summary()
+        total = sum(entry['total_time'] for entry in stats.values())
+        print(f"{'Unit':<16}{'Calls':>8}{'Total (s)':>12}{'Mean (ms)':>12}{'Max (ms)':>12}"
+              f"{'Share':>8}{'Iters':>8}{'Fails':>7}")
+        for name, entry in stats.items():
+            share = entry['total_time'] / total if total > 0 else 0.0
+            print(f"{name:<16}{entry['calls']:>8}{entry['total_time']:>12.4f}{entry['mean_time'] * 1e3:>12.3f}"
+                  f"{entry['max_time'] * 1e3:>12.3f}{share:>8.1%}{entry['iterations']:>8}{entry['failures']:>7}")
+
+    def export_chrome_trace(self, path):
+        """Writes the recorded events as a Chrome trace (chrome://tracing, Perfetto).
+
+        Timed events become complete ('X') slices and the rest instant ('i')
+        markers; timestamps are in microseconds since the instrumentation was created.
+        """
+        trace = []
+        for event in self.events:
+            record = {'name': event.name, 'cat': event.kind, 'ts': event.start * 1e6,
+                      'pid': 0, 'tid': 0, 'args': _json_safe(event.data)}
+            if event.duration is not None:
+                record.update(ph='X', dur=event.duration * 1e6)
+            else:
+                record.update(ph='i', s='t')
+            trace.append(record)
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f)
+
+def _json_safe(data):
+    """Converts event data to JSON-serialisable values (NumPy scalars, tuples, errors)."""
+    safe = {}
+    for key, value in data.items():
+        if isinstance(value, (str, int, float, bool)) or value is None:
+            safe[key] = value
+        elif hasattr(value, 'item') and getattr(value, 'ndim', 1) == 0:
+            safe[key] = value.item()
+        elif isinstance(value, (list, tuple)):
+            safe[key] = [v if isinstance(v, (str, int, float, bool)) else str(v) for v in value]
+        else:
+            safe[key] = str(value)
+    return safe
+
+# Example Usage:
+if __name__ == '__main__':
+    from nexus.nexus_core.solver.flowsheet import Flowsheet, SequentialModularSolver
+    from nexus.nexus_core.models.unit_operations import CSTR, UnitOperation
+    from nexus.nexus_core.kinetics.kinetics import PowerLawReaction
+    # The solvers report to the package module, not to this file run as __main__
+    from nexus.nexus_core.solver.instrumentation import Instrumentation
+
+    reaction = PowerLawReaction('r1', {'A': -1, 'B': 1}, lambda T: 0.05, {'A': 1})
+    fs = Flowsheet(name='Instrumented Train')
+    fs.add_unit(UnitOperation(name='Feed'))
+    for k in range(3):
+        fs.add_unit(CSTR(name=f'R-10{k}', volume=2.0 * (k + 1), prop_pkg=None, reaction=reaction))
+    fs.add_unit(UnitOperation(name='Product'))
+    fs.streams['feed'] = {'flow_rate': 0.1, 'temperature': 330.0, 'composition': {'A': 1.0, 'B': 0.0}}
+    fs.connect('feed', 'Feed', 'R-100')
+    fs.connect('s1', 'R-100', 'R-101')
+    fs.connect('s2', 'R-101', 'R-102')
+    fs.connect('product', 'R-102', 'Product')
+    for unit in fs.unit_ops.values():
+        unit.verbose = False
+
+    solver = SequentialModularSolver(fs, incremental=False, verbose=False)
+    with Instrumentation() as instr:
+        for volume in [1.0, 2.0, 4.0, 8.0]:
+            fs.unit_ops['R-100'].volume = volume
+            solver.solve()
+    instr.print_summary()
+    instr.export_chrome_trace('solve_trace.json')
+    print(f"Wrote {len(instr.events)} events to solve_trace.json")
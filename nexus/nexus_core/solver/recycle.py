@@ -0,0 +1,441 @@
+import itertools
+import time
+from collections import deque
+import numpy as np
+from nexus.nexus_core.solver import instrumentation
+from nexus.nexus_core.solver.flowsheet import SequentialModularSolver
+
+class TearLayout:
+    """Maps a set of tear streams onto a flat vector of iteration variables.
+
+    Each stream contributes its component flows (flow_rate * mole fraction) and,
+    when they are defined, its temperature and pressure. The layout covers the
+    union of the fields found in every given set of states for the same
+    streams; missing values are packed as NaN so that a blank first guess never
+    counts as converged.
+    """
+    def __init__(self, *stream_sets):
+        self.components = sorted({comp for streams in stream_sets for s in streams
+                                  for comp in s.get('composition', {})})
+        self.has_temperature = [any(s.get('temperature') is not None for s in states)
+                                for states in zip(*stream_sets)]
+        self.has_pressure = [any(s.get('pressure') is not None for s in states)
+                             for states in zip(*stream_sets)]
+        ncomp = len(self.components)
+        self.size = sum(ncomp + t + p for t, p in zip(self.has_temperature, self.has_pressure))
+
+    def fits(self, streams):
+        """Returns True if the streams still have the layout's keys and fields."""
+        comps = {comp for s in streams for comp in s.get('composition', {})}
+        return (comps.issubset(self.components)
+                and all(t or s.get('temperature') is None for s, t in zip(streams, self.has_temperature))
+                and all(p or s.get('pressure') is None for s, p in zip(streams, self.has_pressure)))
+
+    def pack(self, streams):
+        """Flattens the stream values into a vector."""
+        x = np.empty(self.size)
+        pos = 0
+        for s, has_t, has_p in zip(streams, self.has_temperature, self.has_pressure):
+            flow = s.get('flow_rate') or 0.0
+            comp = s.get('composition', {})
+            for name in self.components:
+                x[pos] = flow * comp.get(name, 0.0)
+                pos += 1
+            if has_t:
+                x[pos] = np.nan if s.get('temperature') is None else s['temperature']
+                pos += 1
+            if has_p:
+                x[pos] = np.nan if s.get('pressure') is None else s['pressure']
+                pos += 1
+        return x
+
+    def unpack(self, x, streams):
+        """Writes a vector back into the streams (component flows clipped at zero)."""
+        pos = 0
+        ncomp = len(self.components)
+        for s, has_t, has_p in zip(streams, self.has_temperature, self.has_pressure):
+            flows = np.maximum(x[pos:pos + ncomp], 0.0)
+            total = flows.sum()
+            pos += ncomp
+            s['flow_rate'] = float(total)
+            s['composition'] = {name: float(f / total) if total > 0 else 0.0
+                                for name, f in zip(self.components, flows)}
+            if has_t:
+                s['temperature'] = float(x[pos])
+                pos += 1
+            if has_p:
+                s['pressure'] = float(x[pos])
+                pos += 1
+
+    def scales(self, g):
+        """Per-variable scale: total stream flow for component flows, the value itself otherwise."""
+        scale = np.abs(g)
+        pos = 0
+        ncomp = len(self.components)
+        for has_t, has_p in zip(self.has_temperature, self.has_pressure):
+            scale[pos:pos + ncomp] = np.sum(np.abs(g[pos:pos + ncomp]))
+            pos += ncomp + has_t + has_p
+        return np.maximum(scale, 1e-12)
+
+    def residual(self, x, g):
+        """Scaled max-norm of g(x) - x; infinite while any guess value is missing."""
+        if self.size == 0:
+            return 0.0
+        if np.isnan(x).any():
+            return np.inf
+        return float(np.max(np.abs(g - x) / self.scales(g)))
+
+class DirectSubstitution:
+    """Successive substitution: x_{k+1} = g(x_k)."""
+    name = 'direct'
+
+    def reset(self):
+        pass
+
+    def step(self, x, g):
+        return g.copy()
+
+class Wegstein:
+    """Wegstein's bounded secant acceleration, applied element-wise.
+
+    The acceleration factor q = s / (s - 1) is bounded to [q_min, q_max]. A loop
+    with recycle ratio s needs q close to s / (s - 1) (about -19 at s = 0.95),
+    so the lower bound is wider than the textbook -5.
+    """
+    name = 'wegstein'
+
+    def __init__(self, q_min=-20.0, q_max=0.0):
+        self.q_min = q_min
+        self.q_max = q_max
+        self._prev = None
+
+    def reset(self):
+        self._prev = None
+
+    def step(self, x, g):
+        if self._prev is None or np.isnan(x).any():
+            x_new = g.copy()
+        else:
+            x_old, g_old = self._prev
+            dx = x - x_old
+            dg = g - g_old
+            with np.errstate(divide='ignore', invalid='ignore'):
+                slope = np.where(np.abs(dx) > 1e-14, dg / dx, 0.0)
+                q = np.where(slope != 1.0, slope / (slope - 1.0), 0.0)
+            q = np.clip(q, self.q_min, self.q_max)
+            x_new = q * x + (1.0 - q) * g
+        self._prev = (x, g)
+        return x_new
+
+class Broyden:
+    """Broyden's ("good") quasi-Newton method on F(x) = g(x) - x.
+
+    The inverse Jacobian starts at -I, so the first step is a direct
+    substitution. Variables are scaled by their magnitude at the first step.
+    """
+    name = 'broyden'
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._H = None
+        self._prev = None
+        self._scale = None
+
+    def step(self, x, g):
+        if np.isnan(x).any():
+            self.reset()
+            return g.copy()
+        if self._H is None:
+            self._scale = np.maximum(np.abs(g), 1e-8)
+            self._H = -np.eye(x.size)
+        xs = x / self._scale
+        fs = (g - x) / self._scale
+        if self._prev is not None:
+            dx = xs - self._prev[0]
+            df = fs - self._prev[1]
+            h_df = self._H @ df
+            denom = dx @ h_df
+            if abs(denom) > 1e-14:
+                self._H += np.outer(dx - h_df, dx @ self._H) / denom
+        self._prev = (xs, fs)
+        return (xs - self._H @ fs) * self._scale
+
+ACCELERATORS = {
+    'direct': DirectSubstitution,
+    'wegstein': Wegstein,
+    'broyden': Broyden,
+}
+
+class RecycleSolver(SequentialModularSolver):
+    """Sequential modular solver that converges recycle loops by tearing streams.
+
+    Each strongly connected block of the flowsheet is torn on a minimal set of
+    streams (chosen automatically unless given), swept in order, and the tear
+    stream values are iterated to a fixed point with direct substitution,
+    Wegstein or Broyden acceleration.
+    """
+    def __init__(self, flowsheet, method='wegstein', tol=1e-6, max_iter=200, tear_streams=None,
+                 incremental=True, verbose=True):
+        """
+        Args:
+            flowsheet (Flowsheet): The flowsheet to solve.
+            method (str): Convergence method: 'direct', 'wegstein' or 'broyden'.
+            tol (float): Convergence tolerance on the scaled tear-stream residual.
+            max_iter (int): Maximum number of passes around each loop.
+            tear_streams (list): Optional stream names to tear instead of the automatic selection.
+            incremental (bool): Skip units whose inputs did not change since their last solve.
+            verbose (bool): Print progress messages.
+        """
+        super().__init__(flowsheet, incremental=incremental, verbose=verbose)
+        if method not in ACCELERATORS:
+            raise ValueError(f"Unknown convergence method '{method}'. "
+                             f"Choose from {sorted(ACCELERATORS)}.")
+        self.method = method
+        self.tol = tol
+        self.max_iter = max_iter
+        self.tear_streams = list(tear_streams) if tear_streams is not None else None
+        self.loop_reports = []
+        self._tear_cache = None
+
+    def select_tear_streams(self):
+        """Chooses the tear streams for every recycle loop.
+
+        Returns:
+            dict: Maps each cyclic block (a tuple of unit names) to a tuple of
+                  (tear stream names, calculation order within the torn block).
+        """
+        plan = self.plan
+        if self._tear_cache is not None and self._tear_cache[0] == plan.version:
+            return self._tear_cache[1]
+
+        selection = {}
+        for block in plan.blocks:
+            members = set(block)
+            edges = [(src, dest, stream) for src, dest, stream in self.flowsheet._connections
+                     if src in members and dest in members]
+            if not edges:
+                continue
+            if self.tear_streams is not None:
+                torn = [i for i, e in enumerate(edges) if e[2] in self.tear_streams]
+                if not _is_acyclic(block, edges, torn):
+                    raise ValueError(f"Tear streams {self.tear_streams} do not break every "
+                                     f"loop through units {list(block)}.")
+            else:
+                inlet_counts = {u: len(self.flowsheet.unit_ops[u].inlets) for u in block}
+                torn = _minimal_tear_set(block, edges, inlet_counts)
+            names = tuple(dict.fromkeys(edges[i][2] for i in torn))
+            selection[block] = (names, _torn_order(block, edges, torn))
+
+        self._tear_cache = (plan.version, selection)
+        return selection
+
+    def solve(self):
+        """Solves the flowsheet, converging every recycle loop in calculation order.
+
+        Returns:
+            list: One report per loop with its units, tear streams, method,
+                  iteration count, residual history and convergence flag.
+        """
+        self._log(f"--- Solving Flowsheet: {self.flowsheet.name} ---")
+        instr = instrumentation._active
+        solve_start = time.perf_counter()
+        if instr is not None:
+            instr.emit('solve_start', self.flowsheet.name, solve_start)
+        self.loop_reports = []
+        try:
+            tears = self.select_tear_streams()
+        except ValueError as e:
+            print(f"Error: {e}")
+            if instr is not None:
+                instr.emit('solve_end', self.flowsheet.name, solve_start, time.perf_counter() - solve_start,
+                           success=False)
+            return self.loop_reports
+
+        success = True
+        for block in self.plan.blocks:
+            try:
+                if block in tears:
+                    tear_names, order = tears[block]
+                    start = time.perf_counter()
+                    report = self._converge_loop(block, tear_names, order)
+                    self.loop_reports.append(report)
+                    if instr is not None:
+                        instr.emit('loop', ' -> '.join(order), start, time.perf_counter() - start,
+                                   tear_streams=tear_names, method=self.method, iterations=report['iterations'],
+                                   residual=report['residuals'][-1], converged=report['converged'])
+                    if report['converged']:
+                        self._log(f"Loop {' -> '.join(order)} converged in {report['iterations']} iterations "
+                                  f"(residual {report['residuals'][-1]:.2e}, method: {self.method}).")
+                    else:
+                        # Downstream units are still solved, from the last iterate
+                        print(f"Warning: Loop {' -> '.join(order)} did NOT converge in {report['iterations']} "
+                              f"iterations (residual {report['residuals'][-1]:.2e}, method: {self.method}).")
+                        success = False
+                else:
+                    self._solve_unit(self.flowsheet.unit_ops[block[0]])
+            except Exception as e:
+                print(f"ERROR solving block {list(block)}: {e}")
+                # Stop solving if a unit fails
+                success = False
+                break
+        if instr is not None:
+            instr.emit('solve_end', self.flowsheet.name, solve_start, time.perf_counter() - solve_start,
+                       success=success)
+        if success:
+            self._log("--- Flowsheet solution complete. ---")
+        return self.loop_reports
+
+    def _converge_loop(self, block, tear_names, order):
+        """Iterates the tear streams of one loop to a fixed point."""
+        streams = [self.flowsheet.streams[name] for name in tear_names]
+        for s in streams:
+            # A blank tear stream starts as an empty (zero-flow) guess
+            if s.get('flow_rate') is None:
+                s['flow_rate'] = 0.0
+            s.setdefault('composition', {})
+
+        accelerator = ACCELERATORS[self.method]()
+        layout = None
+        residuals = []
+        converged = False
+        iteration = 0
+        for iteration in range(1, self.max_iter + 1):
+            guesses = [dict(s, composition=dict(s['composition'])) for s in streams]
+            for unit_name in order:
+                self._solve_unit(self.flowsheet.unit_ops[unit_name], verbose=False)
+
+            if layout is None or not layout.fits(streams) or not layout.fits(guesses):
+                layout = TearLayout(streams, guesses)
+                accelerator.reset()
+            x = layout.pack(guesses)
+            g = layout.pack(streams)
+            residual = layout.residual(x, g)
+            residuals.append(residual)
+            if residual < self.tol:
+                converged = True
+                break
+            layout.unpack(accelerator.step(x, g), streams)
+
+        return {
+            'units': tuple(order),
+            'tear_streams': tear_names,
+            'method': self.method,
+            'iterations': iteration,
+            'residuals': residuals,
+            'converged': converged,
+        }
+
+def _is_acyclic(nodes, edges, torn):
+    """Returns True if removing the torn edges leaves the block without cycles."""
+    return len(_torn_order(nodes, edges, torn)) == len(nodes)
+
+def _torn_order(nodes, edges, torn):
+    """Kahn's order of a block with the torn edges removed (insertion order breaks ties)."""
+    torn = set(torn)
+    in_degree = {u: 0 for u in nodes}
+    succ = {u: [] for u in nodes}
+    for i, (src, dest, _) in enumerate(edges):
+        if i not in torn:
+            succ[src].append(dest)
+            in_degree[dest] += 1
+    queue = deque(u for u in nodes if in_degree[u] == 0)
+    order = []
+    while queue:
+        u = queue.popleft()
+        order.append(u)
+        for v in succ[u]:
+            in_degree[v] -= 1
+            if in_degree[v] == 0:
+                queue.append(v)
+    return tuple(order)
+
+def _elementary_cycles(nodes, edges, excluded=(), limit=10000):
+    """Enumerates elementary cycles as frozensets of edge indices (at most ``limit``)."""
+    position = {u: i for i, u in enumerate(nodes)}
+    out = {u: [] for u in nodes}
+    for i, (src, dest, _) in enumerate(edges):
+        if i not in excluded:
+            out[src].append((dest, i))
+    cycles = []
+
+    def visit(start, node, path, on_path):
+        for dest, i in out[node]:
+            if len(cycles) >= limit:
+                return
+            if dest == start:
+                cycles.append(frozenset(path + [i]))
+            elif position[dest] > position[start] and dest not in on_path:
+                on_path.add(dest)
+                visit(start, dest, path + [i], on_path)
+                on_path.discard(dest)
+
+    for start in nodes:
+        visit(start, start, [], {start})
+    return cycles
+
+def _minimal_tear_set(nodes, edges, inlet_counts, max_combinations=50000):
+    """Finds a minimum set of edges that breaks every cycle in a block.
+
+    Small blocks are solved exactly as a set-cover over the elementary cycles;
+    among equally small sets, streams entering units with many inlets (mixing
+    points, where recycles usually close) are preferred. Large blocks fall back
+    to greedily tearing the edge shared by the most remaining cycles.
+    """
+    def score(combo):
+        return sum(inlet_counts[edges[i][1]] for i in combo)
+
+    cycles = _elementary_cycles(nodes, edges)
+    candidates = sorted({i for c in cycles for i in c})
+    for k in range(1, len(candidates) + 1):
+        n_combos = 1
+        for j in range(k):
+            n_combos = n_combos * (len(candidates) - j) // (j + 1)
+        if n_combos > max_combinations:
+            break
+        covers = [combo for combo in itertools.combinations(candidates, k)
+                  if all(c.intersection(combo) for c in cycles)]
+        if covers:
+            best = max(covers, key=score)
+            if _is_acyclic(nodes, edges, best):
+                return list(best)
+            break
+
+    # Greedy fallback: tear the most shared edge until no cycle is left
+    torn = set()
+    while not _is_acyclic(nodes, edges, torn):
+        cycles = _elementary_cycles(nodes, edges, excluded=torn)
+        counts = {}
+        for c in cycles:
+            for i in c:
+                counts[i] = counts.get(i, 0) + 1
+        torn.add(max(counts, key=lambda i: (counts[i], inlet_counts[edges[i][1]])))
+    return sorted(torn)
+
+# Example Usage:
+if __name__ == '__main__':
+    from nexus.nexus_core.solver.flowsheet import Flowsheet
+    from nexus.nexus_core.models.unit_operations import UnitOperation, Mixer, Splitter
+
+    def build_recycle_flowsheet(recycle_fraction=0.95):
+        fs = Flowsheet(name='High-Recycle Loop')
+        for unit in [UnitOperation(name='Feed'), Mixer(name='M-101'), UnitOperation(name='H-101'),
+                     Splitter(name='SP-101', split_fractions=[1 - recycle_fraction, recycle_fraction]),
+                     UnitOperation(name='Product')]:
+            fs.add_unit(unit)
+        fs.streams['feed'] = {'flow_rate': 1.0, 'temperature': 350.0, 'pressure': 101325,
+                              'composition': {'A': 0.7, 'B': 0.3}}
+        fs.connect('feed', 'Feed', 'M-101')
+        fs.connect('mixed', 'M-101', 'H-101')
+        fs.connect('heated', 'H-101', 'SP-101')
+        fs.connect('product', 'SP-101', 'Product')
+        fs.connect('recycle', 'SP-101', 'M-101')
+        return fs
+
+    for method in ['direct', 'wegstein', 'broyden']:
+        fs = build_recycle_flowsheet()
+        solver = RecycleSolver(fs, method=method, max_iter=1000)
+        reports = solver.solve()
+        print(f"{method}: tear={reports[0]['tear_streams']}, iterations={reports[0]['iterations']}, "
+              f"recycle flow={fs.streams['recycle']['flow_rate']:.4f}\n")
@@ -0,0 +1,173 @@
+import pickle
+import zlib
+import numpy as np
+from nexus.nexus_core.models.streams import Stream, assign_stream
+
+class StreamSnapshot:
+    """An in-memory copy of every stream value in a flowsheet.
+
+    Capturing stores the scalar fields of all streams in one (n_streams, 3)
+    array plus a copy of each composition vector; restoring writes
+    the values back into the existing stream objects, so the references
+    units hold stay valid. Use it to roll back a failed line-search step or
+    to reset a flowsheet to a converged state between evaluations.
+    """
+    __slots__ = ('names', 'scalars', 'components', 'fractions', '_extra')
+
+    def __init__(self, flowsheet):
+        """
+        Args:
+            flowsheet (Flowsheet): The flowsheet whose streams are captured.
+        """
+        streams = flowsheet.streams
+        self.names = tuple(streams)
+        self.scalars = np.empty((len(streams), 3))
+        self.components = []
+        self.fractions = []
+        self._extra = {}
+        for i, (name, stream) in enumerate(streams.items()):
+            if not isinstance(stream, Stream):
+                # Streams not (yet) connected may still be dicts
+                self._extra[name] = {k: (dict(v) if k == 'composition' else v) for k, v in stream.items()}
+                self.components.append(None)
+                self.fractions.append(None)
+                continue
+            self.scalars[i] = [_nan_if_none(stream.flow_rate), _nan_if_none(stream.temperature),
+                               _nan_if_none(stream.pressure)]
+            self.components.append(stream.components)
+            self.fractions.append(stream.fractions.copy())
+
+    def restore(self, flowsheet):
+        """Writes the captured values back into the flowsheet's streams."""
+        streams = flowsheet.streams
+        for i, name in enumerate(self.names):
+            stream = streams.get(name)
+            if stream is None:
+                raise ValueError(f"Stream '{name}' is not part of the flowsheet.")
+            if name in self._extra:
+                assign_stream(stream, self._extra[name])
+                continue
+            if not isinstance(stream, Stream):
+                raise ValueError(f"Stream '{name}' was replaced since the snapshot was taken.")
+            flow, temp, press = self.scalars[i]
+            stream.flow_rate = _none_if_nan(flow)
+            stream.temperature = _none_if_nan(temp)
+            stream.pressure = _none_if_nan(press)
+            stream.set_fractions(self.components[i], self.fractions[i])
+
+def _nan_if_none(value):
+    return np.nan if value is None else value
+
+def _none_if_nan(value):
+    return None if np.isnan(value) else float(value)
+
+def dumps(flowsheet, compress=True):
+    """Serialises a flowsheet (units, parameters, reactions, streams and solve state) to bytes.
+
+    The format is plain pickle, optionally zlib-compressed: meant for saving
+    your own work and handing flowsheets to worker processes, not for
+    exchanging flowsheets with untrusted parties (see ``loads``). Streams
+    shared between units stay shared after loading. Units remember their last
+    solved state, so an incremental solve of the loaded flowsheet starts from
+    the saved (e.g. converged) values without re-solving.
+
+    Args:
+        flowsheet (Flowsheet): The flowsheet to serialise.
+        compress (bool): zlib-compress the payload.
+
+    Returns:
+        bytes: The serialised flowsheet.
+    """
+    try:
+        data = pickle.dumps(flowsheet, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        raise TypeError(f"Flowsheet '{flowsheet.name}' cannot be serialised: {e}. "
+                        f"{_find_unpicklable(flowsheet)}") from e
+    return b'Z' + zlib.compress(data) if compress else b'P' + data
+
+def loads(data):
+    """Rebuilds a flowsheet serialised by dumps().
+
+    Warning:
+        This unpickles the data, which can execute arbitrary code. Only load
+        data you trust (e.g. files your own runs wrote).
+    """
+    tag, payload = data[:1], data[1:]
+    if tag == b'Z':
+        payload = zlib.decompress(payload)
+    elif tag != b'P':
+        raise ValueError("Data was not produced by serialization.dumps().")
+    return pickle.loads(payload)
+
+def save(flowsheet, path, compress=True):
+    """Writes dumps(flowsheet) to a file."""
+    with open(path, 'wb') as f:
+        f.write(dumps(flowsheet, compress=compress))
+
+def load(path):
+    """Reads a flowsheet written by save().
+
+    Warning:
+        Like ``loads``, this unpickles the file; only load files you trust.
+    """
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+def _find_unpicklable(flowsheet):
+    """Names the unit attribute that prevents pickling, to make the error actionable."""
+    for unit in flowsheet.unit_ops.values():
+        for attr, value in vars(unit).items():
+            try:
+                pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                # Reactors hold their reactions in a list
+                for reaction in (value if isinstance(value, list) else [value]):
+                    if getattr(reaction, 'rate_constant_func', None) is None:
+                        continue
+                    try:
+                        pickle.dumps(reaction, protocol=pickle.HIGHEST_PROTOCOL)
+                    except Exception:
+                        return (f"Unit '{unit.name}': the rate constant of reaction '{reaction.name}' is not "
+                                f"picklable; use ConstantRate, ArrheniusRate or a spec dict instead of a lambda.")
+                return f"Unit '{unit.name}': attribute '{attr}' is not picklable."
+    return ""
+
+# Example Usage:
+if __name__ == '__main__':
+    from nexus.nexus_core.solver.flowsheet import Flowsheet
+    from nexus.nexus_core.solver.recycle import RecycleSolver
+    from nexus.nexus_core.models.unit_operations import CSTR, UnitOperation, Mixer, Splitter
+    from nexus.nexus_core.kinetics.kinetics import PowerLawReaction
+
+    # A declarative Arrhenius rate constant keeps the flowsheet picklable
+    reaction = PowerLawReaction('r1', {'A': -1, 'B': 1},
+                                {'type': 'arrhenius', 'A': 0.05, 'Ea': 4e4, 'T_ref': 330.0}, {'A': 1})
+    fs = Flowsheet(name='Reactor with Recycle')
+    for unit in [UnitOperation(name='Feed'), Mixer(name='M-101'),
+                 CSTR(name='R-101', volume=1.0, prop_pkg=None, reaction=reaction),
+                 Splitter(name='SP-101', split_fractions=[0.2, 0.8]), UnitOperation(name='Product')]:
+        fs.add_unit(unit)
+    fs.streams['feed'] = {'flow_rate': 0.1, 'temperature': 330.0, 'composition': {'A': 1.0, 'B': 0.0}}
+    fs.connect('feed', 'Feed', 'M-101')
+    fs.connect('mixed', 'M-101', 'R-101')
+    fs.connect('effluent', 'R-101', 'SP-101')
+    fs.connect('product', 'SP-101', 'Product')
+    fs.connect('recycle', 'SP-101', 'M-101')
+    for unit in fs.unit_ops.values():
+        unit.verbose = False
+    RecycleSolver(fs, verbose=False).solve()
+
+    # Snapshot, perturb, roll back
+    snapshot = StreamSnapshot(fs)
+    fs.streams['recycle']['flow_rate'] = 0.0
+    snapshot.restore(fs)
+    print("Recycle flow after rollback:", fs.streams['recycle']['flow_rate'])
+
+    # Save the converged flowsheet and warm-start from it
+    data = dumps(fs)
+    print(f"Serialised flowsheet: {len(data)} bytes")
+    restored = loads(data)
+    print("Shared streams preserved:",
+          restored.unit_ops['SP-101'].outlets[1] is restored.unit_ops['M-101'].inlets[1])
+    reports = RecycleSolver(restored, verbose=False).solve()
+    print(f"Warm start: loop converged in {reports[0]['iterations']} iteration(s)")
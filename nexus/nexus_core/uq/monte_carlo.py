@@ -1,32 +1,241 @@
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from nexus.nexus_core.solver import instrumentation
+from nexus.nexus_core.uq import sampling
+from nexus.nexus_core.uq.results import ResultSink
+
+def sample_generator(entropy, index):
+    """The random generator of one sample.
+
+    Every sample draws from its own stream, spawned from the study seed by its
+    index, so a sample's values do not depend on which worker runs it or on
+    how many samples were drawn before it.
+
+    Args:
+        entropy (int): The study's root seed (SeedSequence entropy).
+        index (int): Sample index.
+
+    Returns:
+        np.random.Generator: The sample's generator.
+    """
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence(entropy, spawn_key=(index,))))
+
+class _FailureCollector:
+    """Instrumentation hook that records why a solve failed (solvers report failures instead of raising)."""
+    def __init__(self):
+        self.errors = []
+
+    def __call__(self, event):
+        if event.kind == 'unit_failed':
+            self.errors.append(f"unit '{event.name}': {event.data.get('error')}")
+        elif event.kind == 'loop' and event.data.get('converged') is False:
+            self.errors.append(f"recycle loop '{event.name}' did not converge")
+        elif event.kind == 'solve_end' and event.data.get('success') is False and not self.errors:
+            self.errors.append(f"solve of '{event.name}' failed")
+
+def _apply_parameter(flowsheet, parameter, value):
+    """Sets one sampled value on the flowsheet."""
+    kind = parameter['kind']
+    if kind == 'setter':
+        parameter['setter'](value)
+    elif kind == 'unit':
+        # Attribute assignment bumps the unit's revision, so incremental solvers see the change
+        setattr(flowsheet.unit_ops[parameter['target']], parameter['attribute'], value)
+    else:
+        flowsheet.streams[parameter['target']][parameter['attribute']] = value
+
+def _draw(parameters, entropy, index):
+    """Pseudo-random parameter values of one sample from its own generator."""
+    rng = sample_generator(entropy, index)
+    return [getattr(rng, p['dist'])(**p['params']) for p in parameters]
+
+def _run_sample(flowsheet, solver, values, parameters, responses):
+    """Applies one sample's parameter values, solves, and returns the response values."""
+    for parameter, value in zip(parameters, values):
+        _apply_parameter(flowsheet, parameter, value)
+    collector = _FailureCollector()
+    outer = instrumentation.active()
+    if outer is None:
+        with instrumentation.Instrumentation(hooks=[collector], keep_events=False):
+            solver.solve()
+    else:
+        # Keep reporting to the caller's instrumentation and listen in on it
+        outer.add_hook(collector)
+        try:
+            solver.solve()
+        finally:
+            outer.hooks.remove(collector)
+    if collector.errors:
+        raise RuntimeError('; '.join(collector.errors))
+    return [func(flowsheet) for func in responses]
+
+def _run_chunk(context, start, stop, design=None):
+    """Runs samples [start, stop) on a context's flowsheet.
+
+    Parameter values are the rows of ``design`` if given (space-filling
+    samplers), else pseudo-random draws from each sample's generator.
+
+    Returns:
+        tuple: (start, parameter values (n, nparam), responses (n, nresp) with NaN rows for
+                failed samples, list of (index, error message)).
+    """
+    parameters, responses = context['parameters'], context['responses']
+    values = np.full((stop - start, len(parameters)), np.nan)
+    outputs = np.full((stop - start, len(responses)), np.nan)
+    failures = []
+    for k, index in enumerate(range(start, stop)):
+        if context['template'] is not None:
+            flowsheet, solver = pickle.loads(context['template'])
+        else:
+            flowsheet, solver = context['flowsheet'], context['solver']
+        values[k] = design[k] if design is not None else _draw(parameters, context['entropy'], index)
+        try:
+            outputs[k] = _run_sample(flowsheet, solver, values[k], parameters, responses)
+        except Exception as e:
+            failures.append((index, f"{type(e).__name__}: {e}"))
+    return start, values, outputs, failures
+
+# Flowsheet and settings of a worker process, built once by _init_worker
+_worker_context = None
+
+def _make_context(flowsheet, solver, parameters, responses, entropy, fresh_copies):
+    template = pickle.dumps((flowsheet, solver), protocol=pickle.HIGHEST_PROTOCOL) if fresh_copies else None
+    return {'flowsheet': flowsheet, 'solver': solver, 'template': template, 'parameters': parameters,
+            'responses': responses, 'entropy': entropy}
+
+def _init_worker(factory, parameters, responses, entropy, fresh_copies):
+    global _worker_context
+    flowsheet, solver = factory()
+    _worker_context = _make_context(flowsheet, solver, parameters, responses, entropy, fresh_copies)
+
+def _run_worker_chunk(start, stop, design=None):
+    return _run_chunk(_worker_context, start, stop, design)
 
 class MonteCarlo:
-    """Performs Monte Carlo simulation for uncertainty quantification."""
+    """Performs Monte Carlo simulation for uncertainty quantification.
+
+    Every sample draws its parameter values from its own generator, spawned
+    from ``seed`` by sample index (see ``sample_generator``), so a seed
+    reproduces the same samples serially or on any number of workers.
 
-    def __init__(self, flowsheet, solver, num_samples=1000):
+    For parallel runs, pass a ``flowsheet_factory``: a picklable (module-level)
+    function returning a ``(flowsheet, solver)`` pair. Each worker process
+    calls it once and runs chunks of samples on its own flowsheet, so the
+    uncertain parameters must be declared with ``add_unit_parameter`` or
+    ``add_stream_parameter`` rather than setter callables, and the responses
+    must be picklable functions of the flowsheet.
+
+    With ``sampler`` 'lhs', 'sobol' or 'halton' the parameter values come
+    instead from a space-filling design generated up front and mapped through
+    the inverse CDFs of the parameter distributions (see ``sampling``), which
+    for smooth responses reaches a given accuracy with far fewer solves. A run
+    can stop early once the confidence intervals of the response means are
+    narrow enough (``ci_width`` in ``run_simulation``).
+
+    Samples that raise, or whose solve reports a failed unit or an
+    unconverged recycle loop, are recorded in ``failures`` as
+    ``(sample index, error message)``.
+
+    Results stream into a ``ResultSink`` as chunks complete. By default it
+    keeps the samples in memory and ``run_simulation`` returns a DataFrame;
+    for very large studies pass a sink that only keeps running statistics
+    and/or spills the raw samples to disk, so memory does not grow with the
+    number of samples.
+
+    Long runs can be checkpointed to a file (``checkpoint`` in
+    ``run_simulation``): the seed, the completed samples, the convergence
+    checks and the sink's accumulated results are written atomically every
+    ``checkpoint_every`` seconds and after every convergence check. Running
+    the same study again with the same checkpoint continues where the
+    interrupted run stopped, without re-solving completed samples, and gives
+    the same results as an uninterrupted run.
+    """
+
+    def __init__(self, flowsheet=None, solver=None, num_samples=1000, flowsheet_factory=None, seed=None,
+                 sampler='random', replicates=8):
+        """
+        Args:
+            flowsheet (Flowsheet): Flowsheet to sample in place (serial runs without a factory).
+            solver: Solver of ``flowsheet``.
+            num_samples (int): Number of samples.
+            flowsheet_factory (callable): Returns a new ``(flowsheet, solver)`` pair.
+            seed (int): Root seed of the study; a random one is drawn (and kept in ``seed``) if None.
+            sampler (str): 'random' (independent pseudo-random draws), 'lhs' (Latin hypercube),
+                'sobol' (scrambled Sobol) or 'halton' (scrambled Halton).
+            replicates (int): Independently randomised replicates of a space-filling design; their
+                spread gives the confidence intervals used for early stopping.
+        """
+        if flowsheet_factory is None and (flowsheet is None or solver is None):
+            raise ValueError("Pass either a flowsheet and its solver, or a flowsheet_factory.")
+        if sampler not in sampling.SAMPLERS:
+            raise ValueError(f"Unknown sampler '{sampler}'. Available: {sampling.SAMPLERS}.")
+        if sampler != 'random' and replicates < 2:
+            raise ValueError("Space-filling samplers need at least 2 replicates.")
         self.flowsheet = flowsheet
         self.solver = solver
         self.num_samples = num_samples
+        self.flowsheet_factory = flowsheet_factory
+        self.seed = np.random.SeedSequence(seed).entropy
+        self._seed_given = seed is not None
+        self.sampler = sampler
+        self.replicates = replicates
         self.uncertain_setters = []
         self.output_responses = {}
+        self.failures = []
+        self.samples = None
+        self.convergence = []
+        self.results = None
+
+    def _add_parameter(self, parameter, distribution, dist_params):
+        if not hasattr(np.random.Generator, distribution):
+            raise ValueError(f"Unknown distribution '{distribution}'; use a numpy.random.Generator method name.")
+        if self.sampler != 'random' and not sampling.supports_inverse_cdf(distribution):
+            raise ValueError(f"Distribution '{distribution}' cannot be used with the '{self.sampler}' sampler.")
+        parameter.update(dist=distribution, params=dict(dist_params))
+        self.uncertain_setters.append(parameter)
 
-    def add_uncertain_parameter(self, setter_callable, distribution, dist_params):
+    def add_uncertain_parameter(self, setter_callable, distribution, dist_params, name=None):
         """Adds a parameter with uncertainty using a generic setter function.
 
+        Setter callables act on the flowsheet passed to the constructor, so they
+        cannot be used with a flowsheet factory.
+
         Args:
             setter_callable (function): A function that takes a single value and sets
                                         the appropriate parameter in the simulation.
             distribution (str): The name of the numpy.random distribution (e.g., 'normal', 'uniform').
             dist_params (dict): Parameters for the distribution (e.g., {'loc': 10, 'scale': 1}).
+            name (str): Column name of the parameter in ``samples``.
+        """
+        name = name or getattr(setter_callable, '__name__', f'parameter_{len(self.uncertain_setters)}')
+        self._add_parameter({'kind': 'setter', 'name': name, 'setter': setter_callable}, distribution, dist_params)
+
+    def add_unit_parameter(self, unit_name, attribute, distribution, dist_params):
+        """Adds an uncertain unit attribute (e.g. a reactor volume), usable in parallel runs.
+
+        Args:
+            unit_name (str): Name of the unit in the flowsheet.
+            attribute (str): Attribute of the unit to set.
+            distribution (str): The name of the numpy.random distribution (e.g., 'normal', 'uniform').
+            dist_params (dict): Parameters for the distribution.
+        """
+        self._add_parameter({'kind': 'unit', 'name': f'{unit_name}.{attribute}', 'target': unit_name,
+                             'attribute': attribute}, distribution, dist_params)
+
+    def add_stream_parameter(self, stream_name, key, distribution, dist_params):
+        """Adds an uncertain stream value (e.g. a feed flow rate), usable in parallel runs.
+
+        Args:
+            stream_name (str): Name of the stream in the flowsheet.
+            key (str): Stream field to set ('flow_rate', 'temperature', 'pressure').
+            distribution (str): The name of the numpy.random distribution (e.g., 'normal', 'uniform').
+            dist_params (dict): Parameters for the distribution.
         """
-        self.uncertain_setters.append({
-            'setter': setter_callable,
-            'dist': getattr(np.random, distribution),
-            'params': dist_params
-        })
+        self._add_parameter({'kind': 'stream', 'name': f'{stream_name}.{key}', 'target': stream_name,
+                             'attribute': key}, distribution, dist_params)
 
     def add_output_response(self, name, response_callable):
         """Defines an output response to track during the simulation.
@@ -38,43 +247,258 @@ class MonteCarlo:
         """
         self.output_responses[name] = response_callable
 
-    def run_simulation(self):
-        """Runs the Monte Carlo simulation."""
-        results = {name: [] for name in self.output_responses.keys()}
-
-        print(f"--- Running Monte Carlo Simulation ({self.num_samples} samples) ---")
-        for i in range(self.num_samples):
-            # 1. Sample new values and set them using the setter functions
-            for param_info in self.uncertain_setters:
-                sample_val = param_info['dist'](**param_info['params'])
-                param_info['setter'](sample_val)
-
-            # 2. Solve the flowsheet with the new parameters
-            try:
-                self.solver.solve()
-            except Exception as e:
-                print(f"Warning: Sample {i+1} failed to solve. Skipping. Error: {e}")
-                continue
-
-            # 3. Record the output responses
-            for name, func in self.output_responses.items():
-                results[name].append(func(self.flowsheet))
-            
-            if (i + 1) % (self.num_samples // 10) == 0:
-                print(f"Completed {i + 1}/{self.num_samples} samples...")
-
-        print("--- Monte Carlo Simulation Complete ---")
-        return pd.DataFrame(results)
+    @staticmethod
+    def _chunks(start, stop, chunk_size):
+        bounds = list(range(start, stop, chunk_size)) + [stop]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def _ci_targets(self, ci_width, names):
+        """Target full widths of the confidence intervals, per response name."""
+        if isinstance(ci_width, dict):
+            unknown = set(ci_width) - set(names)
+            if unknown:
+                raise ValueError(f"ci_width names unknown responses: {sorted(unknown)}.")
+            return dict(ci_width)
+        return {name: ci_width for name in names}
+
+    @staticmethod
+    def _pending_chunks(completed, start, stop, chunk_size):
+        """Chunks of the samples in [start, stop) that have not been run yet."""
+        todo = np.flatnonzero(~completed[start:stop]) + start
+        if todo.size == 0:
+            return []
+        runs = np.split(todo, np.flatnonzero(np.diff(todo) != 1) + 1)
+        return [chunk for run in runs for chunk in MonteCarlo._chunks(int(run[0]), int(run[-1]) + 1, chunk_size)]
+
+    @staticmethod
+    def _write_checkpoint(path, state):
+        """Writes a checkpoint atomically: a crash mid-write leaves the previous checkpoint intact."""
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _load_checkpoint(self, path, settings):
+        """Reads a checkpoint and checks that it belongs to this study."""
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        changed = sorted(key for key in settings if state['settings'].get(key) != settings[key])
+        if changed:
+            raise ValueError(f"Checkpoint '{path}' belongs to a different study (changed: {', '.join(changed)}); "
+                             "use another checkpoint file or resume=False.")
+        if state['seed'] != self.seed:
+            if self._seed_given:
+                raise ValueError(f"Checkpoint '{path}' was written with seed {state['seed']}, not {self.seed}.")
+            self.seed = state['seed']
+        return state
+
+    def run_simulation(self, n_workers=1, chunk_size=None, fresh_copies=True, ci_width=None, relative=False,
+                       confidence=0.95, check_every=None, sink=None, checkpoint=None, checkpoint_every=60.0,
+                       resume=True):
+        """Runs the Monte Carlo simulation.
+
+        Args:
+            n_workers (int): Number of worker processes; 1 runs in this process.
+            chunk_size (int): Samples per task sent to a worker (default: about eight tasks per worker
+                and batch).
+            fresh_copies (bool): With a factory, start every sample from the factory's initial state,
+                so results do not depend on which samples a worker ran before (at the cost of
+                unpickling the flowsheet per sample). False lets samples warm-start each other.
+            ci_width (float or dict): Stop early once the confidence interval of every tracked response
+                mean is at most this wide (a dict gives per-response widths and tracks only those
+                responses). None runs all ``num_samples`` samples.
+            relative (bool): ``ci_width`` is relative to the magnitude of the mean.
+            confidence (float): Confidence level of the intervals.
+            check_every (int): Samples between convergence checks (default ``num_samples // 20``,
+                rounded up to whole replicates for space-filling samplers).
+            sink (ResultSink): Destination of the results (e.g. with a spill directory). None keeps
+                all samples in memory.
+            checkpoint (str): File to checkpoint the run to. Checkpoints hold the sink's results, so
+                for large in-memory runs prefer a spilling sink, whose raw samples stay on disk.
+            checkpoint_every (float): Seconds between checkpoints (0 checkpoints after every chunk).
+            resume (bool): Continue from ``checkpoint`` if it exists (the study, and the sink's
+                settings, must match the interrupted run); False starts over.
+
+        Returns:
+            pd.DataFrame or ResultSink: Without a sink, the responses of the successful samples,
+                indexed by sample number, with the sampled parameter values of all samples run
+                in ``samples``; with a sink, the sink. Either way the sink is kept in ``results``,
+                the failed samples in ``failures`` and the convergence checks in ``convergence``.
+        """
+        parameters = self.uncertain_setters
+        if n_workers > 1 and self.flowsheet_factory is None:
+            raise ValueError("Parallel runs need a flowsheet_factory.")
+        if self.flowsheet_factory is not None and any(p['kind'] == 'setter' for p in parameters):
+            raise ValueError("Setter callables cannot be used with a flowsheet_factory; "
+                             "use add_unit_parameter or add_stream_parameter.")
+        names = list(self.output_responses)
+        responses = [self.output_responses[name] for name in names]
+        n = self.num_samples
+        replicates = self.replicates if self.sampler != 'random' else None
+        if ci_width is None:
+            batch = n
+        else:
+            targets = self._ci_targets(ci_width, names)
+            batch = check_every or max(1, n // 20)
+            if replicates:
+                batch = -(-batch // replicates) * replicates
+        # Everything that determines which samples are run and what they give
+        settings = {'num_samples': n, 'sampler': self.sampler, 'replicates': replicates, 'batch': batch,
+                    'parameters': [(p['name'], p['dist'], p['params']) for p in parameters], 'responses': names,
+                    'ci_width': ci_width, 'relative': relative, 'confidence': confidence,
+                    'fresh_copies': fresh_copies}
+        state = None
+        if checkpoint is not None and resume and os.path.exists(checkpoint):
+            state = self._load_checkpoint(checkpoint, settings)
+        design = None
+        if self.sampler != 'random':
+            # Every batch of an early-stopping run holds complete Latin hypercubes
+            design = sampling.design_matrix(self.sampler, [(p['dist'], p['params']) for p in parameters], n,
+                                            self.seed, self.replicates, block=batch if ci_width is not None else None)
+        if chunk_size is None:
+            chunk_size = max(1, -(-batch // (8 * n_workers)))
+        streaming = sink is not None
+        if sink is None:
+            sink = ResultSink(keep_in_memory=True)
+        self.results = sink
+        completed = np.zeros(n, dtype=bool)
+        finished = False
+        if state is None:
+            sink.open([p['name'] for p in parameters], names, replicates)
+            self.failures = []
+            self.convergence = []
+        else:
+            sink.restore(state['sink'])
+            completed = np.unpackbits(state['completed'], count=n).astype(bool)
+            self.failures = state['failures']
+            self.convergence = state['convergence']
+            finished = state['finished']
+
+        print(f"--- Running Monte Carlo Simulation ({n} samples, {self.sampler} sampling, {n_workers} worker(s), "
+              f"seed {self.seed}) ---")
+        start_time = time.perf_counter()
+        done = int(completed.sum())
+        if state is not None:
+            print(f"Resuming from checkpoint '{checkpoint}': {done} samples already run"
+                  + (" (run complete)." if finished else "."))
+        report_every = max(1, n // 10)
+        last_saved = time.perf_counter()
+
+        def save(finished=False):
+            nonlocal last_saved
+            self._write_checkpoint(checkpoint, {
+                'settings': settings, 'seed': self.seed, 'completed': np.packbits(completed),
+                'failures': self.failures, 'convergence': self.convergence, 'finished': finished,
+                'sink': sink.state()})
+            last_saved = time.perf_counter()
+
+        def collect(result):
+            nonlocal done
+            start, chunk_values, chunk_outputs, failures = result
+            sink.add(np.arange(start, start + len(chunk_values)), chunk_values, chunk_outputs)
+            self.failures.extend(failures)
+            completed[start:start + len(chunk_values)] = True
+            previous, done = done, done + len(chunk_values)
+            if ci_width is None and done // report_every > previous // report_every:
+                print(f"Completed {done}/{n} samples...")
+            if checkpoint is not None and time.perf_counter() - last_saved >= checkpoint_every:
+                save()
+
+        def converged():
+            """Records a convergence check; True once every tracked interval is narrow enough."""
+            mean, half = sink.confidence(confidence)
+            check = {'samples': done}
+            narrow = True
+            for j, name in enumerate(names):
+                check[name] = (mean[j], half[j])
+                if name in targets:
+                    limit = targets[name] * (abs(mean[j]) if relative else 1.0)
+                    narrow &= bool(2.0 * half[j] <= limit)
+            self.convergence.append(check)
+            # At least two batches, so that the first interval is not judged on too few samples
+            narrow = narrow and done >= 2 * batch
+            if narrow or done >= n or len(self.convergence) % 10 == 1:
+                print(f"{done}/{n} samples: " + ', '.join(f"{name} {mean[j]:.6g} +/- {half[j]:.3g}"
+                                                          for j, name in enumerate(names)))
+            return narrow
+
+        pool = None
+        if n_workers > 1 and not finished:
+            initargs = (self.flowsheet_factory, parameters, responses, self.seed, fresh_copies)
+            pool = ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=initargs)
+        elif self.flowsheet_factory is not None and not finished:
+            context = _make_context(*self.flowsheet_factory(), parameters, responses, self.seed, fresh_copies)
+        else:
+            context = _make_context(self.flowsheet, self.solver, parameters, responses, self.seed, False)
+        try:
+            for number, batch_start in enumerate(range(0, n, batch)):
+                if finished:
+                    break
+                if number < len(self.convergence):
+                    # Run and checked (without stopping) before the interruption
+                    continue
+                chunks = self._pending_chunks(completed, batch_start, min(batch_start + batch, n), chunk_size)
+                if pool is not None:
+                    futures = [pool.submit(_run_worker_chunk, a, b, None if design is None else design[a:b])
+                               for a, b in chunks]
+                    for future in as_completed(futures):
+                        collect(future.result())
+                else:
+                    for a, b in chunks:
+                        collect(_run_chunk(context, a, b, None if design is None else design[a:b]))
+                if ci_width is not None:
+                    finished = converged()
+                    if checkpoint is not None:
+                        save(finished)
+                    if finished:
+                        if done < n:
+                            print(f"Confidence intervals reached the target width; stopping after {done} samples.")
+                        break
+            if checkpoint is not None:
+                save(finished=True)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            sink.close()
+
+        self.failures.sort()
+        print(f"--- Monte Carlo Simulation Complete ({time.perf_counter() - start_time:.2f} s) ---")
+        if self.failures:
+            print(f"Warning: {len(self.failures)} of {done} samples failed (see .failures); first: "
+                  f"sample {self.failures[0][0]}: {self.failures[0][1]}")
+        if streaming:
+            self.samples = None
+            return sink
+        frame = sink.dataframe()
+        self.samples = frame[sink.parameters]
+        failed = frame.index.isin([index for index, _ in self.failures])
+        return frame.loc[~failed, names]
 
     @staticmethod
     def analyze_results(results_df):
-        """Prints a statistical summary and saves histograms of the results."""
+        """Prints a statistical summary and saves histograms of the results.
+
+        Args:
+            results_df (pd.DataFrame or ResultSink): Results of ``run_simulation``. A sink is
+                summarised from its running statistics without touching the raw samples.
+        """
+        # Plotting libraries take seconds to import, so they are loaded only when plotting
+        import matplotlib.pyplot as plt
+        import seaborn as sns
         print("\n--- Uncertainty Analysis Results ---")
-        print(results_df.describe())
+        streamed = isinstance(results_df, ResultSink)
+        print(results_df.summary() if streamed else results_df.describe())
 
-        for col in results_df.columns:
+        for col in (results_df.responses if streamed else results_df.columns):
             plt.figure(figsize=(8, 5))
-            sns.histplot(results_df[col], kde=True)
+            if streamed:
+                counts, edges = results_df.histogram(col)
+                if edges is not None:
+                    plt.stairs(counts, edges, fill=True)
+            else:
+                sns.histplot(results_df[col], kde=True)
             plt.title(f'Distribution of {col}')
             plt.xlabel('Value')
             plt.ylabel('Frequency')
@@ -84,50 +508,94 @@ class MonteCarlo:
             plt.close()  # Close the figure to free memory
             print(f"Saved plot to {output_filename}")
 
+# Flowsheet factory and response of the example below. They live at module
+# level so that worker processes can unpickle them under every start method:
+# with 'spawn' (the macOS and Windows default) a worker re-imports this module
+# without running the ``__main__`` block.
+def _example_reactor_flowsheet():
+    from nexus.nexus_core.solver.flowsheet import Flowsheet, SequentialModularSolver
+    from nexus.nexus_core.models.unit_operations import UnitOperation, CSTR
+    from nexus.nexus_core.properties.property_models import PropertyPackage, Component
+    from nexus.nexus_core.kinetics.kinetics import PowerLawReaction, ArrheniusRate
+    prop_pkg = PropertyPackage(components=[Component('Ethanol', 'C2H6O'), Component('Water', 'H2O')])
+    reaction = PowerLawReaction('r1', {'Ethanol': -1, 'Product': 1}, ArrheniusRate(A=50.0, Ea=2.5e4),
+                                {'Ethanol': 1})
+    reactor = CSTR(name='R-101', volume=10, prop_pkg=prop_pkg, reaction=reaction)
+    reactor.verbose = False
+    fs = Flowsheet(name='Reactor UQ')
+    for unit in [UnitOperation(name='Feed'), reactor, UnitOperation(name='Product')]:
+        fs.add_unit(unit)
+    fs.streams['feed'] = {'flow_rate': 0.1, 'temperature': 353, 'composition': {'Ethanol': 0.8, 'Water': 0.2}}
+    fs.connect('feed', 'Feed', 'R-101')
+    fs.connect('outlet', 'R-101', 'Product')
+    return fs, SequentialModularSolver(fs, verbose=False)
+
+def _example_outlet_ethanol(flowsheet):
+    return flowsheet.streams['outlet']['composition']['Ethanol']
+
 # Example Usage:
 if __name__ == '__main__':
-    # --- Mock objects for a self-contained example ---
-    class MockCSTR:
-        def __init__(self, name):
-            self.name = name
-            self.volume = 10 # m^3
-            self.inlet_conc = 0.8
-            self.outlet_conc = 0.2
-        def solve(self):
-            # A simple model where conversion depends on volume and inlet concentration
-            # conversion = k * tau = k * V / v_dot
-            # Let's say outlet_conc = inlet_conc * (1 - 0.05 * V)
-            self.outlet_conc = self.inlet_conc * (1 - 0.05 * self.volume)
-            self.outlet_conc = max(0, self.outlet_conc)
-
-    class MockSolver:
-        def solve(self):
-            for unit in self.flowsheet.unit_ops.values():
-                unit.solve()
-
-    class MockFlowsheet:
-        def __init__(self):
-            self.unit_ops = {'R-101': MockCSTR('R-101')}
-            self.solver = MockSolver()
-            self.solver.flowsheet = self # Link solver back to flowsheet
-
-    # --- Setup and run the UQ analysis ---
-    fs = MockFlowsheet()
-    mc_sim = MonteCarlo(fs, num_samples=500)
-
-    # 1. Define uncertain parameters
-    # Reactor volume is uncertain, normally distributed around 10 m^3
-    mc_sim.add_uncertain_parameter('R-101', 'volume', 'normal', {'loc': 10, 'scale': 0.5})
-    # Inlet concentration is also uncertain, uniformly distributed
-    mc_sim.add_uncertain_parameter('R-101', 'inlet_conc', 'uniform', {'low': 0.75, 'high': 0.85})
-
-    # 2. Define output responses to track
-    def get_outlet_conc(flowsheet):
-        return flowsheet.unit_ops['R-101'].outlet_conc
-    
-    mc_sim.add_output_response('FinalConcentration', get_outlet_conc)
-
-    # 3. Run the simulation and analyze results
-    results = mc_sim.run_simulation()
-    if not results.empty:
-        MonteCarlo.analyze_results(results)
+    import pandas as pd
+
+    def setup(**kwargs):
+        mc = MonteCarlo(flowsheet_factory=_example_reactor_flowsheet, num_samples=2000, seed=42, **kwargs)
+        # Reactor volume is uncertain, normally distributed around 10 m^3
+        mc.add_unit_parameter('R-101', 'volume', 'normal', {'loc': 10, 'scale': 1})
+        # Feed temperature is also uncertain, uniformly distributed
+        mc.add_stream_parameter('feed', 'temperature', 'uniform', {'low': 340, 'high': 360})
+        mc.add_output_response('OutletEthanol', _example_outlet_ethanol)
+        return mc
+
+    serial = setup()
+    serial_results = serial.run_simulation()
+    n_workers = max(2, min(4, os.cpu_count() or 1))
+    parallel = setup()
+    parallel_results = parallel.run_simulation(n_workers=n_workers)
+
+    print(f"\nSerial and {n_workers}-worker results identical: {serial_results.equals(parallel_results)}")
+    print(f"Failed samples: {parallel.failures if parallel.failures else 'none'}")
+    print(pd.concat([parallel.samples, parallel_results], axis=1).describe())
+
+    # Space-filling designs with early stopping: solves needed for a +/- 0.0005 mean outlet fraction
+    print("\n--- Early stopping on a 0.001-wide 95% confidence interval ---")
+    needed = {}
+    for sampler in ('random', 'lhs', 'sobol'):
+        mc = setup(sampler=sampler)
+        mc.num_samples = 20000
+        mc.run_simulation(ci_width=0.001, check_every=256)
+        needed[sampler] = mc.convergence[-1]['samples']
+    print("Samples needed: " + ', '.join(f"{sampler} {count}" for sampler, count in needed.items()))
+
+    # Streaming: running statistics only, raw samples spilled to disk in columnar chunks
+    import tempfile
+    from nexus.nexus_core.uq.results import SpilledResults
+    print("\n--- Streaming results to disk ---")
+    streamed = setup()
+    sink = streamed.run_simulation(sink=ResultSink(spill_dir=tempfile.mkdtemp(), chunk_rows=500))
+    print(sink.summary())
+    spilled = SpilledResults(sink.spill_dir)
+    print(f"Spilled {len(spilled)} samples in {len(spilled.manifest['rows'])} chunks; reopened mean "
+          f"{np.nanmean(spilled.column('OutletEthanol')):.6f}, in-memory mean {serial_results['OutletEthanol'].mean():.6f}")
+
+    # Checkpoint/resume: a run killed part-way continues from its last checkpoint
+    print("\n--- Checkpoint and resume ---")
+    checkpoint = os.path.join(tempfile.mkdtemp(), 'reactor_uq.ckpt')
+
+    def preempted_after(count):
+        calls = [0]
+        def response(flowsheet):
+            calls[0] += 1
+            if calls[0] > count:
+                raise KeyboardInterrupt  # Stands in for the job being preempted
+            return _example_outlet_ethanol(flowsheet)
+        return response
+
+    interrupted = setup()
+    interrupted.add_output_response('OutletEthanol', preempted_after(1100))
+    try:
+        interrupted.run_simulation(checkpoint=checkpoint, checkpoint_every=0)
+    except KeyboardInterrupt:
+        print("Run interrupted.")
+    resumed = setup()
+    resumed_results = resumed.run_simulation(checkpoint=checkpoint)
+    print(f"Resumed results identical to the uninterrupted run: {resumed_results.equals(serial_results)}")
@@ -0,0 +1,453 @@
+import json
+import os
+import numpy as np
+
+class RunningStats:
+    """Count, mean, variance, minimum and maximum of several columns, updated batch by batch.
+
+    Batches are folded in with the pairwise form of Welford's algorithm
+    (Chan et al.), so memory is O(columns) however many rows are added and
+    the result does not suffer the cancellation of sum-of-squares formulas.
+    NaN entries are ignored.
+    """
+    def __init__(self, n_columns):
+        self.count = np.zeros(n_columns)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.min = np.full(n_columns, np.inf)
+        self.max = np.full(n_columns, -np.inf)
+
+    def update(self, values):
+        """Adds a (k, n_columns) batch of rows."""
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            return
+        valid = ~np.isnan(values)
+        n_b = valid.sum(axis=0)
+        if not n_b.any():
+            return
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_b = np.where(n_b > 0, np.nansum(values, axis=0) / n_b, 0.0)
+            m2_b = np.nansum((values - mean_b) ** 2, axis=0)
+            n = self.count + n_b
+            delta = mean_b - self.mean
+            self.mean = np.where(n > 0, self.mean + delta * n_b / n, 0.0)
+            self.m2 = np.where(n > 0, self.m2 + m2_b + delta ** 2 * self.count * n_b / n, 0.0)
+        self.count = n
+        self.min = np.fmin(self.min, np.nanmin(np.where(valid, values, np.inf), axis=0))
+        self.max = np.fmax(self.max, np.nanmax(np.where(valid, values, -np.inf), axis=0))
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1); NaN for fewer than two values."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > 1, self.m2 / (self.count - 1), np.nan)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+class QuantileSketch:
+    """Streaming quantile estimates of one column (a merging t-digest).
+
+    The data are summarised by weighted centroids that are small near the
+    tails and larger in the middle (the arcsine scale function of the
+    t-digest), so extreme quantiles stay accurate while memory is bounded by
+    ``compression``. Incoming values are buffered and merged in vectorized
+    passes: after sorting, all centroids that start within the same unit of
+    the scale function are combined.
+    """
+    def __init__(self, compression=200, buffer_size=2000):
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+        self.min = np.inf
+        self.max = -np.inf
+        self._buffer = []
+        self._buffered = 0
+
+    def update(self, values):
+        """Adds values (NaN ignored)."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size:
+            self._buffer.append(values)
+            self._buffered += values.size
+            if self._buffered >= self.buffer_size:
+                self._compress()
+
+    def _compress(self, means=None, weights=None):
+        parts_m = [self.means] + self._buffer + ([means] if means is not None else [])
+        parts_w = [self.weights] + [np.ones(b.size) for b in self._buffer] + ([weights] if weights is not None else [])
+        self._buffer, self._buffered = [], 0
+        m = np.concatenate(parts_m)
+        if m.size == 0:
+            return
+        w = np.concatenate(parts_w)
+        order = np.argsort(m, kind='stable')
+        m, w = m[order], w[order]
+        self.min = min(self.min, m[0])
+        self.max = max(self.max, m[-1])
+        total = w.sum()
+        q_left = (np.cumsum(w) - w) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_left - 1)
+        groups = np.floor(k - k[0]).astype(int)
+        starts = np.r_[0, np.nonzero(np.diff(groups))[0] + 1]
+        self.weights = np.add.reduceat(w, starts)
+        self.means = np.add.reduceat(m * w, starts) / self.weights
+
+    def merge(self, other):
+        """Folds another sketch (e.g. from a worker process) into this one."""
+        other._compress()
+        if other.weights.size:
+            self._compress(other.means, other.weights)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+
+    def quantile(self, p):
+        """Estimated quantile(s) for probabilities p in [0, 1]; NaN before any data."""
+        if self._buffered:
+            self._compress()
+        if self.weights.size == 0:
+            return np.full(np.shape(p), np.nan)
+        centres = np.cumsum(self.weights) - self.weights / 2
+        total = self.weights.sum()
+        x = np.r_[0.0, centres, total]
+        y = np.r_[self.min, self.means, self.max]
+        return np.interp(np.asarray(p, dtype=float) * total, x, y)
+
+class StreamingHistogram:
+    """Fixed-size histogram of one column whose range grows as data arrive.
+
+    The range is set by the first batch; values outside it double the bin
+    width (merging neighbouring bins) until they fit, so memory stays at
+    ``bins`` counts and no bin edges need to be known in advance.
+    """
+    def __init__(self, bins=64):
+        if bins % 2:
+            raise ValueError("The number of histogram bins must be even.")
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.low = None
+        self.width = None
+
+    @property
+    def edges(self):
+        return self.low + self.width * np.arange(self.bins + 1) if self.low is not None else None
+
+    def update(self, values):
+        """Adds values (NaN ignored)."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        lo, hi = values.min(), values.max()
+        if self.low is None:
+            span = hi - lo
+            if span <= 0:
+                span = max(abs(lo) * 1e-6, 1e-12)
+            # A little headroom so the first batch's extremes do not force an immediate doubling
+            self.low = lo - 0.05 * span
+            self.width = 1.1 * span / self.bins
+        while lo < self.low or hi >= self.low + self.bins * self.width:
+            merged = self.counts.reshape(-1, 2).sum(axis=1)
+            self.counts = np.zeros(self.bins, dtype=np.int64)
+            if lo < self.low:
+                self.counts[self.bins // 2:] = merged
+                self.low -= self.bins * self.width
+            else:
+                self.counts[:self.bins // 2] = merged
+            self.width *= 2
+        index = np.minimum(((values - self.low) / self.width).astype(int), self.bins - 1)
+        self.counts += np.bincount(index, minlength=self.bins)
+
+class SpilledResults:
+    """Monte Carlo samples spilled to disk by a ResultSink, opened lazily.
+
+    Every column is stored as a sequence of ``.npy`` parts in its own
+    directory; parts are memory-mapped only when a column is read, so a
+    single response of a large study can be analysed without loading the rest.
+    """
+    def __init__(self, path):
+        """
+        Args:
+            path (str): The sink's spill directory.
+        """
+        self.path = path
+        with open(os.path.join(path, 'manifest.json')) as f:
+            self.manifest = json.load(f)
+        self.columns = self.manifest['columns']
+
+    def __len__(self):
+        return sum(self.manifest['rows'])
+
+    def _part(self, column, i):
+        return np.load(os.path.join(self.path, _column_dir(column), f'part-{i:05d}.npy'), mmap_mode='r')
+
+    def chunks(self, columns=None):
+        """Yields one dict {column: memory-mapped array} per spilled chunk."""
+        columns = self.columns if columns is None else columns
+        for i in range(len(self.manifest['rows'])):
+            yield {column: self._part(column, i) for column in columns}
+
+    def column(self, name):
+        """All values of one column (in spill order; see the 'sample' column for sample indices)."""
+        if name not in self.columns:
+            raise ValueError(f"Unknown column '{name}'. Available: {self.columns}.")
+        parts = [self._part(name, i) for i in range(len(self.manifest['rows']))]
+        return np.concatenate(parts) if parts else np.zeros(0)
+
+    def dataframe(self, columns=None):
+        """The spilled samples as a DataFrame indexed and sorted by sample number."""
+        import pandas as pd
+        columns = self.columns if columns is None else list(columns)
+        data = {name: self.column(name) for name in dict.fromkeys(['sample'] + columns)}
+        index = data.pop('sample')
+        return pd.DataFrame(data, index=index).sort_index()
+
+def _column_dir(column):
+    return column.replace(os.sep, '_')
+
+class ResultSink:
+    """Streaming destination of Monte Carlo results.
+
+    Keeps, per response, running moments (``RunningStats``), quantile
+    sketches and histograms in memory independent of the number of samples,
+    plus per-replicate moments for the confidence intervals of replicated
+    designs. Raw samples (sample index, parameter values and responses) are
+    optionally spilled to ``spill_dir`` in columnar chunks of ``chunk_rows``
+    rows (see ``SpilledResults``) and/or kept in memory. Failed samples
+    (NaN responses) are stored but do not enter the statistics.
+    """
+    def __init__(self, spill_dir=None, chunk_rows=65536, keep_in_memory=False, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95),
+                 bins=64, compression=200):
+        """
+        Args:
+            spill_dir (str): Directory for the raw samples; None does not spill.
+            chunk_rows (int): Rows per spilled chunk.
+            keep_in_memory (bool): Also keep the raw samples in memory (for ``dataframe``).
+            quantiles (tuple): Probabilities reported by ``summary``.
+            bins (int): Histogram bins per response.
+            compression (int): Quantile sketch compression (more centroids = more accurate).
+        """
+        self.spill_dir = spill_dir
+        self.chunk_rows = chunk_rows
+        self.keep_in_memory = keep_in_memory
+        self.quantiles = tuple(quantiles)
+        self.bins = bins
+        self.compression = compression
+        self.columns = None
+
+    def open(self, parameters, responses, replicates=None):
+        """
+        Starts a run; called by MonteCarlo.run_simulation.
+
+        Args:
+            parameters (list): Parameter names.
+            responses (list): Response names.
+            replicates (int): Number of interleaved design replicates (sample i belongs to
+                replicate i % replicates), or None for independent samples.
+        """
+        self.parameters = list(parameters)
+        self.responses = list(responses)
+        self.columns = ['sample'] + self.parameters + self.responses
+        self.replicates = replicates
+        n = len(self.responses)
+        self.stats = RunningStats(n)
+        self.replicate_stats = [RunningStats(n) for _ in range(replicates)] if replicates else None
+        self.sketches = [QuantileSketch(self.compression) for _ in range(n)]
+        self.histograms = [StreamingHistogram(self.bins) for _ in range(n)]
+        self._memory = []
+        self._pending = []
+        self._pending_rows = 0
+        self._rows = []
+        if self.spill_dir is not None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            self._clear_spill()
+            for column in self.columns:
+                os.makedirs(os.path.join(self.spill_dir, _column_dir(column)), exist_ok=True)
+            self._write_manifest()
+
+    def _clear_spill(self):
+        """Removes the parts of a previous run in the spill directory."""
+        manifest = os.path.join(self.spill_dir, 'manifest.json')
+        if not os.path.exists(manifest):
+            return
+        with open(manifest) as f:
+            previous = json.load(f)
+        for column in previous['columns']:
+            for i in range(len(previous['rows'])):
+                part = os.path.join(self.spill_dir, _column_dir(column), f'part-{i:05d}.npy')
+                if os.path.exists(part):
+                    os.remove(part)
+        os.remove(manifest)
+
+    def _write_manifest(self):
+        # Written to a temporary file and renamed, so a reader never sees a partial manifest
+        path = os.path.join(self.spill_dir, 'manifest.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump({'columns': self.columns, 'rows': self._rows}, f)
+        os.replace(path + '.tmp', path)
+
+    def add(self, indices, parameter_values, responses):
+        """
+        Adds a batch of samples.
+
+        Args:
+            indices (np.ndarray): (k,) sample indices.
+            parameter_values (np.ndarray): (k, nparam) parameter values.
+            responses (np.ndarray): (k, nresp) responses, NaN rows for failed samples.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        responses = np.asarray(responses, dtype=float)
+        self.stats.update(responses)
+        if self.replicate_stats is not None:
+            group = indices % self.replicates
+            for r, stats in enumerate(self.replicate_stats):
+                stats.update(responses[group == r])
+        for j in range(len(self.responses)):
+            self.sketches[j].update(responses[:, j])
+            self.histograms[j].update(responses[:, j])
+        if self.keep_in_memory or self.spill_dir is not None:
+            block = (indices, np.asarray(parameter_values, dtype=float), responses)
+            if self.keep_in_memory:
+                self._memory.append(block)
+            if self.spill_dir is not None:
+                self._pending.append(block)
+                self._pending_rows += len(indices)
+                if self._pending_rows >= self.chunk_rows:
+                    self._spill()
+
+    def _spill(self):
+        if not self._pending_rows:
+            return
+        indices = np.concatenate([b[0] for b in self._pending])
+        values = np.concatenate([b[1] for b in self._pending])
+        responses = np.concatenate([b[2] for b in self._pending])
+        part = len(self._rows)
+        arrays = [indices] + [values[:, j] for j in range(values.shape[1])] + \
+                 [responses[:, j] for j in range(responses.shape[1])]
+        for column, array in zip(self.columns, arrays):
+            np.save(os.path.join(self.spill_dir, _column_dir(column), f'part-{part:05d}.npy'), array)
+        self._rows.append(int(len(indices)))
+        self._pending, self._pending_rows = [], 0
+        self._write_manifest()
+
+    def close(self):
+        """Writes any buffered samples to disk."""
+        if self.spill_dir is not None:
+            self._spill()
+
+    # Run state saved in Monte Carlo checkpoints (the configuration is given again on resume)
+    _STATE = ('parameters', 'responses', 'columns', 'replicates', 'stats', 'replicate_stats', 'sketches',
+              'histograms', '_memory', '_pending', '_pending_rows', '_rows')
+
+    def state(self):
+        """The accumulated results as a picklable dict, for checkpoints."""
+        state = {name: getattr(self, name) for name in self._STATE}
+        state.update(spill_dir=self.spill_dir, keep_in_memory=self.keep_in_memory)
+        return state
+
+    def restore(self, state):
+        """
+        Continues from a checkpointed ``state()`` instead of ``open``-ing a new run.
+
+        Spilled parts already on disk are kept; parts written after the
+        checkpoint are overwritten as the run continues.
+        """
+        for option in ('spill_dir', 'keep_in_memory'):
+            if state[option] != getattr(self, option):
+                raise ValueError(f"The checkpoint was written by a sink with {option}={state[option]!r}; "
+                                 f"resume with the same setting.")
+        for name in self._STATE:
+            setattr(self, name, state[name])
+        if self.spill_dir is not None:
+            for column in self.columns:
+                os.makedirs(os.path.join(self.spill_dir, _column_dir(column)), exist_ok=True)
+            self._write_manifest()
+
+    def confidence(self, confidence=0.95):
+        """
+        Means of the responses and half-widths of their confidence intervals.
+
+        Uses the spread of the replicate means for replicated designs and the
+        sample variance (Student t) otherwise, as sampling.mean_confidence.
+
+        Returns:
+            tuple: (mean, half_width) arrays over the responses.
+        """
+        from scipy import stats
+        q = 0.5 + confidence / 2.0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if self.replicate_stats is None:
+                count = self.stats.count
+                mean = self.stats.mean
+                half = stats.t.ppf(q, np.maximum(count - 1, 1)) * self.stats.std / np.sqrt(count)
+            else:
+                means = np.array([np.where(s.count > 0, s.mean, np.nan) for s in self.replicate_stats])
+                mean = np.nanmean(means, axis=0)
+                count = np.sum(~np.isnan(means), axis=0)
+                half = stats.t.ppf(q, np.maximum(count - 1, 1)) * np.nanstd(means, axis=0, ddof=1) / np.sqrt(count)
+        return mean, np.where(count > 1, half, np.inf)
+
+    def summary(self):
+        """A describe()-style DataFrame: count, mean, std, min, the quantiles and max of each response."""
+        import pandas as pd
+        rows = {'count': self.stats.count, 'mean': self.stats.mean, 'std': self.stats.std,
+                'min': np.where(self.stats.count > 0, self.stats.min, np.nan)}
+        estimates = np.array([sketch.quantile(self.quantiles) for sketch in self.sketches]).reshape(
+            len(self.responses), len(self.quantiles))
+        for k, p in enumerate(self.quantiles):
+            rows[f'{p:.0%}'] = estimates[:, k]
+        rows['max'] = np.where(self.stats.count > 0, self.stats.max, np.nan)
+        return pd.DataFrame(rows, index=self.responses).T
+
+    def histogram(self, name):
+        """(counts, edges) of one response's histogram."""
+        h = self.histograms[self.responses.index(name)]
+        return h.counts.copy(), h.edges
+
+    def dataframe(self):
+        """All samples (parameters and responses) as a DataFrame indexed by sample number.
+
+        Needs ``keep_in_memory`` or a spill directory.
+        """
+        import pandas as pd
+        if self.keep_in_memory:
+            if not self._memory:
+                return pd.DataFrame(columns=self.columns[1:])
+            index = np.concatenate([b[0] for b in self._memory])
+            data = np.hstack([np.concatenate([b[1] for b in self._memory]),
+                              np.concatenate([b[2] for b in self._memory])])
+            return pd.DataFrame(data, index=index, columns=self.columns[1:]).sort_index()
+        if self.spill_dir is not None:
+            self.close()
+            return SpilledResults(self.spill_dir).dataframe()
+        raise RuntimeError("The sink keeps no raw samples; use keep_in_memory or a spill directory.")
+
+# Example Usage:
+if __name__ == '__main__':
+    import tempfile
+    import time
+
+    # One million samples of two responses, streamed in batches of 10,000
+    rng = np.random.default_rng(0)
+    sink = ResultSink(spill_dir=tempfile.mkdtemp(), chunk_rows=250000)
+    sink.open(['x'], ['lognormal_cost', 'normal_purity'])
+    start = time.perf_counter()
+    for batch in range(100):
+        x = rng.uniform(size=(10000, 1))
+        y = np.column_stack([rng.lognormal(0.0, 0.5, 10000), rng.normal(0.95, 0.01, 10000)])
+        sink.add(np.arange(batch * 10000, (batch + 1) * 10000), x, y)
+    sink.close()
+    print(f"Streamed 1,000,000 samples in {time.perf_counter() - start:.2f} s")
+    print(sink.summary())
+
+    exact = np.exp(0.5 * 1.6448536) # 95th percentile of lognormal(0, 0.5)
+    print(f"95% quantile of the cost: sketch {sink.summary().loc['95%', 'lognormal_cost']:.4f}, exact {exact:.4f}")
+
+    spilled = SpilledResults(sink.spill_dir)
+    purity = spilled.column('normal_purity')
+    print(f"Reopened {len(spilled)} spilled rows in {len(spilled.manifest['rows'])} chunks; "
+          f"purity mean from disk {purity.mean():.5f}")
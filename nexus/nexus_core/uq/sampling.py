@@ -0,0 +1,168 @@
+import numpy as np
+
+SAMPLERS = ('random', 'lhs', 'sobol', 'halton')
+
+# numpy.random.Generator distributions (with their keyword arguments and defaults) as scipy.stats
+# distributions, whose inverse CDFs map uniform design points to parameter values
+_DISTRIBUTIONS = {
+    'normal': lambda st, loc=0.0, scale=1.0: st.norm(loc=loc, scale=scale),
+    'standard_normal': lambda st: st.norm(),
+    'uniform': lambda st, low=0.0, high=1.0: st.uniform(loc=low, scale=high - low),
+    'lognormal': lambda st, mean=0.0, sigma=1.0: st.lognorm(s=sigma, scale=np.exp(mean)),
+    'triangular': lambda st, left, mode, right: st.triang(c=(mode - left) / (right - left), loc=left,
+                                                          scale=right - left),
+    'exponential': lambda st, scale=1.0: st.expon(scale=scale),
+    'gamma': lambda st, shape, scale=1.0: st.gamma(a=shape, scale=scale),
+    'beta': lambda st, a, b: st.beta(a, b),
+    'weibull': lambda st, a: st.weibull_min(c=a),
+}
+
+def supports_inverse_cdf(distribution):
+    """Whether a distribution name can be used with the space-filling samplers."""
+    return distribution in _DISTRIBUTIONS
+
+def inverse_cdf(distribution, params, u):
+    """
+    Maps uniform points through the inverse CDF of a distribution.
+
+    Args:
+        distribution (str): numpy.random.Generator distribution name (e.g. 'normal', 'triangular').
+        params (dict): Its keyword arguments, as for the Generator method.
+        u (np.ndarray): Points in [0, 1).
+
+    Returns:
+        np.ndarray: Distribution values of the same shape.
+    """
+    from scipy import stats
+    if distribution not in _DISTRIBUTIONS:
+        raise ValueError(f"Distribution '{distribution}' has no inverse CDF here; "
+                         f"available: {sorted(_DISTRIBUTIONS)}.")
+    # Keep the points off 0 and 1, where unbounded distributions map to infinity
+    u = np.clip(u, 1e-12, 1.0 - 1e-12)
+    return _DISTRIBUTIONS[distribution](stats, **params).ppf(u)
+
+def unit_design(sampler, n, d, seed, replicates=8, block=None):
+    """
+    An (n, d) design on the unit hypercube.
+
+    The design consists of ``replicates`` independently randomised sequences
+    (separate scramblings or Latin hypercubes), interleaved so that row i
+    belongs to replicate ``i % replicates``. Any prefix of the design then
+    holds about equally long leading parts of every replicate, and the spread
+    of the replicate means gives an honest error estimate (see
+    ``mean_confidence``), which the correlated points of one QMC sequence
+    cannot.
+
+    A prefix of one Latin hypercube is not stratified, so for runs that may
+    stop early, ``block`` makes the 'lhs' design a sequence of complete
+    hypercubes of ``block / replicates`` points per replicate.
+
+    Args:
+        sampler (str): 'lhs', 'sobol' or 'halton'.
+        n (int): Number of points.
+        d (int): Number of dimensions.
+        seed (int): Seed of the randomisation.
+        replicates (int): Number of independent replicates.
+        block (int): Rows per group of complete Latin hypercubes (default: one hypercube per replicate).
+
+    Returns:
+        np.ndarray: (n, d) design.
+    """
+    from scipy.stats import qmc
+    if sampler not in ('lhs', 'sobol', 'halton'):
+        raise ValueError(f"Unknown space-filling sampler '{sampler}'; use 'lhs', 'sobol' or 'halton'.")
+    per_replicate = -(-n // replicates)
+    design = np.empty((per_replicate * replicates, d))
+    for r in range(replicates):
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(r,)))
+        if sampler == 'lhs':
+            size = per_replicate if block is None else max(1, block // replicates)
+            points = np.vstack([qmc.LatinHypercube(d, seed=np.random.default_rng(
+                                    np.random.SeedSequence(seed, spawn_key=(r, k)))).random(size)
+                                for k in range(-(-per_replicate // size))])[:per_replicate]
+        elif sampler == 'sobol':
+            # Sobol points are balanced in blocks of 2^m; draw the next power of two and keep the prefix
+            m = max(0, int(np.ceil(np.log2(per_replicate))))
+            points = qmc.Sobol(d, scramble=True, seed=rng).random_base2(m)[:per_replicate]
+        else:
+            points = qmc.Halton(d, scramble=True, seed=rng).random(per_replicate)
+        design[r::replicates] = points
+    return design[:n]
+
+def design_matrix(sampler, distributions, n, seed, replicates=8, block=None):
+    """
+    Parameter values of n samples from a space-filling design.
+
+    Args:
+        sampler (str): 'lhs', 'sobol' or 'halton'.
+        distributions (list): (distribution name, params dict) of each parameter.
+        n (int): Number of samples.
+        seed (int): Seed of the randomisation.
+        replicates (int): Number of independent replicates (see ``unit_design``).
+        block (int): Rows per group of complete Latin hypercubes (see ``unit_design``).
+
+    Returns:
+        np.ndarray: (n, nparam) parameter values.
+    """
+    u = unit_design(sampler, n, max(1, len(distributions)), seed, replicates, block)
+    values = np.empty((n, len(distributions)))
+    for j, (distribution, params) in enumerate(distributions):
+        values[:, j] = inverse_cdf(distribution, params, u[:, j])
+    return values
+
+def mean_confidence(outputs, confidence=0.95, replicates=None):
+    """
+    Means of the response columns and the half-widths of their confidence intervals.
+
+    Without replicates the rows are treated as independent draws (conservative
+    for a Latin hypercube); with replicates, row i belongs to replicate
+    ``i % replicates`` and the interval comes from the spread of the
+    replicate means (Student t with replicates - 1 degrees of freedom).
+    Failed samples (NaN rows) are ignored.
+
+    Args:
+        outputs (np.ndarray): (n, nresp) responses.
+        confidence (float): Confidence level of the intervals.
+        replicates (int): Number of interleaved replicates, or None.
+
+    Returns:
+        tuple: (mean, half_width) arrays of shape (nresp,).
+    """
+    from scipy import stats
+    outputs = np.asarray(outputs, dtype=float)
+    q = 0.5 + confidence / 2.0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if replicates is None or replicates < 2:
+            count = np.sum(~np.isnan(outputs), axis=0)
+            mean = np.nanmean(outputs, axis=0)
+            std = np.nanstd(outputs, axis=0, ddof=1)
+            half = stats.t.ppf(q, np.maximum(count - 1, 1)) * std / np.sqrt(count)
+        else:
+            groups = [outputs[r::replicates] for r in range(replicates)]
+            means = np.array([np.nanmean(g, axis=0) if len(g) else np.full(outputs.shape[1], np.nan)
+                              for g in groups])
+            mean = np.nanmean(means, axis=0)
+            count = np.sum(~np.isnan(means), axis=0)
+            half = stats.t.ppf(q, np.maximum(count - 1, 1)) * np.nanstd(means, axis=0, ddof=1) / np.sqrt(count)
+    return mean, np.where(count > 1, half, np.inf)
+
+# Example Usage:
+if __name__ == '__main__':
+    # Error of the estimated mean of a smooth function of two uncertain inputs
+    def cost(x):
+        return np.exp(0.1 * x[:, 0]) * (1.0 + 0.5 * np.sin(x[:, 1]))
+
+    distributions = [('normal', {'loc': 1.0, 'scale': 0.3}), ('uniform', {'low': 0.0, 'high': 2.0})]
+    reference = cost(design_matrix('sobol', distributions, 2 ** 20, seed=0, replicates=1)).mean()
+    print(f"Reference mean: {reference:.8f}")
+    for n in (256, 4096):
+        print(f"n = {n}:")
+        for sampler in ('random', 'lhs', 'sobol', 'halton'):
+            if sampler == 'random':
+                rng = np.random.default_rng(1)
+                x = np.column_stack([rng.normal(1.0, 0.3, n), rng.uniform(0.0, 2.0, n)])
+                mean, half = mean_confidence(cost(x)[:, None])
+            else:
+                x = design_matrix(sampler, distributions, n, seed=1)
+                mean, half = mean_confidence(cost(x)[:, None], replicates=8)
+            print(f"  {sampler:7s} error {abs(mean[0] - reference):.1e}, 95% CI half-width {half[0]:.1e}")
@@ -4,6 +4,7 @@ setup(
     name='nexus',
     version='0.1.0',
     packages=find_packages(),
+    package_data={'nexus_core.properties': ['data/*.npy']},
     description='A digital twin simulation for multi-scale chemical process optimization.',
     author='Cascade AI',
     install_requires=[
@@ -11,6 +11,7 @@ class Capex:
         'HeatExchanger': [25000, 50, 0.7], # Base cost for 50 m^2 area
         'Pump': [10000, 100, 0.8], # Base cost for 100 kW pump
         'Separator': [15000, 0.1, 0.6], # Base cost for 0.1 m^3/s flow rate
+        'Flash': [15000, 0.1, 0.6], # Base cost for 0.1 m^3/s flow rate
     }
 
     def __init__(self, flowsheet, year=2023):
@@ -34,12 +35,15 @@ class Capex:
         # Determine the capacity attribute based on unit type
         if unit_type == 'CSTR':
             capacity = unit_op.volume
-        elif unit_type == 'Separator':
+        elif unit_type in ('Separator', 'Flash'):
             # Use inlet flow rate as capacity basis (m^3/s)
             if unit_op.inlets:
                 capacity = unit_op.inlets[0].get('flow_rate', ref_capacity)
             else:
                 capacity = ref_capacity # Fallback if no inlet connected
+        elif unit_type == 'DistillationColumn':
+            # Diameter (m), given or sized on the vapour load of the last solve
+            capacity = unit_op.column_diameter() or ref_capacity
         # Add other unit type capacity logic here (e.g., area for heat exchanger)
         else:
             print(f"Warning: Capacity attribute for '{unit_type}' not defined. Using ref_capacity.")
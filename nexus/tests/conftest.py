@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The code base imports itself as the ``nexus`` package; make the directory
+# holding it importable when pytest is run from inside nexus/
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from nexus.nexus_core.solver.flowsheet import Flowsheet, SequentialModularSolver
+from nexus.nexus_core.models.unit_operations import UnitOperation, CSTR, Flash, Splitter
+from nexus.nexus_core.properties.property_models import PropertyPackage, Component
+from nexus.nexus_core.kinetics.kinetics import PowerLawReaction, ArrheniusRate
+
+class Heater(UnitOperation):
+    """A unit without a vectorized model: solve_batch() falls back to one solve() per row."""
+    def __init__(self, name, duty):
+        super().__init__(name)
+        self.duty = duty
+
+    def solve(self):
+        self.outlets[0].update(self.inlets[0])
+        self.outlets[0]['temperature'] = self.inlets[0]['temperature'] + self.duty
+
+def _process():
+    prop_pkg = PropertyPackage(components=[Component('Methanol', 'CH4O'), Component('Water', 'H2O')])
+    reaction = PowerLawReaction('r1', {'Methanol': -1, 'Water': 1}, ArrheniusRate(A=0.02, Ea=2e4, T_ref=330.0),
+                                {'Methanol': 1})
+    fs = Flowsheet(name='Batch')
+    for unit in [UnitOperation(name='Feed'), CSTR(name='R', volume=2.0, prop_pkg=prop_pkg, reaction=reaction),
+                 Heater(name='H', duty=15.0), Flash(name='F', prop_pkg=prop_pkg, pressure=101325.0),
+                 Splitter(name='S', split_fractions=[0.3, 0.7]),
+                 UnitOperation(name='V'), UnitOperation(name='P1'), UnitOperation(name='P2')]:
+        unit.verbose = False
+        fs.add_unit(unit)
+    fs.streams['feed'] = {'flow_rate': 0.1, 'temperature': 330.0, 'pressure': 101325.0,
+                          'composition': {'Methanol': 0.6, 'Water': 0.4}}
+    fs.connect('feed', 'Feed', 'R')
+    fs.connect('effluent', 'R', 'H')
+    fs.connect('heated', 'H', 'F')
+    fs.connect('vapour', 'F', 'V')
+    fs.connect('liquid', 'F', 'S')
+    fs.connect('p1', 'S', 'P1')
+    fs.connect('p2', 'S', 'P2')
+    return fs
+
+def test_batch_solve_matches_one_scalar_solve_per_scenario():
+    rng = np.random.default_rng(1)
+    flows = rng.uniform(0.05, 0.2, 8)
+    temperatures = rng.uniform(325.0, 345.0, 8)
+    volumes = rng.uniform(1.0, 5.0, 8)
+    fs = _process()
+    results = SequentialModularSolver(fs, verbose=False).solve_batch(
+        feeds={'feed': {'flow_rate': flows, 'temperature': temperatures}}, parameters={'R': {'volume': volumes}})
+    # The flowsheet's own streams are left alone
+    assert fs.streams['p1'].get('flow_rate') is None
+
+    for i in range(8):
+        scalar = _process()
+        scalar.streams['feed'].update(flow_rate=flows[i], temperature=temperatures[i])
+        scalar.unit_ops['R'].volume = volumes[i]
+        SequentialModularSolver(scalar, verbose=False).solve()
+        for name in ['vapour', 'p1', 'p2']:
+            row = results[name].row(i)
+            expected = scalar.streams[name]
+            assert row['flow_rate'] == pytest.approx(expected['flow_rate'], rel=1e-9, abs=1e-14)
+            assert row['temperature'] == pytest.approx(expected['temperature'], rel=1e-12)
+            for comp in expected['composition']:
+                assert row['composition'][comp] == pytest.approx(expected['composition'][comp], rel=1e-8, abs=1e-12)
+
+def test_per_scenario_split_fractions():
+    fs = _process()
+    fractions = np.array([[0.1, 0.9], [0.5, 0.5]])
+    results = SequentialModularSolver(fs, verbose=False).solve_batch(parameters={'S': {'split_fractions': fractions}},
+                                                                     size=2)
+    total = results['p1'].flow_rate + results['p2'].flow_rate
+    np.testing.assert_allclose(results['p1'].flow_rate / total, fractions[:, 0])
+
+def test_has_batch_solve_detects_scalar_only_units():
+    assert not Heater(name='H', duty=1.0).has_batch_solve()
+    assert Splitter(name='S', split_fractions=[1.0]).has_batch_solve()
@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from nexus.nexus_core.properties import component_db
+from nexus.nexus_core.properties.backends import load_coolprop
+from nexus.nexus_core.properties.property_models import Component
+from nexus.benchmarks.import_time import measure
+
+# The directory holding the nexus package, for fresh interpreters (as in conftest.py)
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.mark.parametrize('fluid', ['Water', 'Ethanol', 'Methane', 'n-Butane', 'CarbonDioxide'])
+def test_database_matches_coolprop(fluid):
+    CP = load_coolprop()
+    state = CP.AbstractState('HEOS', fluid)
+    record = component_db.lookup(fluid)
+    assert record['mw'] == pytest.approx(state.molar_mass() * 1000, rel=1e-12)
+    assert record['tc'] == pytest.approx(state.T_critical(), rel=1e-12)
+    assert record['pc'] == pytest.approx(state.p_critical(), rel=1e-12)
+    assert record['omega'] == pytest.approx(state.acentric_factor(), rel=1e-12)
+    temperatures = np.linspace(max(record['cp_tmin'], 300.0), 900.0, 7)
+    exact = []
+    for T in temperatures:
+        state.update(CP.DmolarT_INPUTS, 1e-6, T)
+        exact.append(state.cp0molar())
+    # A quartic fit over the whole cp_tmin..cp_tmax range: within one percent
+    np.testing.assert_allclose(component_db.ideal_gas_cp(record['cp'], temperatures), exact, rtol=1e-2)
+
+def test_aliases_and_unknown_names():
+    assert component_db.lookup('Butane')['tc'] == component_db.lookup('n-Butane')['tc']
+    assert component_db.lookup('NotAFluid') is None
+    assert 'Water' in component_db.names()
+
+def test_components_do_not_import_coolprop():
+    # A fresh interpreter, since other tests import CoolProp into this one
+    probe = """
+import json, sys
+from nexus.nexus_core.properties.property_models import Component
+water = Component('Water', 'H2O')
+product = Component('Product', 'Prod', mw=100)
+pseudo = Component('Lignin', 'C10H12O3', mw=180.0, tc=900.0, pc=3e6, omega=0.8)
+print(json.dumps({'mw': water.mw, 'tc': water.tc, 'pseudo_tc': pseudo.tc, 'coolprop': 'CoolProp' in sys.modules}))
+"""
+    output = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, check=True, cwd=ROOT)
+    result = json.loads(output.stdout.strip().splitlines()[-1])
+    assert not result['coolprop']
+    assert result['mw'] == pytest.approx(component_db.lookup('Water')['mw'])
+    assert result['tc'] == pytest.approx(component_db.lookup('Water')['tc'])
+    assert result['pseudo_tc'] == 900.0
+
+def test_missing_constants_are_looked_up_on_first_read():
+    component = Component('Product', 'Prod', mw=100)
+    assert not component._coolprop_checked
+    # Not a CoolProp fluid either: the constants stay None, and CoolProp is asked only once
+    assert component.tc is None
+    assert component._coolprop_checked
+    assert component.pc is None and component.omega is None
+    with pytest.raises(ValueError):
+        Component('Product', 'Prod')
+
+def test_importing_the_package_defers_heavy_libraries(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    assert measure(repeats=1)['loaded'] == []
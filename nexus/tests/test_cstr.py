@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from scipy.optimize import fsolve
+from nexus.nexus_core.models.unit_operations import CSTR
+from nexus.nexus_core.models.streams import Stream
+from nexus.nexus_core.kinetics.kinetics import PowerLawReaction, ConstantRate
+
+def _reactor(reactions, volume=2.0):
+    reactor = CSTR(name='R', volume=volume, prop_pkg=None, reactions=reactions)
+    reactor.verbose = False
+    reactor.inlets = [Stream.from_dict({'flow_rate': 0.5, 'temperature': 330.0,
+                                        'composition': {'A': 0.9, 'W': 0.1}})]
+    reactor.outlets = [Stream()]
+    return reactor
+
+def test_series_reactions_match_the_analytic_solution():
+    k1, k2 = 0.3, 0.1
+    reactor = _reactor([PowerLawReaction('r1', {'A': -1, 'B': 1}, ConstantRate(k1), {'A': 1}),
+                        PowerLawReaction('r2', {'B': -1, 'C': 1}, ConstantRate(k2), {'B': 1})])
+    reactor.solve()
+    tau = 2.0 / 0.5
+    c_a = 0.9 / (1 + k1 * tau)
+    c_b = k1 * tau * c_a / (1 + k2 * tau)
+    composition = reactor.outlets[0]['composition']
+    assert reactor.report['converged']
+    assert composition['A'] == pytest.approx(c_a, rel=1e-9)
+    assert composition['B'] == pytest.approx(c_b, rel=1e-9)
+    assert composition['C'] == pytest.approx(0.9 - c_a - c_b, rel=1e-9)
+    assert reactor.outlets[0]['flow_rate'] == pytest.approx(0.5)
+
+def test_nonlinear_kinetics_match_a_general_root_finder():
+    # 2 A -> B, second order: the moles (and so the outlet flow) change
+    reactor = _reactor([PowerLawReaction('r1', {'A': -2, 'B': 1}, ConstantRate(0.8), {'A': 2})])
+    reactor.solve()
+    tau = 2.0 / 0.5
+    c_in = np.array([0.9, 0.1, 0.0])  # A, W, B
+
+    def balance(c):
+        rate = 0.8 * max(c[0], 0.0) ** 2
+        return c_in - c + tau * np.array([-2.0, 0.0, 1.0]) * rate
+
+    c = fsolve(balance, c_in, xtol=1e-13)
+    outlet = reactor.outlets[0]
+    assert outlet['flow_rate'] == pytest.approx(0.5 * c.sum(), rel=1e-9)
+    for name, value in zip(['A', 'W', 'B'], c / c.sum()):
+        assert outlet['composition'][name] == pytest.approx(value, rel=1e-8)
+
+def test_warm_start_from_the_previous_outlet():
+    reactor = _reactor([PowerLawReaction('r1', {'A': -2, 'B': 1}, ConstantRate(0.8), {'A': 2})])
+    reactor.solve()
+    cold_iterations = reactor.report['iterations']
+    reactor.solve()
+    assert reactor.report['warm_start']
+    assert reactor.report['iterations'] < cold_iterations
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from nexus.nexus_core.properties.cubic_eos import CubicEOSPackage, solve_cubic, R_GAS
+from nexus.nexus_core.properties.backends import load_coolprop
+from nexus.nexus_core.properties.property_models import Component
+
+NAMES = ['Methane', 'Ethane', 'Propane']
+
+def _package(eos):
+    return CubicEOSPackage([Component(name, name) for name in NAMES], eos=eos)
+
+def _coolprop_state(eos, composition, temperature, pressure, phase):
+    CP = load_coolprop()
+    state = CP.AbstractState(eos, '&'.join(NAMES))
+    for i in range(len(NAMES)):
+        for j in range(i + 1, len(NAMES)):
+            state.set_binary_interaction_double(i, j, 'kij', 0.0)
+    state.set_mole_fractions(list(composition))
+    state.specify_phase(CP.iphase_gas if phase == 'vapour' else CP.iphase_liquid)
+    state.update(CP.PT_INPUTS, pressure, temperature)
+    return state
+
+def test_cardano_roots_match_numpy():
+    rng = np.random.default_rng(0)
+    roots = np.sort(rng.uniform(-2.0, 3.0, (200, 3)), axis=1)
+    # Monic cubics with the given real roots, plus ones with a single real root
+    c2 = -roots.sum(axis=1)
+    c1 = roots[:, 0] * roots[:, 1] + roots[:, 0] * roots[:, 2] + roots[:, 1] * roots[:, 2]
+    c0 = -roots.prod(axis=1)
+    z_min, z_max = solve_cubic(c2, c1, c0)
+    np.testing.assert_allclose(z_min, roots[:, 0], atol=1e-7)
+    np.testing.assert_allclose(z_max, roots[:, 2], atol=1e-7)
+    z_min, z_max = solve_cubic(np.zeros(3), np.ones(3), np.array([-2.0, 0.0, 10.0]))
+    for k, c0 in enumerate([-2.0, 0.0, 10.0]):
+        real = np.roots([1.0, 0.0, 1.0, c0])
+        real = real[np.abs(real.imag) < 1e-9].real
+        assert z_min[k] == z_max[k] == pytest.approx(real[0], abs=1e-12)
+
+@pytest.mark.parametrize('eos', ['PR', 'SRK'])
+@pytest.mark.parametrize('composition, temperature, pressure, phase', [
+    ([0.85, 0.10, 0.05], 250.0, 5e6, 'vapour'),
+    ([0.05, 0.15, 0.80], 250.0, 3e6, 'liquid'),
+    ([0.0, 0.0, 1.0], 300.0, 3e6, 'liquid'),
+])
+def test_mixture_properties_match_coolprop(eos, composition, temperature, pressure, phase):
+    props = _package(eos).mixture_properties(temperature, pressure, composition, phase=phase)
+    state = _coolprop_state(eos, composition, temperature, pressure, phase)
+    assert props['Z'] == pytest.approx(state.compressibility_factor(), rel=1e-5)
+    assert props['density'] == pytest.approx(state.rhomass(), rel=1e-4)
+    assert props['enthalpy_departure'] == pytest.approx(state.hmolar_residual(), rel=1e-4, abs=1e-2)
+    for i, x in enumerate(composition):
+        if x > 0:
+            assert props['fugacity_coefficients'][i] == pytest.approx(state.fugacity_coefficient(i), rel=1e-4)
+
+@pytest.mark.parametrize('eos', ['PR', 'SRK'])
+def test_departures_are_thermodynamically_consistent(eos):
+    package = _package(eos)
+    rng = np.random.default_rng(1)
+    x = rng.dirichlet([5.0, 2.0, 1.0], size=50)
+    T = rng.uniform(200.0, 350.0, 50)
+    P = rng.uniform(1e5, 8e6, 50)
+    props = package.mixture_properties(T, P, x)
+    # G_dep = RT sum x_i ln(phi_i) = H_dep - T S_dep
+    g_dep = R_GAS * T * np.einsum('ij,ij->i', x, np.log(props['fugacity_coefficients']))
+    np.testing.assert_allclose(props['enthalpy_departure'] - T * props['entropy_departure'], g_dep,
+                               rtol=1e-8, atol=1e-6)
+
+def test_batch_matches_single_states():
+    package = _package('PR')
+    rng = np.random.default_rng(2)
+    x = rng.dirichlet([5.0, 2.0, 1.0], size=20)
+    T = rng.uniform(200.0, 350.0, 20)
+    P = rng.uniform(1e5, 8e6, 20)
+    batch = package.mixture_properties(T, P, x)
+    for k in range(0, 20, 4):
+        single = package.mixture_properties(T[k], P[k], x[k])
+        assert single['Z'] == pytest.approx(batch['Z'][k], rel=1e-13)
+        assert single['is_liquid'] == batch['is_liquid'][k]
+        np.testing.assert_allclose(single['fugacity_coefficients'], batch['fugacity_coefficients'][k], rtol=1e-13)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from nexus.nexus_core.models.distillation import solve_block_tridiagonal, assemble_block_tridiagonal
+from nexus.nexus_core.models.unit_operations import DistillationColumn
+from nexus.nexus_core.properties.property_models import PropertyPackage, Component
+
+def test_block_thomas_matches_the_dense_solve():
+    rng = np.random.default_rng(0)
+    n, m = 15, 5
+    lower = rng.normal(size=(n, m, m))
+    upper = rng.normal(size=(n, m, m))
+    diag = rng.normal(size=(n, m, m)) + 4 * m * np.eye(m)
+    rhs = rng.normal(size=(n, m))
+    x = solve_block_tridiagonal(lower, diag, upper, rhs.copy())
+    dense = np.linalg.solve(assemble_block_tridiagonal(lower, diag, upper), rhs.ravel())
+    np.testing.assert_allclose(x.ravel(), dense, rtol=1e-10, atol=1e-12)
+
+def _column(**options):
+    # Wilson K-values from explicit critical constants (roughly propane, n-butane, n-pentane)
+    prop_pkg = PropertyPackage(components=[Component('A', 'A', mw=44, tc=369.8, pc=4.25e6, omega=0.152),
+                                           Component('B', 'B', mw=58, tc=425.1, pc=3.80e6, omega=0.200),
+                                           Component('C', 'C', mw=72, tc=469.7, pc=3.37e6, omega=0.252)])
+    column = DistillationColumn(name='C', prop_pkg=prop_pkg, n_stages=12, reflux_ratio=2.5,
+                                distillate_to_feed=0.4, **options)
+    column.verbose = False
+    column.inlets = [{'flow_rate': 10.0, 'temperature': 320.0, 'pressure': 5e5,
+                      'composition': {'A': 0.4, 'B': 0.3, 'C': 0.3}}]
+    column.outlets = [{}, {}]
+    return column
+
+def test_column_closes_the_component_balances():
+    column = _column()
+    column.solve()
+    assert column.report['converged']
+    distillate, bottoms = column.outlets
+    assert distillate['flow_rate'] == pytest.approx(4.0, rel=1e-8)
+    assert bottoms['flow_rate'] == pytest.approx(6.0, rel=1e-8)
+    for name, z in {'A': 0.4, 'B': 0.3, 'C': 0.3}.items():
+        total = distillate['flow_rate'] * distillate['composition'][name] + bottoms['flow_rate'] * bottoms['composition'][name]
+        assert total == pytest.approx(10.0 * z, rel=1e-8)
+    # The light key goes overhead, the heavy key to the bottoms
+    assert distillate['composition']['A'] > 0.4 > bottoms['composition']['A']
+    assert bottoms['composition']['C'] > 0.3 > distillate['composition']['C']
+
+def test_warm_start_reaches_the_cold_start_solution():
+    warm = _column()
+    warm.solve()
+    warm.reflux_ratio = 2.6
+    warm.solve()
+    assert warm.report['warm_start']
+    cold = _column(warm_start=False)
+    cold.reflux_ratio = 2.6
+    cold.solve()
+    assert not cold.report['warm_start']
+    assert warm.report['iterations'] < cold.report['iterations']
+    for outlet_warm, outlet_cold in zip(warm.outlets, cold.outlets):
+        assert outlet_warm['flow_rate'] == pytest.approx(outlet_cold['flow_rate'], rel=1e-8)
+        for name in ('A', 'B', 'C'):
+            assert outlet_warm['composition'][name] == pytest.approx(outlet_cold['composition'][name],
+                                                                     rel=1e-7, abs=1e-12)
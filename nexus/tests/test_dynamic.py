@@ -0,0 +1,112 @@
+import types
+import numpy as np
+import pandas as pd
+import pytest
+from nexus.nexus_core.solver.flowsheet import Flowsheet
+from nexus.nexus_core.solver.dynamic import DynamicSimulator
+from nexus.nexus_core.models.unit_operations import DynamicCSTR, CSTR, UnitOperation
+from nexus.nexus_core.kinetics.kinetics import PowerLawReaction, ConstantRate, ArrheniusRate, R_GAS
+from nexus.digital_twin.validation.validation import ValidationEngine
+
+K = 2e-3
+
+def _train(n_reactors=1, jacobian='auto'):
+    reaction = PowerLawReaction('main', {'A': -1, 'B': 1}, ConstantRate(K), {'A': 1})
+    fs = Flowsheet(name='Train')
+    fs.add_unit(UnitOperation(name='Feed'))
+    names = [f'R-{i}' for i in range(n_reactors)]
+    for name in names:
+        unit = DynamicCSTR(name=name, volume=50.0, prop_pkg=None, reaction=reaction)
+        unit.verbose = False
+        fs.add_unit(unit)
+    fs.add_unit(UnitOperation(name='Product'))
+    fs.streams['feed'] = {'flow_rate': 0.1, 'temperature': 308.0, 'composition': {'A': 0.4, 'W': 0.6}}
+    streams = ['feed'] + [f's{i}' for i in range(1, n_reactors)] + ['product']
+    for stream, source, target in zip(streams, ['Feed'] + names, names + ['Product']):
+        fs.connect(stream, source, target)
+    return fs, DynamicSimulator(fs, rtol=1e-8, atol=1e-12, jacobian=jacobian, verbose=False)
+
+def test_step_response_matches_the_analytic_transient():
+    fs, sim = _train()
+    sim.initialize()
+    c0 = 0.4 / (1 + K * 50.0 / 0.1)
+    assert sim.state[sim._slices['R-0']][0] == pytest.approx(c0, rel=1e-10)
+    # Double the feed flow: c_A relaxes to the new steady state with rate F/V + k
+    sim.schedule(0.0, lambda sim, t: sim.flowsheet.streams['feed'].update(flow_rate=0.2))
+    times = np.linspace(0.0, 2000.0, 21)
+    result = sim.run(2000.0, t_eval=times)
+    rate = 0.2 / 50.0 + K
+    c_new = 0.4 / (1 + K * 50.0 / 0.2)
+    expected = c_new + (c0 - c_new) * np.exp(-rate * times)
+    a = result['components']['R-0'].index('A')
+    np.testing.assert_allclose(result['states']['R-0'][:, a], expected, rtol=1e-5)
+
+def test_long_run_reaches_the_steady_state_cstr():
+    fs, sim = _train(n_reactors=2)
+    sim.initialize()
+    sim.schedule(0.0, lambda sim, t: sim.flowsheet.streams['feed'].update(flow_rate=0.25))
+    sim.run(5e4)
+    steady, _ = _train(n_reactors=2)
+    steady.streams['feed']['flow_rate'] = 0.25
+    for name in ['R-0', 'R-1']:
+        unit = steady.unit_ops[name]
+        reactor = CSTR(name=name, volume=50.0, prop_pkg=None, reactions=unit.reactions)
+        reactor.verbose = False
+        reactor.inlets, reactor.outlets = unit.inlets, unit.outlets
+        reactor.solve()
+        for component in ('A', 'B'):
+            assert fs.unit_ops[name].outlets[0]['composition'][component] == pytest.approx(
+                reactor.outlets[0]['composition'][component], rel=1e-6)
+
+def test_local_and_finite_difference_jacobians_agree():
+    results = []
+    for jacobian in ('local', 'finite-difference'):
+        fs, sim = _train(n_reactors=2, jacobian=jacobian)
+        sim.add_input('feed', 'flow_rate', [0.0, 1000.0, 4000.0], [0.1, 0.3, 0.05])
+        sim.initialize()
+        results.append(sim.run(4000.0, t_eval=np.linspace(0.0, 4000.0, 9)))
+    for name in ['R-0', 'R-1']:
+        np.testing.assert_allclose(results[0]['states'][name], results[1]['states'][name], rtol=1e-5, atol=1e-10)
+
+def _history(hours=72):
+    rng = np.random.default_rng(5)
+    data = pd.DataFrame({
+        'feed_flow_rate': np.full(hours, 100.0),
+        'reactor_temp': np.full(hours, 35.0),
+        'feed_cellulose': 15.0 + rng.normal(0.0, 0.5, hours),
+        'product_bioethanol_concentration': rng.uniform(0.0, 50.0, hours),
+    }, index=pd.date_range('2023-01-01', periods=hours, freq='h'))
+    return types.SimpleNamespace(data=data, get_data_at_timestamp=data.asof)
+
+def test_validate_history_dynamic_keeps_the_model_connections():
+    reaction = PowerLawReaction('Ethanol_Conversion', {'Ethanol': -1, 'Product': 1},
+                                ArrheniusRate(A=0.005, Ea=5000 * R_GAS, T_ref=310), {'Ethanol': 1})
+    reactor = DynamicCSTR(name='R-101', volume=50, prop_pkg=None, reaction=reaction)
+    reactor.verbose = False
+    inlets, outlets = [{'flow_rate': 1.0}], [{}]
+    reactor.inlets, reactor.outlets = inlets, outlets
+    reader = _history()
+    dynamic = ValidationEngine(reactor, reader).validate_history_dynamic()
+    assert reactor.inlets is inlets and reactor.outlets is outlets
+
+    # The holdup smooths the feed noise around the steady-state predictions
+    steady_reactor = CSTR(name='R-101', volume=50, prop_pkg=None, reaction=reaction)
+    steady = ValidationEngine(steady_reactor, reader).validate_history()
+    assert len(dynamic) == len(steady)
+    assert dynamic['predicted_product_conc'].iloc[0] == pytest.approx(steady['predicted_product_conc'].iloc[0],
+                                                                      rel=1e-6)
+    assert dynamic['predicted_product_conc'].mean() == pytest.approx(steady['predicted_product_conc'].mean(),
+                                                                     rel=1e-2)
+    assert dynamic['predicted_product_conc'].std() < steady['predicted_product_conc'].std()
+
+def test_state_jacobian_is_flat_in_clipped_states():
+    fs, _ = _train()
+    reactor = fs.unit_ops['R-0']
+    x = reactor.initial_state()
+    # An integrator trial point with the reactant below zero
+    x[reactor.state_components.index('A')] = -1e-3
+    J = reactor.state_jacobian(0.0, x)
+    h = 1e-7
+    estimate = np.column_stack([(reactor.derivatives(0.0, x + h * e) - reactor.derivatives(0.0, x - h * e)) / (2 * h)
+                                for e in np.eye(len(x))])
+    np.testing.assert_allclose(J, estimate, atol=1e-9)
@@ -0,0 +1,165 @@
+import numpy as np
+import pytest
+from nexus.nexus_core.solver.flowsheet import Flowsheet, SequentialModularSolver
+from nexus.nexus_core.solver.recycle import RecycleSolver
+from nexus.nexus_core.solver.equation_oriented import EquationOrientedSolver
+from nexus.nexus_core.solver.instrumentation import Instrumentation
+from nexus.nexus_core.models.streams import StreamLayout
+from nexus.nexus_core.models.unit_operations import UnitOperation, Mixer, Splitter, CSTR, Flash, DistillationColumn
+from nexus.nexus_core.properties.property_models import PropertyPackage, Component
+from nexus.nexus_core.kinetics.kinetics import PowerLawReaction
+
+class FirstOrderReactor(UnitOperation):
+    """Exact constant-density CSTR balance of A -> B, solved by solve() only (no residuals())."""
+    def __init__(self, name, volume, k):
+        super().__init__(name)
+        self.volume = volume
+        self.k = k
+        self.conversion = None
+
+    def solve(self):
+        inlet, outlet = self.inlets[0], self.outlets[0]
+        tau = self.volume / inlet['flow_rate']
+        a = inlet['composition'].get('A', 0.0) / (1 + self.k * tau)
+        outlet.update(inlet)
+        outlet['composition'] = {'A': a, 'B': 1.0 - a}
+        self.conversion = 1.0 - a / inlet['composition']['A']
+
+def _reactor_loop(reactor):
+    fs = Flowsheet(name='Reactor Loop')
+    for unit in [UnitOperation(name='Feed'), Mixer(name='M'), reactor,
+                 Splitter(name='S', split_fractions=[0.1, 0.9]), UnitOperation(name='Product')]:
+        fs.add_unit(unit)
+    fs.streams['feed'] = {'flow_rate': 0.1, 'temperature': 330.0, 'pressure': 101325.0,
+                          'composition': {'A': 1.0, 'B': 0.0}}
+    fs.connect('feed', 'Feed', 'M')
+    fs.connect('mixed', 'M', 'R')
+    fs.connect('effluent', 'R', 'S')
+    fs.connect('product', 'S', 'Product')
+    fs.connect('recycle', 'S', 'M')
+    return fs
+
+def _flash_loop():
+    prop_pkg = PropertyPackage(components=[Component('Methanol', 'CH4O'), Component('Water', 'H2O')])
+    fs = Flowsheet(name='Flash Loop')
+    for unit in [UnitOperation(name='Feed'), Mixer(name='M'),
+                 Flash(name='F', prop_pkg=prop_pkg, temperature=350.0, pressure=101325.0),
+                 Splitter(name='S', split_fractions=[0.5, 0.5]), UnitOperation(name='Vapour'),
+                 UnitOperation(name='Product')]:
+        fs.add_unit(unit)
+    fs.streams['feed'] = {'flow_rate': 1.0, 'temperature': 340.0, 'pressure': 101325.0,
+                          'composition': {'Methanol': 0.5, 'Water': 0.5}}
+    fs.connect('feed', 'Feed', 'M')
+    fs.connect('mixed', 'M', 'F')
+    fs.connect('vapour', 'F', 'Vapour')
+    fs.connect('liquid', 'F', 'S')
+    fs.connect('product', 'S', 'Product')
+    fs.connect('recycle', 'S', 'M')
+    return fs
+
+def _assert_streams_match(reference, result, names, rel=1e-6):
+    for name in names:
+        expected, actual = reference.streams[name], result.streams[name]
+        assert actual['flow_rate'] == pytest.approx(expected['flow_rate'], rel=rel)
+        for comp, value in expected['composition'].items():
+            assert actual['composition'][comp] == pytest.approx(value, rel=rel, abs=1e-10)
+        if expected.get('temperature') is not None:
+            assert actual['temperature'] == pytest.approx(expected['temperature'], rel=rel)
+
+def test_reactor_loop_matches_the_analytic_solution():
+    reaction = PowerLawReaction('r1', {'A': -1, 'B': 1}, lambda T: 0.05, {'A': 1})
+    fs = _reactor_loop(CSTR(name='R', volume=1.0, prop_pkg=None, reaction=reaction))
+    report = EquationOrientedSolver(fs).solve()
+    assert report['converged']
+    # Loop flow 1.0, tau = 1: c_A = (1 - r) / (1 + k tau - r)
+    assert fs.streams['product']['flow_rate'] == pytest.approx(0.1, rel=1e-8)
+    assert fs.streams['product']['composition']['A'] == pytest.approx(0.1 / 0.15, rel=1e-8)
+
+def test_generic_residual_loop_matches_sequential_modular():
+    reference = _reactor_loop(FirstOrderReactor(name='R', volume=1.0, k=0.05))
+    RecycleSolver(reference, tol=1e-12, max_iter=1000).solve()
+    fs = _reactor_loop(FirstOrderReactor(name='R', volume=1.0, k=0.05))
+    report = EquationOrientedSolver(fs).solve()
+    assert report['converged']
+    _assert_streams_match(reference, fs, ['product', 'recycle', 'effluent'])
+
+def test_generic_residual_restores_the_unit_state():
+    fs = _reactor_loop(FirstOrderReactor(name='R', volume=1.0, k=0.05))
+    reactor = fs.unit_ops['R']
+    fs.streams['mixed'].update(fs.streams['feed'])
+    fs.streams['effluent'].update(fs.streams['feed'])
+    before = dict(fs.streams['effluent'])
+    residuals = reactor.residuals(StreamLayout(['A', 'B'], temperature=False, pressure=False))
+    # The residual is the outlet minus what solve() gives: n_A(1 / (1 + k tau) - 1) with tau = 10
+    np.testing.assert_allclose(residuals, [0.1 * (1 - 1 / 1.5), -0.1 * (1 - 1 / 1.5)])
+    assert reactor.conversion is None
+    assert fs.streams['effluent'] == before
+
+def test_generic_residual_runs_solve_quietly(capsys):
+    reaction = PowerLawReaction('r1', {'A': -1, 'B': 1}, lambda T: 0.05, {'A': 1})
+    fs = _reactor_loop(CSTR(name='R', volume=1.0, prop_pkg=None, reaction=reaction))
+    reactor = fs.unit_ops['R']
+    fs.streams['mixed'].update(fs.streams['feed'])
+    fs.streams['effluent'].update(fs.streams['feed'])
+    revision = reactor._revision
+    # A residual evaluation is not a solve: no messages, no events, no parameter change
+    with Instrumentation() as instr:
+        reactor._solve_residuals(StreamLayout(['A', 'B']))
+    assert capsys.readouterr().out == ''
+    assert not instr.events
+    assert reactor.verbose is True
+    assert reactor._revision == revision
+
+def test_flash_loop_matches_sequential_modular(capsys):
+    reference = _flash_loop()
+    for unit in reference.unit_ops.values():
+        unit.verbose = False
+    RecycleSolver(reference, tol=1e-12, max_iter=1000, verbose=False).solve()
+    fs = _flash_loop()
+    flash = fs.unit_ops['F']
+    revision = flash._revision
+    with Instrumentation() as instr:
+        report = EquationOrientedSolver(fs, verbose=False).solve()
+    assert report['converged']
+    _assert_streams_match(reference, fs, ['product', 'vapour', 'recycle'])
+    # Residual evaluations and finite-difference probes are not flash solves
+    assert "Flash 'F'" not in capsys.readouterr().out
+    assert not [event for event in instr.events if event.name == 'F']
+    assert flash.report == {}
+    assert flash._revision == revision
+
+def test_flash_residuals_vanish_at_the_flash_solution():
+    fs = _flash_loop()
+    flash = fs.unit_ops['F']
+    fs.streams['mixed'].update(fs.streams['feed'])
+    layout = StreamLayout(['Methanol', 'Water'])
+    flash.verbose = False
+    flash.solve()
+    np.testing.assert_allclose(flash.residuals(layout), 0.0, atol=1e-10)
+    np.testing.assert_allclose(UnitOperation.residuals(flash, layout), flash.residuals(layout), atol=1e-10)
+
+def test_column_residuals_leave_the_unit_untouched(capsys):
+    def build():
+        prop_pkg = PropertyPackage(components=[Component('Methanol', 'CH4O'), Component('Water', 'H2O')])
+        fs = Flowsheet(name='Column')
+        for unit in [UnitOperation(name='Feed'),
+                     DistillationColumn(name='C', prop_pkg=prop_pkg, n_stages=8, reflux_ratio=1.5,
+                                        distillate_to_feed=0.4),
+                     UnitOperation(name='Distillate'), UnitOperation(name='Bottoms')]:
+            fs.add_unit(unit)
+        fs.streams['feed'] = {'flow_rate': 1.0, 'temperature': 340.0, 'pressure': 101325.0,
+                              'composition': {'Methanol': 0.5, 'Water': 0.5}}
+        fs.connect('feed', 'Feed', 'C')
+        fs.connect('distillate', 'C', 'Distillate')
+        fs.connect('bottoms', 'C', 'Bottoms')
+        return fs
+
+    reference = build()
+    reference.unit_ops['C'].verbose = False
+    SequentialModularSolver(reference, verbose=False).solve()
+    fs = build()
+    report = EquationOrientedSolver(fs, verbose=False).solve()
+    assert report['converged']
+    _assert_streams_match(reference, fs, ['distillate', 'bottoms'])
+    assert "DistillationColumn 'C'" not in capsys.readouterr().out
+    assert fs.unit_ops['C']._profile is None
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from scipy.optimize import brentq
+from nexus.nexus_core.models.flash import rachford_rice, phase_compositions
+from nexus.nexus_core.models.unit_operations import Flash
+from nexus.nexus_core.models.streams import BatchStream
+from nexus.nexus_core.properties.property_models import PropertyPackage, Component
+
+def _feeds(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    z = rng.dirichlet([1.0, 1.0, 1.0], size=n)
+    K = np.array([3.0, 1.1, 0.2]) * rng.uniform(0.5, 1.5, size=(n, 1))
+    return z, K
+
+def test_rachford_rice_matches_a_scalar_root_finder():
+    z, K = _feeds()
+    beta, iterations, converged = rachford_rice(z, K)
+    assert converged.all()
+    for i in range(0, len(z), 25):
+        f = lambda b: np.sum(z[i] * (K[i] - 1) / (1 + b * (K[i] - 1)))
+        if f(0.0) <= 0:
+            assert beta[i] == 0.0
+        elif f(1.0) >= 0:
+            assert beta[i] == 1.0
+        else:
+            assert beta[i] == pytest.approx(brentq(f, 0.0, 1.0, xtol=1e-14), abs=1e-10)
+    single = rachford_rice(z[7], K[7])
+    assert single[0] == pytest.approx(beta[7], abs=1e-12)
+
+def test_phase_split_closes_the_material_balance():
+    z, K = _feeds()
+    beta, _, _ = rachford_rice(z, K)
+    x, y = phase_compositions(z, K, beta)
+    two_phase = (beta > 0) & (beta < 1)
+    assert two_phase.any()
+    balance = (1 - beta)[:, np.newaxis] * x + beta[:, np.newaxis] * y
+    np.testing.assert_allclose(balance[two_phase], z[two_phase], atol=1e-10)
+    np.testing.assert_allclose((y / x)[two_phase], K[two_phase], rtol=1e-10)
+
+def _drum(**conditions):
+    drum = Flash(name='F', k_values={'A': 3.0, 'B': 1.1, 'C': 0.2}, **conditions)
+    drum.verbose = False
+    drum.inlets = [{}]
+    drum.outlets = [{}, {}]
+    return drum
+
+def test_batch_flash_matches_scalar_flashes():
+    z, _ = _feeds(n=20, seed=1)
+    flows = np.linspace(1.0, 2.0, 20)
+    inlet = BatchStream('in', ['A', 'B', 'C'], z, flow_rate=flows, temperature=np.full(20, 350.0),
+                        pressure=np.full(20, 1e5))
+    drum = _drum()
+    vapour, liquid = drum.solve_batch([inlet])
+    for i in range(20):
+        drum.inlets = [inlet.row(i)]
+        drum.solve()
+        for batch, scalar in ((vapour, drum.outlets[0]), (liquid, drum.outlets[1])):
+            row = batch.row(i)
+            assert row['flow_rate'] == pytest.approx(scalar['flow_rate'], rel=1e-12, abs=1e-15)
+            for name in ('A', 'B', 'C'):
+                assert row['composition'][name] == pytest.approx(scalar['composition'][name], rel=1e-10)
+
+def test_batch_parameters_override_the_drum_conditions():
+    # Wilson K-values depend on T and P; the inlet carries neither
+    prop_pkg = PropertyPackage(components=[Component('L', 'L', mw=30, tc=370.0, pc=4.2e6, omega=0.15),
+                                           Component('H', 'H', mw=100, tc=540.0, pc=2.7e6, omega=0.35)])
+    drum = Flash(name='F', prop_pkg=prop_pkg, temperature=300.0, pressure=1e5)
+    drum.verbose = False
+    drum.outlets = [{}, {}]
+    inlet = BatchStream('in', ['L', 'H'], np.tile([0.5, 0.5], (3, 1)), flow_rate=np.ones(3))
+    temperatures = np.array([300.0, 330.0, 360.0])
+    vapour, _ = drum.solve_batch([inlet], {'temperature': temperatures})
+    np.testing.assert_array_equal(vapour.temperature, temperatures)
+    np.testing.assert_array_equal(vapour.pressure, np.full(3, 1e5))
+    for i, temperature in enumerate(temperatures):
+        drum.temperature = temperature
+        drum.inlets = [inlet.row(i)]
+        drum.solve()
+        assert vapour.flow_rate[i] == pytest.approx(drum.outlets[0]['flow_rate'], rel=1e-12, abs=1e-15)
+    assert vapour.flow_rate[0] < vapour.flow_rate[2]
@@ -0,0 +1,75 @@
+from nexus.nexus_core.solver.flowsheet import Flowsheet, SequentialModularSolver
+from nexus.nexus_core.models.unit_operations import UnitOperation
+
+class Mix(UnitOperation):
+    """Adiabatic mixing of streams of one component, enough to check the solve order."""
+    def solve(self):
+        flow = sum(s['flow_rate'] for s in self.inlets)
+        temperature = sum(s['flow_rate'] * s['temperature'] for s in self.inlets) / flow
+        self.outlets[0].update(flow_rate=flow, temperature=temperature, composition={'X': 1.0})
+
+def _naive_order(fs):
+    """The calculation order the solver used before plans were cached: a fresh sort per solve."""
+    remaining = list(fs.unit_ops)
+    upstream = {name: {src for src, dest, _ in fs._connections if dest == name} for name in remaining}
+    order = []
+    while remaining:
+        ready = next(name for name in remaining if upstream[name] <= set(order))
+        order.append(ready)
+        remaining.remove(ready)
+    return order
+
+def _branched_flowsheet():
+    fs = Flowsheet(name='Branches')
+    for name in ['Feed1', 'Feed2', 'A', 'B', 'M', 'Out']:
+        fs.add_unit(Mix(name=name) if name == 'M' else UnitOperation(name=name))
+    fs.streams['f1'] = {'flow_rate': 1.0, 'temperature': 300.0, 'composition': {'X': 1.0}}
+    fs.streams['f2'] = {'flow_rate': 2.0, 'temperature': 360.0, 'composition': {'X': 1.0}}
+    fs.connect('f1', 'Feed1', 'A')
+    fs.connect('f2', 'Feed2', 'B')
+    fs.connect('a', 'A', 'M')
+    fs.connect('b', 'B', 'M')
+    fs.connect('out', 'M', 'Out')
+    return fs
+
+def test_plan_is_cached_until_the_topology_changes():
+    fs = _branched_flowsheet()
+    plan = fs.compile()
+    assert fs.compile() is plan
+    assert SequentialModularSolver(fs).plan is plan
+    fs.add_unit(UnitOperation(name='Extra'))
+    rebuilt = fs.compile()
+    assert rebuilt is not plan
+    assert rebuilt.version == fs.version
+    assert 'Extra' in rebuilt.order
+
+def test_plan_order_respects_every_connection():
+    fs = _branched_flowsheet()
+    plan = fs.compile()
+    position = {name: i for i, name in enumerate(plan.order)}
+    assert sorted(plan.order) == sorted(_naive_order(fs))
+    for src, dest, _ in fs._connections:
+        assert position[src] < position[dest]
+    assert plan.is_acyclic
+    assert plan.levels[0] == ('Feed1', 'Feed2')
+    assert set(plan.levels[1]) == {'A', 'B'}
+    assert plan.levels[-1] == ('Out',)
+
+def test_solve_matches_a_fresh_topological_sort():
+    fs = _branched_flowsheet()
+    SequentialModularSolver(fs).solve()
+    mixed = fs.streams['out']
+    assert mixed['flow_rate'] == 3.0
+    assert abs(mixed['temperature'] - (1.0 * 300.0 + 2.0 * 360.0) / 3.0) < 1e-12
+
+def test_recycle_loops_compile_into_blocks():
+    fs = Flowsheet(name='Loop')
+    for name in ['A', 'B', 'C']:
+        fs.add_unit(UnitOperation(name=name))
+    fs.connect('s1', 'A', 'B')
+    fs.connect('s2', 'B', 'C')
+    fs.connect('s3', 'C', 'B')
+    plan = fs.compile()
+    assert not plan.is_acyclic
+    assert plan.blocks == (('A',), ('B', 'C'))
+    assert plan.levels == ()
@@ -0,0 +1,70 @@
+from nexus.nexus_core.solver.flowsheet import Flowsheet, SequentialModularSolver
+from nexus.nexus_core.models.unit_operations import UnitOperation, CSTR
+from nexus.nexus_core.kinetics.kinetics import PowerLawReaction
+
+class FirstOrderReactor(CSTR):
+    """CSTR with the exact first-order solution, A_out = A_in / (1 + k * tau)."""
+    def solve(self):
+        inlet = self.inlets[0]
+        k = self.reaction.rate_constant_func(inlet['temperature'])
+        a = inlet['composition']['A'] / (1.0 + k * self.volume / inlet['flow_rate'])
+        self.outlets[0].update(inlet)
+        self.outlets[0]['composition'] = {'A': a, 'B': 1.0 - a}
+
+def _train(volumes=(1.0, 2.0, 3.0)):
+    fs = Flowsheet(name='Train')
+    reaction = PowerLawReaction('r1', {'A': -1, 'B': 1}, lambda T: 0.05, {'A': 1})
+    fs.add_unit(UnitOperation(name='Feed'))
+    for k, volume in enumerate(volumes):
+        fs.add_unit(FirstOrderReactor(name=f'R-{k}', volume=volume, prop_pkg=None, reaction=reaction))
+    fs.add_unit(UnitOperation(name='Product'))
+    fs.streams['feed'] = {'flow_rate': 0.1, 'temperature': 330.0, 'composition': {'A': 1.0, 'B': 0.0}}
+    fs.connect('feed', 'Feed', 'R-0')
+    fs.connect('s1', 'R-0', 'R-1')
+    fs.connect('s2', 'R-1', 'R-2')
+    fs.connect('product', 'R-2', 'Product')
+    return fs
+
+def _solved_units(solver, capsys):
+    capsys.readouterr()
+    solver.solve()
+    lines = capsys.readouterr().out.splitlines()
+    return [line.split(': ', 1)[1] for line in lines if line.startswith('Solving unit: ')]
+
+def test_only_the_downstream_cone_is_resolved(capsys):
+    fs = _train()
+    solver = SequentialModularSolver(fs)
+    assert len(_solved_units(solver, capsys)) == 5
+    assert _solved_units(solver, capsys) == []
+    fs.unit_ops['R-1'].volume = 4.0
+    assert _solved_units(solver, capsys) == ['R-1', 'R-2', 'Product']
+
+    # Same results as solving everything from scratch
+    reference = _train(volumes=(1.0, 4.0, 3.0))
+    SequentialModularSolver(reference, incremental=False).solve()
+    assert fs.streams['product']['flow_rate'] == reference.streams['product']['flow_rate']
+    assert fs.streams['product']['composition'] == reference.streams['product']['composition']
+
+def test_reaction_and_feed_changes_are_detected(capsys):
+    fs = _train()
+    solver = SequentialModularSolver(fs)
+    solver.solve()
+    fs.unit_ops['R-0'].reaction.rate_constant_func = lambda T: 0.1
+    assert _solved_units(solver, capsys) == ['R-0', 'R-1', 'R-2', 'Product']
+    fs.streams['feed']['flow_rate'] = 0.2
+    assert _solved_units(solver, capsys) == ['Feed', 'R-0', 'R-1', 'R-2', 'Product']
+
+def test_mark_dirty_forces_a_resolve(capsys):
+    fs = _train()
+    solver = SequentialModularSolver(fs)
+    solver.solve()
+    fs.mark_dirty('R-2')
+    assert _solved_units(solver, capsys) == ['R-2']
+
+def test_logging_settings_do_not_mark_units_dirty(capsys):
+    fs = _train()
+    solver = SequentialModularSolver(fs)
+    solver.solve()
+    for unit in fs.unit_ops.values():
+        unit.verbose = not unit.verbose
+    assert _solved_units(solver, capsys) == []
@@ -0,0 +1,71 @@
+import json
+from nexus.nexus_core.solver.flowsheet import Flowsheet, SequentialModularSolver
+from nexus.nexus_core.solver import instrumentation
+from nexus.nexus_core.solver.instrumentation import Instrumentation
+from nexus.nexus_core.models.unit_operations import UnitOperation, CSTR
+from nexus.nexus_core.kinetics.kinetics import PowerLawReaction
+
+def _train():
+    fs = Flowsheet(name='Train')
+    reaction = PowerLawReaction('r1', {'A': -1, 'B': 1}, lambda T: 0.05, {'A': 1})
+    fs.add_unit(UnitOperation(name='Feed'))
+    for k in range(2):
+        unit = CSTR(name=f'R-{k}', volume=2.0, prop_pkg=None, reaction=reaction)
+        unit.verbose = False
+        fs.add_unit(unit)
+    fs.streams['feed'] = {'flow_rate': 0.1, 'temperature': 330.0, 'composition': {'A': 1.0, 'B': 0.0}}
+    fs.connect('feed', 'Feed', 'R-0')
+    fs.connect('s1', 'R-0', 'R-1')
+    fs.add_unit(UnitOperation(name='Product'))
+    fs.connect('product', 'R-1', 'Product')
+    return fs
+
+def test_instrumented_solve_gives_the_same_results_and_a_summary(tmp_path, capsys):
+    reference = _train()
+    SequentialModularSolver(reference, verbose=False).solve()
+    fs = _train()
+    seen = []
+    with Instrumentation(hooks=[seen.append]) as instr:
+        SequentialModularSolver(fs, verbose=False).solve()
+    assert instrumentation.active() is None
+    # Quiet solves print nothing
+    assert capsys.readouterr().out == ''
+    assert fs.streams['product'].signature() == reference.streams['product'].signature()
+
+    assert seen == instr.events
+    kinds = [event.kind for event in instr.events]
+    assert kinds[0] == 'solve_start' and kinds[-1] == 'solve_end'
+    summary = instr.summary()
+    assert summary['R-0']['calls'] == 1
+    assert summary['R-0']['iterations'] >= 1
+    assert summary['R-0']['failures'] == 0
+
+    path = tmp_path / 'trace.json'
+    instr.export_chrome_trace(str(path))
+    trace = json.loads(path.read_text())['traceEvents']
+    assert len(trace) == len(instr.events)
+    assert all(record['ph'] in ('X', 'i') for record in trace)
+
+def test_failures_are_recorded():
+    fs = _train()
+    fs.streams['feed']['flow_rate'] = 0.0
+    with Instrumentation() as instr:
+        SequentialModularSolver(fs, verbose=False).solve()
+    failed = [event for event in instr.events if event.kind == 'unit_failed']
+    assert [event.name for event in failed] == ['R-0']
+    assert failed[0].duration is not None
+    assert instr.events[-1].data['success'] is False
+
+def test_cyclic_flowsheet_ends_the_solve_in_the_trace():
+    fs = _train()
+    fs.connect('back', 'R-1', 'R-0')
+    with Instrumentation() as instr:
+        SequentialModularSolver(fs, verbose=False).solve()
+    assert [(e.kind, e.data.get('success')) for e in instr.events] == [('solve_start', None), ('solve_end', False)]
+
+def test_suspended_instrumentation_records_nothing():
+    with Instrumentation() as instr:
+        with instrumentation.suspended():
+            SequentialModularSolver(_train(), verbose=False).solve()
+        assert instrumentation.active() is instr
+    assert instr.events == []
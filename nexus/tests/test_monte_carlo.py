@@ -0,0 +1,151 @@
+import numpy as np
+import pytest
+from nexus.nexus_core.uq.monte_carlo import MonteCarlo, sample_generator
+from nexus.nexus_core.uq.results import ResultSink, SpilledResults
+from nexus.nexus_core.solver.flowsheet import Flowsheet, SequentialModularSolver
+from nexus.nexus_core.models.unit_operations import UnitOperation, CSTR
+from nexus.nexus_core.kinetics.kinetics import PowerLawReaction, ArrheniusRate
+
+# Module-level, so that worker processes can unpickle them
+def build_reactor_flowsheet():
+    reaction = PowerLawReaction('r1', {'Ethanol': -1, 'Product': 1}, ArrheniusRate(A=50.0, Ea=2.5e4),
+                                {'Ethanol': 1})
+    reactor = CSTR(name='R-101', volume=10, prop_pkg=None, reaction=reaction)
+    reactor.verbose = False
+    fs = Flowsheet(name='Reactor UQ')
+    for unit in [UnitOperation(name='Feed'), reactor, UnitOperation(name='Product')]:
+        fs.add_unit(unit)
+    fs.streams['feed'] = {'flow_rate': 0.1, 'temperature': 353, 'composition': {'Ethanol': 0.8, 'Water': 0.2}}
+    fs.connect('feed', 'Feed', 'R-101')
+    fs.connect('outlet', 'R-101', 'Product')
+    return fs, SequentialModularSolver(fs, verbose=False)
+
+def outlet_ethanol(flowsheet):
+    return flowsheet.streams['outlet']['composition']['Ethanol']
+
+def checked_volume(flowsheet):
+    volume = flowsheet.unit_ops['R-101'].volume
+    if volume > 11.5:
+        raise ValueError(f"volume {volume:.3f} above the design limit")
+    return volume
+
+def _study(num_samples=200, **options):
+    mc = MonteCarlo(flowsheet_factory=build_reactor_flowsheet, num_samples=num_samples, seed=42, **options)
+    mc.add_unit_parameter('R-101', 'volume', 'normal', {'loc': 10, 'scale': 1})
+    mc.add_stream_parameter('feed', 'temperature', 'uniform', {'low': 340, 'high': 360})
+    mc.add_output_response('OutletEthanol', outlet_ethanol)
+    return mc
+
+def test_samples_draw_from_independent_streams():
+    first = sample_generator(42, 7).normal(size=3)
+    np.testing.assert_array_equal(sample_generator(42, 7).normal(size=3), first)
+    assert not np.array_equal(sample_generator(42, 8).normal(size=3), first)
+    assert not np.array_equal(sample_generator(43, 7).normal(size=3), first)
+
+def test_parallel_results_are_bit_identical_to_serial():
+    serial = _study()
+    serial_results = serial.run_simulation()
+    parallel = _study()
+    parallel_results = parallel.run_simulation(n_workers=3, chunk_size=16)
+    assert serial_results.equals(parallel_results)
+    assert serial.samples.equals(parallel.samples)
+    assert len(serial_results) == 200
+
+def test_serial_run_matches_solving_each_sample_by_hand():
+    mc = _study(num_samples=5)
+    results = mc.run_simulation()
+    for index, (volume, temperature) in enumerate(mc.samples.to_numpy()):
+        rng = sample_generator(mc.seed, index)
+        assert (volume, temperature) == (rng.normal(loc=10, scale=1), rng.uniform(low=340, high=360))
+        fs, solver = build_reactor_flowsheet()
+        fs.unit_ops['R-101'].volume = volume
+        fs.streams['feed']['temperature'] = temperature
+        solver.solve()
+        assert results['OutletEthanol'][index] == outlet_ethanol(fs)
+
+def test_failed_samples_are_reported_with_their_index():
+    results = {}
+    for n_workers in (1, 2):
+        mc = _study(num_samples=60)
+        mc.add_output_response('CheckedVolume', checked_volume)
+        results[n_workers] = (mc.run_simulation(n_workers=n_workers), mc.failures, mc.samples)
+    frame, failures, samples = results[1]
+    failed = samples.index[samples['R-101.volume'] > 11.5].tolist()
+    assert failed and [index for index, _ in failures] == failed
+    assert all('ValueError: volume' in message for _, message in failures)
+    assert frame.index.intersection(failed).empty
+    assert results[2][1] == failures and results[2][0].equals(frame)
+
+def counted(limit=None):
+    """outlet_ethanol that counts its calls and raises KeyboardInterrupt (a preempted job) after ``limit``."""
+    calls = []
+    def response(flowsheet):
+        if limit is not None and len(calls) >= limit:
+            raise KeyboardInterrupt
+        calls.append(1)
+        return outlet_ethanol(flowsheet)
+    return response, calls
+
+def _interrupted(checkpoint, limit, num_samples=200, **options):
+    mc = _study(num_samples=num_samples)
+    mc.add_output_response('Counted', counted(limit)[0])
+    with pytest.raises(KeyboardInterrupt):
+        mc.run_simulation(checkpoint=checkpoint, checkpoint_every=0, **options)
+
+def _resumed(checkpoint, num_samples=200, **options):
+    mc = _study(num_samples=num_samples)
+    response, calls = counted()
+    mc.add_output_response('Counted', response)
+    return mc, mc.run_simulation(checkpoint=checkpoint, **options), calls
+
+def test_resumed_run_equals_the_uninterrupted_run(tmp_path):
+    checkpoint = str(tmp_path / 'study.ckpt')
+    uninterrupted, expected, _ = _resumed(None, chunk_size=10)
+    _interrupted(checkpoint, 45, chunk_size=10)
+    # Samples of the chunk running at the interruption are lost; the four chunks before are not re-solved
+    resumed, results, calls = _resumed(checkpoint, chunk_size=10)
+    assert len(calls) == 160
+    assert results.equals(expected)
+    assert resumed.samples.equals(uninterrupted.samples)
+    # A finished run is read back from the checkpoint without solving anything
+    _, rerun, calls = _resumed(checkpoint, chunk_size=10)
+    assert calls == [] and rerun.equals(expected)
+
+def test_checkpoint_of_a_different_study_is_rejected(tmp_path):
+    checkpoint = str(tmp_path / 'study.ckpt')
+    _interrupted(checkpoint, 45, chunk_size=10)
+    with pytest.raises(ValueError, match='num_samples'):
+        _resumed(checkpoint, num_samples=300)
+    with pytest.raises(ValueError, match='seed'):
+        mc = MonteCarlo(flowsheet_factory=build_reactor_flowsheet, num_samples=200, seed=7)
+        mc.add_unit_parameter('R-101', 'volume', 'normal', {'loc': 10, 'scale': 1})
+        mc.add_stream_parameter('feed', 'temperature', 'uniform', {'low': 340, 'high': 360})
+        mc.add_output_response('OutletEthanol', outlet_ethanol)
+        mc.add_output_response('Counted', counted()[0])
+        mc.run_simulation(checkpoint=checkpoint)
+    with pytest.raises(ValueError, match='spill_dir'):
+        _resumed(checkpoint, sink=ResultSink(spill_dir=str(tmp_path / 'spill')))
+    _, results, calls = _resumed(checkpoint, resume=False)
+    assert len(calls) == 200 and len(results) == 200
+
+def test_resumed_early_stopping_run_takes_the_same_decisions(tmp_path):
+    checkpoint = str(tmp_path / 'study.ckpt')
+    options = dict(ci_width={'OutletEthanol': 0.005}, check_every=40, chunk_size=10)
+    uninterrupted, expected, _ = _resumed(None, num_samples=2000, **options)
+    assert len(expected) < 2000
+    _interrupted(checkpoint, len(expected) - 25, num_samples=2000, **options)
+    resumed, results, calls = _resumed(checkpoint, num_samples=2000, **options)
+    assert 0 < len(calls) <= 30
+    assert results.equals(expected)
+    assert resumed.convergence == uninterrupted.convergence
+
+def test_resumed_spilling_run_equals_the_uninterrupted_run(tmp_path):
+    checkpoint = str(tmp_path / 'study.ckpt')
+    _, expected, _ = _resumed(None, chunk_size=10)
+    spill = str(tmp_path / 'spill')
+    _interrupted(checkpoint, 105, chunk_size=10, sink=ResultSink(spill_dir=spill, chunk_rows=30))
+    _, sink, calls = _resumed(checkpoint, chunk_size=10, sink=ResultSink(spill_dir=spill, chunk_rows=30))
+    assert len(calls) == 100
+    spilled = SpilledResults(spill)
+    assert len(spilled) == 200
+    assert spilled.dataframe()[['OutletEthanol', 'Counted']].equals(expected)
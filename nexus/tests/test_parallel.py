@@ -0,0 +1,107 @@
+import pytest
+from nexus.nexus_core.solver.flowsheet import Flowsheet, SequentialModularSolver
+from nexus.nexus_core.solver.parallel import ParallelSolver
+from nexus.nexus_core.solver.instrumentation import Instrumentation
+from nexus.nexus_core.models.unit_operations import UnitOperation, Splitter, CSTR
+from nexus.nexus_core.kinetics.kinetics import PowerLawReaction
+
+class FirstOrderReactor(UnitOperation):
+    """Isothermal A -> B with first-order kinetics, solved exactly."""
+    gil_friendly = True
+
+    def __init__(self, name, volume, k):
+        super().__init__(name)
+        self.volume = volume
+        self.k = k
+
+    def solve(self):
+        inlet = self.inlets[0]
+        tau = self.volume / inlet['flow_rate']
+        a = inlet['composition']['A'] / (1.0 + self.k * tau)
+        for out in self.outlets:
+            out.update(inlet)
+            out['composition'] = {'A': a, 'B': 1.0 - a}
+
+class FailingUnit(UnitOperation):
+    gil_friendly = True
+
+    def solve(self):
+        raise ValueError("broken unit")
+
+def _trains(n_trains=4, failing=None):
+    """A splitter feeding independent trains of two reactors with different volumes."""
+    fs = Flowsheet(name='Trains')
+    fs.add_unit(UnitOperation(name='Feed'))
+    fs.add_unit(Splitter(name='SP', split_fractions=[1.0 / n_trains] * n_trains))
+    fs.streams['feed'] = {'flow_rate': 0.4, 'temperature': 330.0, 'composition': {'A': 1.0, 'B': 0.0}}
+    fs.connect('feed', 'Feed', 'SP')
+    for t in range(n_trains):
+        for k in range(2):
+            name = f'R-{t}{k}'
+            if name == failing:
+                fs.add_unit(FailingUnit(name=name))
+            else:
+                fs.add_unit(FirstOrderReactor(name=name, volume=1.0 + t + k, k=0.05))
+        fs.add_unit(UnitOperation(name=f'P-{t}'))
+        fs.connect(f's{t}-0', 'SP', f'R-{t}0')
+        fs.connect(f's{t}-1', f'R-{t}0', f'R-{t}1')
+        fs.connect(f's{t}-2', f'R-{t}1', f'P-{t}')
+    return fs
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_parallel_solve_matches_serial(executor):
+    reference = _trains()
+    SequentialModularSolver(reference).solve()
+    fs = _trains()
+    with ParallelSolver(fs, executor=executor, max_workers=2) as solver:
+        solver.solve()
+    for t in range(4):
+        expected, actual = reference.streams[f's{t}-2'], fs.streams[f's{t}-2']
+        assert actual['flow_rate'] == expected['flow_rate']
+        assert actual['composition'] == expected['composition']
+
+def test_levels_follow_the_critical_path():
+    plan = _trains().compile()
+    assert len(plan.levels) == 5
+    assert set(plan.levels[2]) == {f'R-{t}0' for t in range(4)}
+
+def test_a_failed_unit_stops_the_solve(capsys):
+    fs = _trains(n_trains=2, failing='R-00')
+    with ParallelSolver(fs, executor='thread') as solver:
+        solver.solve()
+    out = capsys.readouterr().out
+    assert "ERROR solving unit 'R-00'" in out
+    assert 'solution complete' not in out
+    assert fs.streams['s0-2'].get('flow_rate') is None
+
+def test_pooled_failures_are_timed_events():
+    fs = _trains(n_trains=2, failing='R-00')
+    with Instrumentation() as instr:
+        with ParallelSolver(fs, executor='thread', incremental=False, verbose=False) as solver:
+            solver.solve()
+    failures = [event for event in instr.events if event.kind == 'unit_failed']
+    assert [event.name for event in failures] == ['R-00']
+    assert failures[0].duration is not None and failures[0].duration > 0
+
+class ThreadedCSTR(CSTR):
+    gil_friendly = True
+
+def test_units_sharing_an_unnormalised_inlet_leave_it_untouched():
+    fs = Flowsheet(name='Shared inlet')
+    reaction = PowerLawReaction('r1', {'A': -1, 'B': 1}, lambda T: 0.05, {'A': 1})
+    fs.add_unit(UnitOperation(name='Feed'))
+    # Both reactors read the same stream, whose fractions sum to 2
+    fs.streams['feed'] = {'flow_rate': 0.4, 'temperature': 330.0, 'composition': {'A': 2.0, 'B': 0.0}}
+    for t in range(2):
+        fs.add_unit(ThreadedCSTR(name=f'R-{t}', volume=1.0, prop_pkg=None, reaction=reaction))
+        fs.add_unit(UnitOperation(name=f'P-{t}'))
+        fs.connect('feed', 'Feed', f'R-{t}')
+        fs.connect(f'p{t}', f'R-{t}', f'P-{t}')
+    shared = fs.streams['feed']
+    before = dict(shared['composition'])
+    with ParallelSolver(fs, executor='thread', max_workers=2) as solver:
+        solver.solve()
+        for _ in range(3):
+            solver._solve_level(['R-0', 'R-1'])
+            assert shared['composition'] == before
+    assert fs.streams['p0']['composition'] == fs.streams['p1']['composition']
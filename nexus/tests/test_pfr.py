@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from nexus.nexus_core.models.unit_operations import PFR
+from nexus.nexus_core.models.streams import BatchStream
+from nexus.nexus_core.kinetics.kinetics import PowerLawReaction, ConstantRate
+from nexus.nexus_core.kinetics.network import ReactionNetwork
+
+def _reactor(reactions, volume=2.0, **options):
+    reactor = PFR(name='P', volume=volume, prop_pkg=None, reactions=reactions, rtol=1e-10, atol=1e-13, **options)
+    reactor.verbose = False
+    reactor.inlets = [{'flow_rate': 0.5, 'temperature': 330.0, 'composition': {'A': 0.9, 'W': 0.1}}]
+    reactor.outlets = [{}]
+    return reactor
+
+def _first_order(k=0.3):
+    return [PowerLawReaction('r1', {'A': -1, 'B': 1}, ConstantRate(k), {'A': 1})]
+
+def _stiff():
+    # A fast and a slow step: A -> B (k = 1e3), B -> C (k = 0.1)
+    return [PowerLawReaction('r1', {'A': -1, 'B': 1}, ConstantRate(1e3), {'A': 1}),
+            PowerLawReaction('r2', {'B': -1, 'C': 1}, ConstantRate(0.1), {'B': 1})]
+
+def test_first_order_matches_the_analytic_solution():
+    reactor = _reactor(_first_order())
+    reactor.solve()
+    tau = 2.0 / 0.5
+    composition = reactor.outlets[0]['composition']
+    assert composition['A'] == pytest.approx(0.9 * np.exp(-0.3 * tau), rel=1e-7)
+    assert composition['B'] == pytest.approx(0.9 * (1 - np.exp(-0.3 * tau)), rel=1e-7)
+    profile = reactor.profile(n_points=11)
+    np.testing.assert_allclose(profile['composition']['A'], 0.9 * np.exp(-0.3 * tau * np.linspace(0, 1, 11)),
+                               rtol=1e-6)
+    assert profile['volume'][-1] == pytest.approx(2.0)
+
+def test_analytic_jacobian_matches_the_finite_difference_integration(monkeypatch):
+    calls = {'count': 0}
+    production_rates = ReactionNetwork.production_rates
+
+    def counted(self, concentrations, temperature):
+        calls['count'] += 1
+        return production_rates(self, concentrations, temperature)
+
+    monkeypatch.setattr(ReactionNetwork, 'production_rates', counted)
+    analytic = _reactor(_stiff())
+    analytic.solve()
+    analytic_calls, calls['count'] = calls['count'], 0
+    estimated = _reactor(_stiff(), analytic_jacobian=False)
+    estimated.solve()
+    for name in ('A', 'B', 'C'):
+        assert analytic.outlets[0]['composition'][name] == pytest.approx(
+            estimated.outlets[0]['composition'][name], rel=1e-6, abs=1e-12)
+    # The analytic blocks agree with the integrator's own estimate (also where the
+    # fast reactant is spent and clipped), so it takes the same steps without the
+    # finite-difference rate evaluations
+    assert analytic.report['steps'] == estimated.report['steps']
+    assert analytic_calls < calls['count']
+
+def test_batch_matches_scalar_solves():
+    reactor = _reactor(_stiff())
+    flows = np.array([0.2, 0.5, 1.0])
+    inlet = BatchStream('in', ['A', 'W'], np.array([[0.9, 0.1], [0.5, 0.5], [1.0, 0.0]]),
+                        flow_rate=flows, temperature=np.full(3, 330.0))
+    volumes = np.array([1.0, 2.0, 3.0])
+    outlet = reactor.solve_batch([inlet], {'volume': volumes})[0]
+    assert reactor.report['cases'] == 3
+    for i in range(3):
+        reactor.volume = volumes[i]
+        reactor.inlets = [inlet.row(i)]
+        reactor.solve()
+        row = outlet.row(i)
+        assert row['flow_rate'] == pytest.approx(reactor.outlets[0]['flow_rate'], rel=1e-6)
+        for name in ('A', 'B', 'C', 'W'):
+            assert row['composition'][name] == pytest.approx(reactor.outlets[0]['composition'][name],
+                                                             rel=1e-5, abs=1e-10)
+
+def test_profile_needs_a_solve():
+    with pytest.raises(RuntimeError):
+        _reactor(_first_order()).profile()
@@ -0,0 +1,53 @@
+import pickle
+import numpy as np
+import pytest
+from nexus.nexus_core.properties.backends import CoolPropBackend, fluid_constants, load_coolprop
+from nexus.nexus_core.properties.property_models import PropertyPackage, Component
+
+STATES = [(300.0, 101325.0), (350.0, 2e5), (450.0, 5e5), (600.0, 1e5)]
+
+@pytest.mark.parametrize('temperature, pressure', STATES)
+def test_backend_matches_propssi(temperature, pressure):
+    CP = load_coolprop()
+    result = CoolPropBackend().properties(temperature, pressure, 'Water')
+    for key, output in (('density', 'D'), ('enthalpy', 'H'), ('entropy', 'S'), ('viscosity', 'V')):
+        assert result[key] == pytest.approx(CP.PropsSI(output, 'T', temperature, 'P', pressure, 'Water'), rel=1e-10)
+
+def test_cache_hits_misses_and_eviction():
+    backend = CoolPropBackend(cache_size=2)
+    first = backend.properties(300.0, 101325.0, 'Water')
+    # Within the rounding of the key: served from the cache
+    assert backend.properties(300.0 + 1e-8, 101325.0, 'Water') is first
+    backend.properties(310.0, 101325.0, 'Water')
+    backend.properties(320.0, 101325.0, 'Water')
+    assert backend.stats == {'hits': 1, 'misses': 3, 'evictions': 1, 'size': 2, 'hit_rate': 0.25}
+    # 300 K was the least recently used state and was evicted
+    assert backend.properties(300.0, 101325.0, 'Water') == first
+    assert backend.stats['misses'] == 4
+    backend.clear_cache()
+    assert backend.stats['size'] == 0 and backend.stats['hits'] == 0
+
+def test_disabled_cache_still_evaluates():
+    backend = CoolPropBackend(cache_size=0)
+    assert backend.properties(300.0, 101325.0, 'Water') == CoolPropBackend().properties(300.0, 101325.0, 'Water')
+    assert backend.stats['size'] == 0
+
+def test_backend_pickles_without_its_states():
+    backend = CoolPropBackend()
+    expected = backend.properties(330.0, 101325.0, 'Water')
+    restored = pickle.loads(pickle.dumps(backend))
+    assert restored.properties(330.0, 101325.0, 'Water') == expected
+    restored.clear_cache()
+    assert restored.properties(330.0, 101325.0, 'Water') == pytest.approx(expected, rel=1e-14)
+
+def test_package_properties_and_constants_match_coolprop():
+    CP = load_coolprop()
+    package = PropertyPackage(components=[Component('Water', 'H2O'), Component('Ethanol', 'C2H6O')])
+    temperatures = np.array([300.0, 320.0, 340.0])
+    batch = package.get_properties(temperatures, 101325.0, {'Water': 0.5, 'Ethanol': 0.5})
+    expected = [CP.PropsSI('D', 'T', T, 'P', 101325.0, 'Water') for T in temperatures]
+    np.testing.assert_allclose(batch['density'], expected, rtol=1e-10)
+    constants = fluid_constants('Water')
+    assert constants['tc'] == pytest.approx(CP.PropsSI('Tcrit', 'Water'), rel=1e-6)
+    assert constants['pc'] == pytest.approx(CP.PropsSI('pcrit', 'Water'), rel=1e-6)
+    assert fluid_constants('NotAFluid') is None
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from nexus.nexus_core.properties.tables import PropertyTable, PROPERTIES
+from nexus.nexus_core.properties.backends import CoolPropBackend
+from nexus.nexus_core.properties.property_models import PropertyPackage, Component
+
+@pytest.fixture(scope='module')
+def table():
+    return PropertyTable.build('Water', (300.0, 340.0), (1e5, 3e5), n_t=20, n_p=8)
+
+def _relative_errors(values, T, P):
+    backend = CoolPropBackend(cache_size=0)
+    errors = {}
+    for name in PROPERTIES:
+        exact = np.array([backend.properties(t, p, 'Water')[name] for t, p in zip(T, P)])
+        errors[name] = np.max(np.abs(values[name] - exact) / np.abs(exact))
+    return errors
+
+def test_interpolation_stays_within_the_tolerance(table):
+    assert table.valid.all()
+    rng = np.random.default_rng(0)
+    T = rng.uniform(300.0, 340.0, 200)
+    P = rng.uniform(1e5, 3e5, 200)
+    errors = _relative_errors(table.evaluate(T, P), T, P)
+    for name in PROPERTIES:
+        assert table.error_bounds[name] <= table.tolerance
+        assert errors[name] <= table.tolerance
+
+def test_grid_points_are_reproduced(table):
+    backend = CoolPropBackend(cache_size=0)
+    T = np.linspace(300.0, 340.0, 20)[[0, 7, 19]]
+    P = np.linspace(1e5, 3e5, 8)[[0, 3, 7]]
+    result = table.evaluate(T, P)
+    for k, (t, p) in enumerate(zip(T, P)):
+        exact = backend.properties(t, p, 'Water')
+        for name in PROPERTIES:
+            # To CoolProp's own (T, P) iteration tolerance
+            assert result[name][k] == pytest.approx(exact[name], rel=1e-8)
+
+def test_points_outside_the_table_use_the_fallback(table):
+    backend = CoolPropBackend()
+    T = np.array([310.0, 350.0])
+    P = np.array([2e5, 2e5])
+    result = table.evaluate(T, P, fallback=backend)
+    assert result['density'][1] == backend.properties(350.0, 2e5, 'Water')['density']
+    assert np.isnan(table.evaluate(T, P)['density'][1])
+    assert table.covers(T, P).tolist() == [True, False]
+
+def test_cells_cut_by_the_saturation_line_fall_back():
+    # Water boils at 373 K at 1 atm: the cells around it are rejected
+    table = PropertyTable.build('Water', (360.0, 390.0), (0.9e5, 1.1e5), n_t=10, n_p=4)
+    assert not table.valid.all()
+    backend = CoolPropBackend()
+    T = np.linspace(360.0, 390.0, 31)
+    result = table.evaluate(T, 101325.0, fallback=backend)
+    errors = _relative_errors(result, T, np.full_like(T, 101325.0))
+    for name in PROPERTIES:
+        assert errors[name] <= table.tolerance
+
+def test_saved_tables_are_memory_mapped(table, tmp_path):
+    path = str(tmp_path / 'water.npy')
+    table.save(path)
+    loaded = PropertyTable.load(path)
+    assert isinstance(loaded.data, np.memmap)
+    T = np.linspace(300.0, 340.0, 7)
+    for name in PROPERTIES:
+        np.testing.assert_array_equal(loaded.evaluate(T, 1.5e5)[name], table.evaluate(T, 1.5e5)[name])
+    assert loaded.error_bounds == table.error_bounds
+
+def test_package_tabulation_is_reused_from_disk(tmp_path):
+    package = PropertyPackage(components=[Component('Water', 'H2O'), Component('Ethanol', 'C2H6O')])
+    package.tabulate((300.0, 340.0), (1e5, 3e5), n_t=10, n_p=5, directory=str(tmp_path), components=['Water'])
+    again = PropertyPackage(components=[Component('Water', 'H2O'), Component('Ethanol', 'C2H6O')])
+    again.tabulate((300.0, 340.0), (1e5, 3e5), n_t=10, n_p=5, directory=str(tmp_path), components=['Water'])
+    assert isinstance(again.tables['Water'].data, np.memmap)
+    composition = {'Water': 0.5, 'Ethanol': 0.5}
+    T = np.array([305.0, 333.0])
+    np.testing.assert_array_equal(again.get_properties(T, 2e5, composition)['density'],
+                                  package.get_properties(T, 2e5, composition)['density'])
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from nexus.nexus_core.kinetics.kinetics import Reaction, PowerLawReaction, ArrheniusRate, ModifiedArrheniusRate
+from nexus.nexus_core.kinetics.network import ReactionNetwork
+
+class MichaelisMenten(Reaction):
+    """A non-power-law rate, r = vmax c_S / (km + c_S), evaluated per reaction by the network."""
+    def __init__(self, name, stoichiometry, substrate, vmax, km):
+        super().__init__(name, stoichiometry)
+        self.substrate = substrate
+        self.vmax = vmax
+        self.km = km
+
+    def get_rate(self, composition, temperature):
+        c = composition[self.substrate]
+        return self.vmax * c / (self.km + c)
+
+def _mechanism(n_species=30, n_reactions=80, seed=0):
+    rng = np.random.default_rng(seed)
+    names = [f'S{i}' for i in range(n_species)]
+    reactions = []
+    for j in range(n_reactions):
+        picks = rng.choice(n_species, size=4, replace=False)
+        reactants = {names[p]: float(rng.choice([0.5, 1.0, 2.0])) for p in picks[:rng.integers(1, 3)]}
+        stoich = {name: -1 for name in reactants}
+        stoich.update({names[p]: 1 for p in picks[2:]})
+        rate = (ArrheniusRate(A=rng.uniform(0.1, 10.0), Ea=rng.uniform(1e4, 5e4), T_ref=350.0) if j % 3
+                else ModifiedArrheniusRate(A=1.0, n=0.5, Ea=2e4, T_ref=350.0))
+        reactions.append(PowerLawReaction(f'r{j}', stoich, rate, reactants))
+    reactions.append(PowerLawReaction('scalar_k', {'S0': -1, 'S1': 1}, lambda T: 0.05, {'S0': 1}))
+    reactions.append(MichaelisMenten('mm', {'S2': -1, 'S3': 1}, 'S2', vmax=0.3, km=0.2))
+    return names, reactions
+
+def _per_reaction(reactions, index, c, T):
+    w = np.zeros(len(index))
+    for rxn in reactions:
+        rate = rxn.get_rate({name: c[i] for name, i in index.items()}, T)
+        for comp, nu in rxn.stoichiometry.items():
+            w[index[comp]] += nu * rate
+    return w
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_production_rates_match_the_per_reaction_loop(sparse):
+    names, reactions = _mechanism()
+    network = ReactionNetwork(reactions, species=names, sparse=sparse)
+    rng = np.random.default_rng(1)
+    batch = rng.uniform(0.05, 1.0, (6, len(names)))
+    temperatures = rng.uniform(330.0, 380.0, 6)
+    w = network.production_rates(batch, temperatures)
+    for row, T, w_row in zip(batch, temperatures, w):
+        np.testing.assert_allclose(w_row, _per_reaction(reactions, network.index, row, T), rtol=1e-12, atol=1e-14)
+    np.testing.assert_allclose(network.production_rates(batch[2], temperatures[2]), w[2], rtol=1e-14)
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_production_jacobian_matches_finite_differences(sparse):
+    names, reactions = _mechanism()
+    network = ReactionNetwork(reactions, species=names, sparse=sparse)
+    rng = np.random.default_rng(2)
+    batch = rng.uniform(0.05, 1.0, (3, len(names)))
+    temperatures = np.array([340.0, 355.0, 370.0])
+    jac = network.production_jacobian(batch, temperatures)
+    for c, T, J in zip(batch, temperatures, jac):
+        numeric = np.empty_like(J)
+        for k in range(len(names)):
+            h = 1e-6 * c[k]
+            up, down = c.copy(), c.copy()
+            up[k] += h
+            down[k] -= h
+            numeric[:, k] = (network.production_rates(up, T) - network.production_rates(down, T)) / (2 * h)
+        np.testing.assert_allclose(J, numeric, rtol=1e-5, atol=1e-7)
+    np.testing.assert_allclose(network.production_jacobian(batch[0], temperatures[0]), jac[0], rtol=1e-14)
+
+def test_sparse_and_dense_networks_agree():
+    names, reactions = _mechanism(n_species=60, n_reactions=120)
+    dense = ReactionNetwork(reactions, species=names, sparse=False)
+    sparse = ReactionNetwork(reactions, species=names, sparse=True)
+    c = np.random.default_rng(3).uniform(0.0, 1.0, (4, len(names)))
+    np.testing.assert_allclose(sparse.production_jacobian(c, 350.0), dense.production_jacobian(c, 350.0),
+                               rtol=1e-12, atol=1e-14)
+
+def test_unknown_species_are_rejected():
+    reaction = PowerLawReaction('r', {'A': -1, 'B': 1}, 1.0, {'A': 1})
+    with pytest.raises(ValueError):
+        ReactionNetwork([reaction], species=['A'])
@@ -0,0 +1,89 @@
+import pytest
+from nexus.nexus_core.solver.flowsheet import Flowsheet
+from nexus.nexus_core.solver.recycle import RecycleSolver
+from nexus.nexus_core.solver.instrumentation import Instrumentation
+from nexus.nexus_core.models.unit_operations import UnitOperation, Mixer, Splitter
+
+class FirstOrderReactor(UnitOperation):
+    """Exact constant-density CSTR balance of A -> B with rate k c_A."""
+    def __init__(self, name, volume, k):
+        super().__init__(name)
+        self.volume = volume
+        self.k = k
+
+    def solve(self):
+        inlet, outlet = self.inlets[0], self.outlets[0]
+        tau = self.volume / inlet['flow_rate']
+        a = inlet['composition'].get('A', 0.0) / (1 + self.k * tau)
+        outlet.update(inlet)
+        outlet['composition'] = {'A': a, 'B': 1.0 - a}
+
+def _reactor_loop(recycle_fraction=0.9, k=0.05):
+    """Feed -> mixer -> first-order CSTR (A -> B) -> splitter, with the recycle back to the mixer."""
+    fs = Flowsheet(name='Reactor Loop')
+    for unit in [UnitOperation(name='Feed'), Mixer(name='M'),
+                 FirstOrderReactor(name='R', volume=1.0, k=k),
+                 Splitter(name='S', split_fractions=[1 - recycle_fraction, recycle_fraction]),
+                 UnitOperation(name='Product')]:
+        unit.verbose = False
+        fs.add_unit(unit)
+    fs.streams['feed'] = {'flow_rate': 0.1, 'temperature': 330.0, 'pressure': 101325.0,
+                          'composition': {'A': 1.0, 'B': 0.0}}
+    fs.connect('feed', 'Feed', 'M')
+    fs.connect('mixed', 'M', 'R')
+    fs.connect('effluent', 'R', 'S')
+    fs.connect('product', 'S', 'Product')
+    fs.connect('recycle', 'S', 'M')
+    return fs
+
+def _analytic_outlet_a(recycle_fraction=0.9, k=0.05, feed=0.1, volume=1.0):
+    # Constant density and no mole change: the loop flow is feed / (1 - r), tau = V / loop flow,
+    # and the mixer/CSTR balances give c_A = (1 - r) / (1 + k tau - r)
+    tau = volume * (1 - recycle_fraction) / feed
+    return (1 - recycle_fraction) / (1 + k * tau - recycle_fraction)
+
+@pytest.mark.parametrize('method', ['direct', 'wegstein', 'broyden'])
+def test_every_method_reaches_the_analytic_loop_solution(method):
+    fs = _reactor_loop()
+    reports = RecycleSolver(fs, method=method, tol=1e-10, max_iter=2000).solve()
+    assert len(reports) == 1 and reports[0]['converged']
+    assert reports[0]['tear_streams'] == ('recycle',)
+    product = fs.streams['product']
+    assert product['flow_rate'] == pytest.approx(0.1, rel=1e-8)
+    assert product['composition']['A'] == pytest.approx(_analytic_outlet_a(), rel=1e-7)
+
+def test_acceleration_matches_direct_substitution_in_fewer_passes():
+    results = {}
+    for method in ['direct', 'wegstein', 'broyden']:
+        fs = _reactor_loop(recycle_fraction=0.95)
+        report = RecycleSolver(fs, method=method, tol=1e-9, max_iter=5000).solve()[0]
+        results[method] = (report['iterations'], fs.streams['recycle']['flow_rate'],
+                           fs.streams['product']['composition']['A'])
+    direct_iterations, direct_flow, direct_a = results['direct']
+    for method in ['wegstein', 'broyden']:
+        iterations, flow, a = results[method]
+        assert iterations < direct_iterations
+        assert flow == pytest.approx(direct_flow, rel=1e-6)
+        assert a == pytest.approx(direct_a, rel=1e-6)
+
+def test_given_tear_streams_must_break_the_loop():
+    fs = _reactor_loop()
+    with pytest.raises(ValueError):
+        RecycleSolver(fs, tear_streams=['product']).select_tear_streams()
+    selection = RecycleSolver(fs, tear_streams=['effluent']).select_tear_streams()
+    assert list(selection.values())[0][0] == ('effluent',)
+
+def test_unconverged_loop_is_reported_as_a_failed_solve(capsys):
+    fs = _reactor_loop(recycle_fraction=0.95)
+    with Instrumentation() as instr:
+        report = RecycleSolver(fs, method='direct', max_iter=5, verbose=False).solve()[0]
+    assert not report['converged']
+    assert [e.data['success'] for e in instr.events if e.kind == 'solve_end'] == [False]
+    out = capsys.readouterr().out
+    assert 'Warning: Loop' in out and 'did NOT converge' in out
+    assert 'solution complete' not in out
+
+def test_invalid_tear_streams_end_the_solve_in_the_trace():
+    with Instrumentation() as instr:
+        assert RecycleSolver(_reactor_loop(), tear_streams=['product'], verbose=False).solve() == []
+    assert [(e.kind, e.data.get('success')) for e in instr.events] == [('solve_start', None), ('solve_end', False)]
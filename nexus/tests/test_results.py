@@ -0,0 +1,159 @@
+import numpy as np
+import pytest
+from scipy import stats
+from nexus.nexus_core.uq.results import RunningStats, QuantileSketch, StreamingHistogram, SpilledResults, ResultSink
+from nexus.nexus_core.uq.monte_carlo import MonteCarlo
+from nexus.nexus_core.solver.flowsheet import Flowsheet, SequentialModularSolver
+from nexus.nexus_core.models.unit_operations import UnitOperation, CSTR
+from nexus.nexus_core.kinetics.kinetics import PowerLawReaction, ArrheniusRate
+
+def _samples(n=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.lognormal(0.0, 0.5, n), rng.normal(1e6, 1.0, n)])
+
+def _stream(sink, data, batch=1000):
+    sink.open(['x'], ['cost', 'offset'])
+    for start in range(0, len(data), batch):
+        rows = np.arange(start, min(start + batch, len(data)))
+        sink.add(rows, rows[:, np.newaxis] * 0.5, data[rows])
+    sink.close()
+    return sink
+
+def _rank_error(values, estimates, p):
+    """How far the estimated quantiles are from p in the empirical distribution."""
+    return np.abs(np.searchsorted(np.sort(values), estimates) / len(values) - p)
+
+def test_running_stats_match_numpy_over_uneven_batches():
+    data = _samples()
+    data[::7, 0] = np.nan
+    running = RunningStats(2)
+    for part in np.array_split(data, [1, 2, 500, 7000, 7001, 19999]):
+        running.update(part)
+    running.update(np.zeros((0, 2)))
+    np.testing.assert_array_equal(running.count, np.sum(~np.isnan(data), axis=0))
+    np.testing.assert_allclose(running.mean, np.nanmean(data, axis=0), rtol=1e-12)
+    # The large offset of the second column would lose the variance in a sum-of-squares formula
+    np.testing.assert_allclose(running.variance, np.nanvar(data, axis=0, ddof=1), rtol=1e-9)
+    np.testing.assert_array_equal(running.min, np.nanmin(data, axis=0))
+    np.testing.assert_array_equal(running.max, np.nanmax(data, axis=0))
+    assert np.isnan(RunningStats(1).variance[0])
+
+def test_quantile_sketch_tracks_exact_quantiles():
+    values = _samples()[:, 0]
+    sketch = QuantileSketch()
+    for part in np.array_split(values, 37):
+        sketch.update(part)
+    p = np.array([0.0, 0.001, 0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99, 0.999, 1.0])
+    error = _rank_error(values, sketch.quantile(p), p)
+    # The scale function keeps tail centroids small, so the tails are the most accurate
+    assert error.max() <= 2e-3
+    assert error[(p <= 0.01) | (p >= 0.99)].max() <= 5e-4
+    assert sketch.quantile(0.0) == values.min() and sketch.quantile(1.0) == values.max()
+    assert sketch.means.size < 10 * sketch.compression
+    assert np.isnan(QuantileSketch().quantile(0.5))
+
+def test_merged_sketches_match_a_single_sketch():
+    values = _samples()[:, 0]
+    whole = QuantileSketch()
+    whole.update(values)
+    merged = QuantileSketch()
+    for part in np.array_split(values, 4):
+        worker = QuantileSketch()
+        worker.update(part)
+        merged.merge(worker)
+    p = np.linspace(0.01, 0.99, 25)
+    assert _rank_error(values, merged.quantile(p), p).max() <= 2e-3
+    assert merged.min == whole.min and merged.max == whole.max
+
+def test_streaming_histogram_keeps_every_value():
+    values = _samples()[:, 0]
+    histogram = StreamingHistogram(bins=32)
+    # A narrow first batch forces the range to grow in both directions
+    histogram.update(np.array([1.0, 1.01]))
+    for part in np.array_split(values, 10):
+        histogram.update(part)
+    histogram.update([np.nan])
+    assert histogram.counts.sum() == len(values) + 2
+    edges = histogram.edges
+    assert edges[0] <= values.min() and values.max() < edges[-1]
+    np.testing.assert_array_equal(histogram.counts, np.histogram(np.r_[values, 1.0, 1.01], bins=edges)[0])
+    with pytest.raises(ValueError):
+        StreamingHistogram(bins=31)
+
+def test_spilled_samples_equal_the_in_memory_ones(tmp_path):
+    data = _samples(5000)
+    data[[3, 4000], :] = np.nan
+    memory = _stream(ResultSink(keep_in_memory=True), data)
+    spilled = _stream(ResultSink(spill_dir=str(tmp_path), chunk_rows=1500), data)
+    reopened = SpilledResults(str(tmp_path))
+    assert len(reopened) == 5000 and reopened.manifest['rows'] == [2000, 2000, 1000]
+    np.testing.assert_array_equal(reopened.column('cost'), data[:, 0])
+    assert sum(len(chunk['offset']) for chunk in reopened.chunks(['offset'])) == 5000
+    assert spilled.dataframe().equals(memory.dataframe())
+    assert reopened.dataframe(['cost']).equals(memory.dataframe()[['cost']])
+    with pytest.raises(ValueError):
+        reopened.column('missing')
+
+def test_reopening_a_spill_directory_discards_the_previous_run(tmp_path):
+    _stream(ResultSink(spill_dir=str(tmp_path), chunk_rows=2000), _samples(1000))
+    assert len(list((tmp_path / 'cost').iterdir())) == 1
+    _stream(ResultSink(spill_dir=str(tmp_path), chunk_rows=100), _samples(1000), batch=100)
+    assert len(list((tmp_path / 'cost').iterdir())) == 10
+    _stream(ResultSink(spill_dir=str(tmp_path), chunk_rows=100), _samples(150, seed=1), batch=100)
+    assert len(SpilledResults(str(tmp_path))) == 150
+    assert len(list((tmp_path / 'cost').iterdir())) == 2
+
+def test_summary_and_confidence_match_numpy():
+    data = _samples(5000)
+    data[3, :] = np.nan
+    sink = _stream(ResultSink(), data)
+    summary = sink.summary()
+    valid = data[~np.isnan(data[:, 0])]
+    np.testing.assert_array_equal(summary.loc['count'], [len(valid)] * 2)
+    np.testing.assert_allclose(summary.loc['mean'], valid.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(summary.loc['std'], valid.std(axis=0, ddof=1), rtol=1e-9)
+    np.testing.assert_allclose(summary.loc['50%'], np.median(valid, axis=0), rtol=5e-3)
+    mean, half = sink.confidence(0.9)
+    expected = stats.t.ppf(0.95, len(valid) - 1) * valid.std(axis=0, ddof=1) / np.sqrt(len(valid))
+    np.testing.assert_allclose(mean, valid.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(half, expected, rtol=1e-9)
+    with pytest.raises(RuntimeError):
+        sink.dataframe()
+
+def test_replicated_confidence_uses_the_replicate_means():
+    data = _samples(400)
+    sink = ResultSink()
+    sink.open(['x'], ['cost', 'offset'], replicates=4)
+    sink.add(np.arange(400), np.zeros((400, 1)), data)
+    means = np.array([data[r::4].mean(axis=0) for r in range(4)])
+    mean, half = sink.confidence()
+    np.testing.assert_allclose(mean, means.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(half, stats.t.ppf(0.975, 3) * means.std(axis=0, ddof=1) / 2.0, rtol=1e-9)
+
+def _study():
+    reaction = PowerLawReaction('r1', {'Ethanol': -1, 'Product': 1}, ArrheniusRate(A=50.0, Ea=2.5e4),
+                                {'Ethanol': 1})
+    reactor = CSTR(name='R-101', volume=10, prop_pkg=None, reaction=reaction)
+    reactor.verbose = False
+    fs = Flowsheet(name='Reactor UQ')
+    for unit in [UnitOperation(name='Feed'), reactor, UnitOperation(name='Product')]:
+        fs.add_unit(unit)
+    fs.streams['feed'] = {'flow_rate': 0.1, 'temperature': 353, 'composition': {'Ethanol': 0.8, 'Water': 0.2}}
+    fs.connect('feed', 'Feed', 'R-101')
+    fs.connect('outlet', 'R-101', 'Product')
+    mc = MonteCarlo(fs, SequentialModularSolver(fs, verbose=False), num_samples=300, seed=42)
+    mc.add_unit_parameter('R-101', 'volume', 'normal', {'loc': 10, 'scale': 1})
+    mc.add_stream_parameter('feed', 'temperature', 'uniform', {'low': 340, 'high': 360})
+    mc.add_output_response('OutletEthanol', lambda flowsheet: flowsheet.streams['outlet']['composition']['Ethanol'])
+    return mc
+
+def test_streamed_study_matches_the_in_memory_study(tmp_path):
+    in_memory = _study()
+    frame = in_memory.run_simulation()
+    streamed = _study()
+    sink = streamed.run_simulation(sink=ResultSink(spill_dir=str(tmp_path), chunk_rows=64))
+    assert streamed.samples is None and streamed.results is sink
+    spilled = SpilledResults(str(tmp_path)).dataframe()
+    assert spilled[['OutletEthanol']].equals(frame)
+    assert spilled[sink.parameters].equals(in_memory.samples)
+    assert sink.summary().loc['mean', 'OutletEthanol'] == pytest.approx(frame['OutletEthanol'].mean(), rel=1e-12)
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from scipy import stats
+from nexus.nexus_core.uq import sampling
+from nexus.nexus_core.uq.monte_carlo import MonteCarlo
+from nexus.nexus_core.solver.flowsheet import Flowsheet, SequentialModularSolver
+from nexus.nexus_core.models.unit_operations import UnitOperation, CSTR
+from nexus.nexus_core.kinetics.kinetics import PowerLawReaction, ArrheniusRate
+
+DISTRIBUTIONS = [('normal', {'loc': 1.0, 'scale': 0.3}), ('uniform', {'low': 0.0, 'high': 2.0})]
+
+def _cost(x):
+    return np.exp(0.1 * x[:, 0]) * (1.0 + 0.5 * np.sin(x[:, 1]))
+
+def test_latin_hypercube_replicates_are_stratified():
+    n, d, replicates = 64, 3, 4
+    design = sampling.unit_design('lhs', n, d, seed=0, replicates=replicates)
+    for r in range(replicates):
+        points = design[r::replicates]
+        # One point in each of the n / replicates strata of every dimension
+        for j in range(d):
+            np.testing.assert_array_equal(np.sort(np.floor(points[:, j] * len(points))), np.arange(len(points)))
+
+def test_early_stopping_blocks_are_complete_hypercubes():
+    design = sampling.unit_design('lhs', 96, 2, seed=0, replicates=4, block=32)
+    for start in range(0, 96, 32):
+        block = design[start:start + 32]
+        for r in range(4):
+            points = block[r::4]
+            for j in range(2):
+                np.testing.assert_array_equal(np.sort(np.floor(points[:, j] * 8)), np.arange(8))
+
+@pytest.mark.parametrize('sampler', ['lhs', 'sobol', 'halton'])
+def test_designs_are_reproducible_and_in_the_unit_cube(sampler):
+    design = sampling.unit_design(sampler, 100, 3, seed=5)
+    assert design.shape == (100, 3)
+    assert design.min() >= 0.0 and design.max() < 1.0
+    np.testing.assert_array_equal(sampling.unit_design(sampler, 100, 3, seed=5), design)
+    assert not np.array_equal(sampling.unit_design(sampler, 100, 3, seed=6), design)
+
+def test_design_values_follow_the_distributions():
+    values = sampling.design_matrix('sobol', DISTRIBUTIONS + [('triangular', {'left': 0, 'mode': 1, 'right': 4})],
+                                    4096, seed=0)
+    assert stats.kstest(values[:, 0], stats.norm(loc=1.0, scale=0.3).cdf).statistic < 0.01
+    assert stats.kstest(values[:, 1], stats.uniform(loc=0.0, scale=2.0).cdf).statistic < 0.01
+    assert values[:, 2].min() >= 0.0 and values[:, 2].max() <= 4.0
+    assert values[:, 2].mean() == pytest.approx(5.0 / 3.0, rel=1e-3)
+    with pytest.raises(ValueError):
+        sampling.inverse_cdf('zipf', {'a': 2.0}, np.array([0.5]))
+
+def test_quasi_monte_carlo_beats_pseudo_random_draws():
+    reference = _cost(sampling.design_matrix('sobol', DISTRIBUTIONS, 2 ** 18, seed=0, replicates=1)).mean()
+    n = 1024
+    rng = np.random.default_rng(1)
+    x = np.column_stack([rng.normal(1.0, 0.3, n), rng.uniform(0.0, 2.0, n)])
+    random_mean, random_half = sampling.mean_confidence(_cost(x)[:, None])
+    for sampler in ('lhs', 'sobol', 'halton'):
+        x = sampling.design_matrix(sampler, DISTRIBUTIONS, n, seed=1)
+        mean, half = sampling.mean_confidence(_cost(x)[:, None], replicates=8)
+        # Loosely: 128 Halton points per replicate are not balanced in base 3, a small
+        # bias that all replicates share and their spread does not show
+        assert abs(mean[0] - reference) <= 3 * half[0]
+        assert half[0] < random_half[0] / 3
+
+def test_mean_confidence_ignores_failed_samples():
+    outputs = np.array([[1.0], [2.0], [np.nan], [3.0], [4.0]])
+    mean, half = sampling.mean_confidence(outputs, confidence=0.9)
+    valid = np.array([1.0, 2.0, 3.0, 4.0])
+    assert mean[0] == 2.5
+    assert half[0] == pytest.approx(stats.t.ppf(0.95, 3) * valid.std(ddof=1) / 2.0)
+
+def _study(sampler):
+    reaction = PowerLawReaction('r1', {'Ethanol': -1, 'Product': 1}, ArrheniusRate(A=50.0, Ea=2.5e4),
+                                {'Ethanol': 1})
+    reactor = CSTR(name='R-101', volume=10, prop_pkg=None, reaction=reaction)
+    reactor.verbose = False
+    fs = Flowsheet(name='Reactor UQ')
+    for unit in [UnitOperation(name='Feed'), reactor, UnitOperation(name='Product')]:
+        fs.add_unit(unit)
+    fs.streams['feed'] = {'flow_rate': 0.1, 'temperature': 353, 'composition': {'Ethanol': 0.8, 'Water': 0.2}}
+    fs.connect('feed', 'Feed', 'R-101')
+    fs.connect('outlet', 'R-101', 'Product')
+    mc = MonteCarlo(fs, SequentialModularSolver(fs, verbose=False), num_samples=4096, seed=42, sampler=sampler)
+    mc.add_unit_parameter('R-101', 'volume', 'normal', {'loc': 10, 'scale': 1})
+    mc.add_stream_parameter('feed', 'temperature', 'uniform', {'low': 340, 'high': 360})
+    mc.add_output_response('OutletEthanol', lambda flowsheet: flowsheet.streams['outlet']['composition']['Ethanol'])
+    return mc
+
+def test_runs_stop_once_the_interval_is_narrow_enough():
+    needed = {}
+    for sampler in ('random', 'sobol'):
+        mc = _study(sampler)
+        results = mc.run_simulation(ci_width=0.004, check_every=64)
+        last = mc.convergence[-1]
+        mean, half = last['OutletEthanol']
+        assert 2 * half <= 0.004
+        assert len(results) == last['samples'] < 4096
+        assert mean == pytest.approx(results['OutletEthanol'].mean(), rel=1e-12)
+        needed[sampler] = last['samples']
+    assert needed['sobol'] < needed['random']
+
+def test_space_filling_samplers_need_inverse_cdfs():
+    mc = _study('lhs')
+    with pytest.raises(ValueError):
+        mc.add_unit_parameter('R-101', 'volume', 'zipf', {'a': 2.0})
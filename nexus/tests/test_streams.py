@@ -0,0 +1,81 @@
+import pickle
+import numpy as np
+import pytest
+from nexus.nexus_core.models.streams import Stream, BatchStream, StreamLayout
+from nexus.nexus_core.models.unit_operations import Mixer
+
+def _dict_stream():
+    return {'flow_rate': 2.0, 'temperature': 350.0, 'composition': {'A': 0.25, 'B': 0.75}}
+
+def test_stream_reads_and_writes_like_a_dict_stream():
+    data = _dict_stream()
+    stream = Stream.from_dict(data)
+    assert dict(stream.to_dict()) == data
+    assert stream['composition']['B'] == 0.75
+    assert 'pressure' not in stream and stream.get('pressure', 1e5) == 1e5
+    stream['composition']['A'] = 0.5
+    assert stream.fractions[0] == 0.5
+    stream['note'] = 'extra'
+    assert stream['note'] == 'extra' and 'note' in stream
+
+def test_assigning_a_composition_replaces_it_like_a_dict():
+    stream = Stream.from_dict(_dict_stream())
+    fractions = stream.fractions
+    stream['composition'] = {'A': 0.4, 'B': 0.6}
+    # Same components: written in place
+    assert stream.fractions is fractions
+    stream['composition'] = {'C': 1.0}
+    assert stream['composition'].copy() == {'C': 1.0}
+    assert stream.components == ('C',)
+
+    batch = BatchStream('b', size=2)
+    batch.set_composition({'A': 0.5, 'B': 0.5})
+    batch.set_composition({'C': 1.0})
+    assert batch.components == stream.components
+
+def test_declared_components_keep_their_order():
+    stream = Stream(components=('A', 'B', 'C'), composition={'C': 0.4, 'A': 0.6})
+    assert stream.components == ('A', 'B', 'C')
+    np.testing.assert_array_equal(stream.fractions, [0.6, 0.0, 0.4])
+
+def test_mixer_gives_the_same_result_on_dict_and_array_streams():
+    inlets = [_dict_stream(), {'flow_rate': 1.0, 'temperature': 300.0, 'composition': {'A': 1.0, 'B': 0.0}}]
+    results = []
+    for wrap in (dict, Stream.from_dict):
+        mixer = Mixer(name='M')
+        mixer.inlets = [wrap(s) for s in inlets]
+        mixer.outlets = [wrap({'composition': {}})]
+        mixer.solve()
+        out = mixer.outlets[0]
+        results.append((out['flow_rate'], out['temperature'], dict(out['composition'])))
+    (flow_d, temp_d, comp_d), (flow_s, temp_s, comp_s) = results
+    assert flow_s == flow_d
+    assert temp_s == pytest.approx(temp_d, rel=1e-15)
+    for name, value in comp_d.items():
+        assert comp_s[name] == pytest.approx(value, rel=1e-15)
+
+def test_copies_and_pickles_are_independent():
+    stream = Stream.from_dict(_dict_stream())
+    copy = stream.copy()
+    copy['composition']['A'] = 0.0
+    assert stream['composition']['A'] == 0.25
+    restored = pickle.loads(pickle.dumps(stream))
+    assert restored == stream
+    assert restored.components is stream.components
+
+def test_layout_round_trip():
+    layout = StreamLayout(['B', 'A'], temperature=True, pressure=False)
+    stream = Stream.from_dict(_dict_stream())
+    x = layout.pack(stream)
+    np.testing.assert_allclose(x, [1.5, 0.5, 350.0])
+    target = Stream()
+    layout.unpack(x, target)
+    assert target['flow_rate'] == pytest.approx(2.0)
+    assert target['composition']['A'] == pytest.approx(0.25)
+
+@pytest.mark.parametrize('convert', [dict, Stream.from_dict])
+def test_packing_into_a_buffer_clears_unlisted_components(convert):
+    layout = StreamLayout(['A', 'B', 'C'])
+    out = layout.pack({'flow_rate': 1.0, 'composition': {'A': 0.2, 'B': 0.3, 'C': 0.5}})
+    layout.pack(convert({'flow_rate': 2.0, 'composition': {'A': 1.0}}), out=out)
+    np.testing.assert_array_equal(out, layout.pack({'flow_rate': 2.0, 'composition': {'A': 1.0}}))
@@ -0,0 +1,62 @@
+import types
+import numpy as np
+import pandas as pd
+import pytest
+from nexus.digital_twin.validation.validation import ValidationEngine
+from nexus.nexus_core.models.unit_operations import CSTR
+from nexus.nexus_core.kinetics.kinetics import PowerLawReaction, ArrheniusRate, R_GAS
+
+def _reaction():
+    return PowerLawReaction('Ethanol_Conversion', {'Ethanol': -1, 'Product': 1},
+                            ArrheniusRate(A=0.005, Ea=5000 * R_GAS, T_ref=310), {'Ethanol': 1})
+
+def _history(hours=48):
+    rng = np.random.default_rng(3)
+    data = pd.DataFrame({
+        'feed_flow_rate': rng.uniform(80.0, 120.0, hours),
+        'reactor_temp': rng.uniform(30.0, 40.0, hours),
+        'feed_cellulose': rng.uniform(10.0, 20.0, hours),
+        'product_bioethanol_concentration': rng.uniform(0.0, 50.0, hours),
+    }, index=pd.date_range('2023-01-01', periods=hours, freq='h'))
+    return types.SimpleNamespace(data=data, get_data_at_timestamp=data.asof)
+
+def _reactor(cls=CSTR):
+    reactor = cls(name='R-101', volume=50, prop_pkg=None, reaction=_reaction())
+    reactor.verbose = False
+    return reactor
+
+def test_evaluate_matches_scalar_solves():
+    reactor = _reactor()
+    flow = np.array([0.02, 0.03, 0.05])
+    temperature = np.array([305.0, 310.0, 318.0])
+    ethanol = np.array([0.1, 0.15, 0.2])
+    batch = reactor.evaluate(flow, temperature, {'Ethanol': ethanol, 'Water': 1 - ethanol, 'Product': 0.0})
+    for i in range(3):
+        reactor.inlets = [{'flow_rate': flow[i], 'temperature': temperature[i],
+                           'composition': {'Ethanol': ethanol[i], 'Water': 1 - ethanol[i], 'Product': 0.0}}]
+        reactor.outlets = [{}]
+        reactor.solve()
+        outlet = reactor.outlets[0]
+        assert batch['flow_rate'][i] == pytest.approx(outlet['flow_rate'], rel=1e-10)
+        for name in ('Ethanol', 'Water', 'Product'):
+            assert batch['composition'][name][i] == pytest.approx(outlet['composition'][name], rel=1e-9, abs=1e-14)
+
+def test_evaluate_volume_override():
+    reactor = _reactor()
+    composition = {'Ethanol': 0.2, 'Water': 0.8, 'Product': 0.0}
+    batch = reactor.evaluate([0.05, 0.05], 310.0, composition, volume=np.array([50.0, 100.0]))
+    single = reactor.evaluate([0.05], 310.0, composition, volume=100.0)
+    assert batch['composition']['Product'][1] == pytest.approx(single['composition']['Product'][0])
+    assert batch['composition']['Product'][1] > batch['composition']['Product'][0]
+    assert reactor.volume == 50
+
+def test_validate_history_matches_point_validation():
+    reader = _history()
+    history = ValidationEngine(_reactor(), reader).validate_history()
+    engine = ValidationEngine(_reactor(), reader)
+    for timestamp in reader.data.index[::7]:
+        point = engine.validate_at_timestamp(timestamp)
+        row = history.loc[timestamp]
+        assert row['predicted_product_conc'] == pytest.approx(point['predicted_product_conc'], rel=1e-9)
+        assert row['absolute_error'] == pytest.approx(point['absolute_error'], rel=1e-9, abs=1e-12)
+    assert len(history) == len(reader.data)